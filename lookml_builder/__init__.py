@@ -1,9 +1,42 @@
 """
 Looker Explore Builder Package
+
+Public names are loaded lazily on first access, so importing the package (or
+the `lookml` entry point) does not pay for click, lkml or yaml up front.
 """
 
-from .code.looker_explore_builder import LookerExploreBuilder, build_explore_from_view_file, build_explore_from_config_file, init_ontology_from_lookml
-from .code.config import LookerConfig, ClassificationConfig, FormattingConfig, create_sample_config
-from .code.cli import lookml
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    'LookerExploreBuilder': '.code.looker_explore_builder',
+    'build_explore_from_view_file': '.code.looker_explore_builder',
+    'build_explore_from_config_file': '.code.looker_explore_builder',
+    'init_ontology_from_lookml': '.code.looker_explore_builder',
+    'init_ontology_from_project': '.code.project_ontology',
+    'generate_views': '.code.bundle',
+    'GeneratedView': '.code.output',
+    'MemorySink': '.code.output',
+    'DirectorySink': '.code.output',
+    'LookerConfig': '.code.config',
+    'ConfigSnapshot': '.code.config',
+    'ClassificationConfig': '.code.config',
+    'FormattingConfig': '.code.config',
+    'create_sample_config': '.code.config',
+    'lookml': '.code.cli',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['LookerExploreBuilder', 'build_explore_from_view_file', 'build_explore_from_config_file', 'init_ontology_from_lookml', 'LookerConfig', 'ClassificationConfig', 'FormattingConfig', 'create_sample_config', 'lookml']
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for the LookML builder
+Run individual benchmarks with ``python -m lookml_builder.benchmarks.<name>``; the
+whole pipeline is covered by ``suite`` (results are diffed with ``compare``)
+"""
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for semantic field classification
+Times classify_semantic_fields on synthetic views of increasing width and
+checks that the cost per field stays flat (i.e. classification is O(n))
+
+Usage:
+    python -m lookml_builder.benchmarks.bench_classification
+    python -m lookml_builder.benchmarks.bench_classification --sizes 1000 10000 100000 --check
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from lookml_builder.code.config import LookerConfig
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+
+
+def synthetic_fields(n: int) -> Dict[str, List[str]]:
+    """Deterministic categorized field lists with n fields in total"""
+    fields = {"strings": [], "numbers": [], "times": [], "booleans": []}
+    for i in range(n):
+        bucket = i % 10
+        if bucket < 4:
+            fields["strings"].append(f"attribute_{i}_id" if bucket == 0 else f"attribute_{i}")
+        elif bucket < 8:
+            fields["numbers"].append(f"amount_{i}")
+        elif bucket == 8:
+            fields["times"].append(f"event_{i}")
+        else:
+            fields["booleans"].append(f"is_flag_{i}")
+    return fields
+
+
+def synthetic_config(fields: Dict[str, List[str]]) -> LookerConfig:
+    """Config whose override lists scale with the view (every tenth field)"""
+    config = LookerConfig()
+    config.classification.force_as_ids = fields["strings"][::10]
+    config.classification.force_as_flags = fields["numbers"][::10]
+    config.classification.force_as_measures = fields["numbers"][5::10]
+    config.classification.exclude_from_filters = fields["strings"][3::10]
+    return config
+
+
+def time_classification(n: int, repeat: int = 3) -> float:
+    """Best-of-repeat seconds to classify a synthetic view with n fields"""
+    fields = synthetic_fields(n)
+    config = synthetic_config(fields)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        builder = LookerExploreBuilder("synthetic_view", config, temp_dir)
+        best = float("inf")
+        for _ in range(repeat):
+            builder.strings = list(fields["strings"])
+            builder.numbers = list(fields["numbers"])
+            builder.times = list(fields["times"])
+            builder.booleans = list(fields["booleans"])
+            start = time.perf_counter()
+            builder.classify_semantic_fields()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="Fail if per-field cost grows more than 3x across sizes")
+    args = parser.parse_args(argv)
+
+    per_field = []
+    print(f"{'fields':>10} {'seconds':>10} {'us/field':>10}")
+    for n in args.sizes:
+        seconds = time_classification(n, args.repeat)
+        per_field.append(seconds / n)
+        print(f"{n:>10} {seconds:>10.4f} {seconds / n * 1e6:>10.3f}")
+
+    growth = per_field[-1] / per_field[0]
+    print(f"per-field cost growth {args.sizes[0]} -> {args.sizes[-1]}: {growth:.2f}x")
+    if args.check and growth > 3:
+        print("classification is not scaling linearly")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark for ontology join lookup
+Compares a linear scan of the relationship list per view with the indexed
+lookup, for every view of a synthetic ontology, and times explore generation
+
+Usage:
+    python -m lookml_builder.benchmarks.bench_ontology
+    python -m lookml_builder.benchmarks.bench_ontology --views 4000 --joins-per-view 5
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+
+from lookml_builder.code.config import LookerConfig
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+from lookml_builder.code.ontology import OntologyIndex
+from lookml_builder.benchmarks.synthetic import SyntheticSpec, synthetic_ontology
+
+
+def scan_joins(relationships, view_name):
+    """The per-view linear scan the index replaces"""
+    return [rel for rel in relationships if rel.get("from") == view_name or rel.get("from") == "any"]
+
+
+def explore_seconds_per_view(config: LookerConfig, names, output_dir: str) -> float:
+    """Mean time to generate one view's explore file from a (mutable) config"""
+    start = time.perf_counter()
+    for name in names:
+        LookerExploreBuilder(name, config, output_dir).generate_explore_file()
+    return (time.perf_counter() - start) / len(names)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--views", type=int, default=4000)
+    parser.add_argument("--joins-per-view", type=int, default=5)
+    parser.add_argument("--wildcard-joins", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    spec = SyntheticSpec(views=args.views, joins_per_view=args.joins_per_view, wildcard_joins=args.wildcard_joins)
+    ontology = synthetic_ontology(spec)
+    relationships = ontology["relationships"]
+    names = spec.view_names()
+    print(f"{len(names)} views, {len(relationships)} relationships")
+
+    start = time.perf_counter()
+    scanned = [scan_joins(relationships, name) for name in names]
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = OntologyIndex.build(ontology)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = [index.joins_for(name) for name in names]
+    lookup_seconds = time.perf_counter() - start
+
+    assert scanned == indexed, "indexed joins differ from the linear scan"
+    print(f"{'linear scan':>14} {scan_seconds:>10.4f}s")
+    print(f"{'index build':>14} {build_seconds:>10.4f}s")
+    print(f"{'index lookup':>14} {lookup_seconds:>10.4f}s  ({scan_seconds / (build_seconds + lookup_seconds):.0f}x faster)")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        per_view = explore_seconds_per_view(LookerConfig(ontology=ontology), names, temp_dir)
+    print(f"{'explore files':>14} {per_view * len(names):>10.4f}s  ({per_view * 1e6:.0f} us/view)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
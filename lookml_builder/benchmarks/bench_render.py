@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the semantic/style/explore renderers
+Reports render time and peak traced memory for a synthetic wide view, and the
+memory its classification keeps: the compact field index against the plain
+category lists and measure dicts it replaced
+
+Usage:
+    python -m lookml_builder.benchmarks.bench_render
+    python -m lookml_builder.benchmarks.bench_render --fields 50000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from lookml_builder.code.config import LookerConfig
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+from lookml_builder.benchmarks.bench_classification import synthetic_fields
+
+
+def measure(render, repeat: int):
+    """Best-of-repeat seconds and peak traced bytes for one call of render"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+# Builder attributes the field index replaced with list views
+CLASSIFICATION_LISTS = ("strings", "numbers", "times", "booleans", "primary_key", "ids", "dimensions",
+                        "filters", "flags", "measures")
+
+
+def classified_builder(fields, output_dir: str) -> LookerExploreBuilder:
+    builder = LookerExploreBuilder("synthetic_view", LookerConfig(), output_dir)
+    builder.strings = fields["strings"]
+    builder.numbers = fields["numbers"]
+    builder.times = fields["times"]
+    builder.booleans = fields["booleans"]
+    builder.classify_semantic_fields()
+    return builder
+
+
+def as_lists(builder: LookerExploreBuilder):
+    """The classification as the plain lists (and measure dicts) the builder used to hold"""
+    return {name: [dict(item) for item in getattr(builder, name)] if name == "measures"
+            else list(getattr(builder, name)) for name in CLASSIFICATION_LISTS}
+
+
+def classification_memory(fields, output_dir: str):
+    """Traced bytes a classification of fields keeps alive: (as the field index, as plain lists)
+
+    Field names are allocated before tracing starts, so only the structures
+    holding them are counted.
+    """
+    retained = []
+    for build in (lambda: classified_builder(fields, output_dir).field_index,
+                  lambda: as_lists(classified_builder(fields, output_dir))):
+        tracemalloc.start()
+        kept = build()
+        retained.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        del kept
+    return tuple(retained)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fields", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    fields = synthetic_fields(args.fields)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        builder = classified_builder(fields, temp_dir)
+        layers = (builder.dimensions, builder.filters, builder.ids, builder.primary_key,
+                  builder.flags, builder.measures, builder.times)
+
+        renderers = {
+            "semantic": lambda: builder.create_semantic_file(*layers),
+            "style": lambda: builder.create_style_file(*layers),
+            "explore": lambda: builder.generate_explore_file(),
+        }
+
+        print(f"{args.fields} fields")
+        print(f"{'layer':>10} {'seconds':>10} {'peak MiB':>10}")
+        for name, render in renderers.items():
+            seconds, peak = measure(render, args.repeat)
+            print(f"{name:>10} {seconds:>10.4f} {peak / 2 ** 20:>10.2f}")
+
+        index_bytes, lists_bytes = classification_memory(fields, temp_dir)
+        print(f"\n{'classification':>14} {'retained MiB':>13}")
+        print(f"{'field index':>14} {index_bytes / 2 ** 20:>13.2f}")
+        print(f"{'plain lists':>14} {lists_bytes / 2 ** 20:>13.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the `lookml` CLI
+Runs each subcommand in a fresh interpreter with ``python -X importtime`` and
+reports wall-clock time, total import time and the heaviest imports
+
+Usage:
+    python -m lookml_builder.benchmarks.bench_startup
+    python -m lookml_builder.benchmarks.bench_startup --repeat 10 --json startup.json
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SAMPLE_VIEW = REPO_ROOT / "model_project" / "views" / "sample_transactions.view.lkml"
+
+SUBCOMMANDS = {
+    "--version": ["--version"],
+    "--help": ["--help"],
+    "init-config": ["init-config", "--output", "startup_config.yaml"],
+    "generate --dry-run": ["generate", "model_project/views/sample_transactions.view.lkml", "--dry-run"],
+    "batch --dry-run": ["batch", "--dry-run", "--jobs", "1"],
+}
+
+LAUNCHER = "import sys; from lookml_builder.code.cli import lookml; lookml(sys.argv[1:], prog_name='lookml')"
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Map module name -> self import time in microseconds from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def run_subcommand(args: List[str], cwd: str) -> Dict[str, object]:
+    """Run one CLI invocation in a fresh interpreter"""
+    env_path = str(REPO_ROOT)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", LAUNCHER] + args,
+        cwd=cwd, capture_output=True, text=True, env={"PYTHONPATH": env_path, "PATH": ""}
+    )
+    wall = time.perf_counter() - start
+    modules = parse_importtime(proc.stderr)
+    return {
+        "exit_code": proc.returncode,
+        "wall_ms": wall * 1000,
+        "import_ms": sum(modules.values()) / 1000,
+        "modules": modules,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per subcommand (best run is reported)")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest imports to list per subcommand")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"{'subcommand':<22} {'wall ms':>9} {'import ms':>10}  heaviest imports")
+        for label, cli_args in SUBCOMMANDS.items():
+            runs = []
+            for _ in range(args.repeat):
+                # Fresh project each run: generate/batch consume their input views
+                project = Path(temp_dir) / "project"
+                shutil.rmtree(project, ignore_errors=True)
+                (project / "model_project" / "views").mkdir(parents=True)
+                shutil.copy(SAMPLE_VIEW, project / "model_project" / "views")
+                runs.append(run_subcommand(cli_args, str(project)))
+
+            best = min(runs, key=lambda r: r["wall_ms"])
+            heaviest = sorted(best["modules"].items(), key=lambda m: m[1], reverse=True)[:args.top]
+            results[label] = {
+                "exit_code": best["exit_code"],
+                "wall_ms": round(best["wall_ms"], 2),
+                "import_ms": round(best["import_ms"], 2),
+                "modules_imported": len(best["modules"]),
+                "heaviest": [{"module": name, "self_ms": us / 1000} for name, us in heaviest],
+            }
+            print(f"{label:<22} {best['wall_ms']:>9.1f} {best['import_ms']:>10.1f}  "
+                  + ", ".join(f"{name} ({us / 1000:.1f})" for name, us in heaviest))
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0 if all(r["exit_code"] == 0 for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files written by lookml_builder.benchmarks.suite
+Prints the per-benchmark ratio and fails if anything regressed past the threshold
+
+Usage:
+    python -m lookml_builder.benchmarks.compare base.json new.json
+    python -m lookml_builder.benchmarks.compare base.json new.json --threshold 1.10
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Results of one suite run keyed by benchmark name"""
+    with open(path) as f:
+        document = json.load(f)
+    return {record["name"]: record for record in document["results"]}
+
+
+def compare(base: Dict[str, Dict[str, Any]], new: Dict[str, Dict[str, Any]],
+            threshold: float) -> Tuple[List[Tuple[str, float, float, float]], List[str]]:
+    """Rows of (name, base seconds, new seconds, ratio) for shared benchmarks, and the regressed names"""
+    rows, regressions = [], []
+    for name in sorted(base.keys() & new.keys()):
+        before, after = base[name]["seconds"], new[name]["seconds"]
+        ratio = after / before if before > 0 else float("inf")
+        rows.append((name, before, after, ratio))
+        if ratio > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    base, new = load_results(args.base), load_results(args.new)
+    rows, regressions = compare(base, new, args.threshold)
+
+    print(f"{'benchmark':<60} {'base':>10} {'new':>10} {'ratio':>8}")
+    for name, before, after, ratio in rows:
+        marker = "  !" if name in regressions else ""
+        print(f"{name:<60} {before:>10.4f} {after:>10.4f} {ratio:>7.2f}x{marker}")
+    for name in sorted(base.keys() - new.keys()):
+        print(f"{name:<60} only in base")
+    for name in sorted(new.keys() - base.keys()):
+        print(f"{name:<60} only in new")
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than {args.threshold:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Pipeline benchmark suite over synthetic projects
+Times parsing, classification, each renderer and whole `lookml batch` runs,
+and writes machine-readable results for lookml_builder.benchmarks.compare
+
+Usage:
+    python -m lookml_builder.benchmarks.suite --preset smoke
+    python -m lookml_builder.benchmarks.suite --preset standard --output bench.json
+    python -m lookml_builder.benchmarks.suite --fields 100000 --views 10000 --jobs 8
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from lookml_builder.code.config import LookerConfig
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder, GENERATOR_VERSION
+from lookml_builder.benchmarks.synthetic import (
+    SyntheticSpec, TYPE_MIXES, render_view, synthetic_config_dict, generate_project
+)
+
+RESULTS_SCHEMA = 1
+PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+
+# Stage benchmarks sweep field counts; batch benchmarks sweep view counts
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "smoke": {"fields": [10, 1000], "mixes": ["balanced"], "views": [1, 20], "batch_fields": 50},
+    "standard": {"fields": [10, 1000, 10000], "mixes": list(TYPE_MIXES), "views": [1, 100, 1000], "batch_fields": 50},
+    "full": {"fields": [10, 1000, 10000, 100000], "mixes": list(TYPE_MIXES), "views": [1, 100, 1000, 10000],
+             "batch_fields": 50},
+}
+
+
+def best_of(func: Callable[[], Any], repeat: int, setup: Callable[[], Any] = None) -> float:
+    """Best-of-repeat seconds for func, running setup (untimed) before each call"""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stage_benchmarks(fields: int, mix: str, ontology_views: int, repeat: int) -> List[Dict[str, Any]]:
+    """Time each pipeline stage for one synthetic view"""
+    spec = SyntheticSpec(views=ontology_views, fields=fields, mix=mix)
+    view_name = spec.view_names()[0]
+    content = render_view(view_name, spec, spec.seed)
+    config = LookerConfig.from_dict(synthetic_config_dict(spec))
+    params = {"fields": fields, "mix": mix, "relationships": len(config.ontology["relationships"])}
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        builder = LookerExploreBuilder(view_name, config, temp_dir)
+        builder.categorize_lookml(content)
+        categorized = (list(builder.strings), list(builder.numbers), list(builder.times), list(builder.booleans))
+
+        def restore():
+            builder.strings, builder.numbers, builder.times, builder.booleans = (list(c) for c in categorized)
+
+        def layers():
+            return (builder.dimensions, builder.filters, builder.ids, builder.primary_key,
+                    builder.flags, builder.measures, builder.times)
+
+        timings = {"parse": best_of(lambda: builder.parse_lookml_with_lkml(content), repeat),
+                   "classify": best_of(builder.classify_semantic_fields, repeat, setup=restore)}
+        timings["semantic"] = best_of(lambda: builder.create_semantic_file(*layers()), repeat)
+        timings["style"] = best_of(lambda: builder.create_style_file(*layers()), repeat)
+        timings["explore"] = best_of(builder.generate_explore_file, repeat)
+
+    for stage, seconds in timings.items():
+        results.append(result_record(stage, params, seconds, repeat))
+    return results
+
+
+def batch_benchmark(views: int, fields: int, jobs: int) -> Dict[str, Any]:
+    """Time one full `lookml batch` run (fresh interpreter) over a synthetic project"""
+    spec = SyntheticSpec(views=views, fields=fields)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generate_project(temp_dir, spec)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(PACKAGE_ROOT), os.environ.get("PYTHONPATH")])))
+        command = [sys.executable, "-m", "lookml_builder.code.cli", "batch", "--jobs", str(jobs), "--force"]
+        start = time.perf_counter()
+        completed = subprocess.run(command, cwd=temp_dir, env=env, capture_output=True, text=True)
+        seconds = time.perf_counter() - start
+        if completed.returncode != 0 or f"Successful: {views}" not in completed.stdout:
+            raise RuntimeError(f"batch run failed:\n{completed.stdout}\n{completed.stderr}")
+    return result_record("batch", {"views": views, "fields": fields, "jobs": jobs}, seconds, 1)
+
+
+def result_record(benchmark: str, params: Dict[str, Any], seconds: float, repeat: int) -> Dict[str, Any]:
+    """One result entry; `name` is the key results are matched on across runs"""
+    name = benchmark + "".join(f"/{key}={value}" for key, value in sorted(params.items()))
+    return {"name": name, "benchmark": benchmark, "params": params, "seconds": seconds, "repeat": repeat}
+
+
+def environment() -> Dict[str, Any]:
+    """Where and on what revision the benchmarks ran"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=PACKAGE_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "commit": commit,
+        "generator_version": GENERATOR_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--preset", choices=list(PRESETS), default="smoke")
+    parser.add_argument("--fields", type=int, nargs="+", help="Field counts for stage benchmarks (overrides preset)")
+    parser.add_argument("--mixes", nargs="+", choices=list(TYPE_MIXES), help="Type mixes (overrides preset)")
+    parser.add_argument("--views", type=int, nargs="+", help="View counts for batch benchmarks (overrides preset)")
+    parser.add_argument("--ontology-views", type=int, default=1000, help="Views in the ontology used by stage benchmarks")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Workers for batch benchmarks")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-batch", action="store_true", help="Only run the in-process stage benchmarks")
+    parser.add_argument("--output", "-o", default=None, help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    preset = PRESETS[args.preset]
+    results = []
+    print(f"{'benchmark':<60} {'seconds':>10}")
+    for fields in args.fields or preset["fields"]:
+        for mix in args.mixes or preset["mixes"]:
+            for record in stage_benchmarks(fields, mix, args.ontology_views, args.repeat):
+                results.append(record)
+                print(f"{record['name']:<60} {record['seconds']:>10.4f}")
+    if not args.skip_batch:
+        for views in args.views or preset["views"]:
+            record = batch_benchmark(views, preset["batch_fields"], args.jobs)
+            results.append(record)
+            print(f"{record['name']:<60} {record['seconds']:>10.4f}")
+
+    if args.output:
+        document = {"schema": RESULTS_SCHEMA, "environment": environment(), "results": results}
+        Path(args.output).write_text(json.dumps(document, indent=2) + "\n")
+        print(f"results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Deterministic synthetic LookML projects for benchmarking
+The same spec and seed always produce byte-identical views, ontology and
+config, so timings can be compared across commits
+"""
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Relative weights of string / number / time / yesno fields
+TYPE_MIXES: Dict[str, Dict[str, int]] = {
+    "balanced": {"string": 4, "number": 4, "time": 1, "yesno": 1},
+    "string_heavy": {"string": 8, "number": 1, "time": 1, "yesno": 1},
+    "numeric_heavy": {"string": 1, "number": 8, "time": 1, "yesno": 1},
+    "time_heavy": {"string": 2, "number": 2, "time": 5, "yesno": 1},
+}
+
+# Name stems chosen so the classification and formatting rules all fire
+_STRING_STEMS = ("name", "status", "region", "category", "channel", "customer_id", "account_id", "tenant_krn")
+_NUMBER_STEMS = ("revenue_amount", "cost", "price", "discount_rate", "conversion_pct", "item_count", "quantity", "score")
+_TIME_STEMS = ("created", "updated", "shipped", "insert_timestamp", "event_ts")
+_YESNO_STEMS = ("is_active", "is_deleted", "has_discount")
+
+_TIMEFRAMES = "[raw, time, date, week, month, quarter, year]"
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """Shape of a synthetic project"""
+    views: int = 1
+    fields: int = 100
+    mix: str = "balanced"
+    joins_per_view: int = 3
+    wildcard_joins: int = 1
+    seed: int = 0
+
+    def view_names(self) -> List[str]:
+        return [f"synthetic_view_{i:05d}" for i in range(self.views)]
+
+
+def _field_types(spec: SyntheticSpec, rng: random.Random) -> List[str]:
+    weights = TYPE_MIXES[spec.mix]
+    return rng.choices(list(weights), weights=list(weights.values()), k=spec.fields)
+
+
+def render_view(view_name: str, spec: SyntheticSpec, seed: int) -> str:
+    """LookML source for one synthetic view with spec.fields fields"""
+    rng = random.Random(seed)
+    stems = {"string": _STRING_STEMS, "number": _NUMBER_STEMS, "time": _TIME_STEMS, "yesno": _YESNO_STEMS}
+    parts = [f"view: {view_name} {{\n  sql_table_name: `project.dataset.{view_name}` ;;\n\n"]
+    # Every view gets a primary key so the semantic layer always has one
+    parts.append("  dimension: id {\n    type: number\n    sql: ${TABLE}.id ;;\n  }\n\n")
+    for i, field_type in enumerate(_field_types(spec, rng)[1:], 1):
+        name = f"{rng.choice(stems[field_type])}_{i}"
+        if field_type == "time":
+            parts.append(f"  dimension_group: {name} {{\n    type: time\n    timeframes: {_TIMEFRAMES}\n"
+                         f"    sql: ${{TABLE}}.{name} ;;\n  }}\n\n")
+        else:
+            parts.append(f"  dimension: {name} {{\n    type: {field_type}\n    sql: ${{TABLE}}.{name} ;;\n  }}\n\n")
+    parts.append("  measure: count {\n    type: count\n  }\n}\n")
+    return "".join(parts)
+
+
+def synthetic_ontology(spec: SyntheticSpec) -> Dict[str, Any]:
+    """Ontology with joins_per_view joins from every view plus wildcard joins"""
+    rng = random.Random(spec.seed)
+    names = spec.view_names()
+    relationships = []
+    for name in names:
+        for j in range(spec.joins_per_view):
+            target = f"dim_{rng.randrange(max(spec.views, 1) * 2):05d}"
+            relationships.append({
+                "from": name,
+                "to": target,
+                "type": "left_outer",
+                "relationship": rng.choice(("many_to_one", "one_to_many", "one_to_one")),
+                "via": f"${{{name}.customer_id_{j}}} = ${{{target}.id}}",
+            })
+    for j in range(spec.wildcard_joins):
+        relationships.append({
+            "from": "any",
+            "to": f"shared_dim_{j}",
+            "type": "left_outer",
+            "relationship": "many_to_one",
+            "via": f"${{shared_dim_{j}.id}} = 1",
+        })
+    # Interleave so a view's joins are scattered through the list, as in real ontologies
+    rng.shuffle(relationships)
+    return {"project": {"name": "synthetic_project"}, "relationships": relationships}
+
+
+def synthetic_config_dict(spec: SyntheticSpec) -> Dict[str, Any]:
+    """Config file contents for the synthetic project"""
+    return {
+        "classification": {
+            "exclude_from_filters": [f"status_{i}" for i in range(1, spec.fields, 7)],
+            "force_as_flags": [f"score_{i}" for i in range(1, spec.fields, 11)],
+        },
+        "ontology": synthetic_ontology(spec),
+    }
+
+
+def generate_project(root: str, spec: SyntheticSpec) -> List[Path]:
+    """Write views (root/model_project/views) and config.yaml for spec; returns the view paths"""
+    import yaml
+
+    root_path = Path(root)
+    views_dir = root_path / "model_project" / "views"
+    views_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, name in enumerate(spec.view_names()):
+        path = views_dir / f"{name}.view.lkml"
+        path.write_text(render_view(name, spec, spec.seed * 1_000_003 + i))
+        paths.append(path)
+    with open(root_path / "config.yaml", "w") as f:
+        yaml.safe_dump(synthetic_config_dict(spec), f, sort_keys=False)
+    return paths
@@ -0,0 +1,101 @@
+"""
+Batch execution engine for LookerExploreBuilder
+Fans view files out over a process pool and streams per-view results back
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .config import LookerConfig
+from .bundle import build_view_file
+from .looker_explore_builder import LookerExploreBuilder
+from .parse_cache import ParseCache
+from .profiling import profiled
+from .run_ledger import RunLedger
+
+
+# Configuration, parse cache, run ledger and profile directory shipped to each
+# worker process once by the pool initializer
+_worker_config: Optional[LookerConfig] = None
+_worker_parse_cache: Optional[ParseCache] = None
+_worker_ledger: Optional[RunLedger] = None
+_worker_profile_dir: Optional[str] = None
+
+
+def default_jobs() -> int:
+    """Default number of worker processes (one per CPU)"""
+    return os.cpu_count() or 1
+
+
+def _init_worker(config: LookerConfig, parse_cache: Optional[ParseCache], ledger: Optional[RunLedger],
+                 profile_dir: Optional[str] = None) -> None:
+    """Pool initializer - keep the loaded configuration for the worker's lifetime"""
+    global _worker_config, _worker_parse_cache, _worker_ledger, _worker_profile_dir
+    _worker_config = config
+    _worker_parse_cache = parse_cache
+    _worker_ledger = ledger
+    _worker_profile_dir = profile_dir
+
+
+def build_view(view_file: str, output_dir: str, config: Optional[LookerConfig] = None,
+               parse_cache: Optional[ParseCache] = None, ledger: Optional[RunLedger] = None,
+               profile_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Build all LookML files for a view file and return a picklable result record
+
+    ``results`` holds one build result per view defined in the file. With a ``profile_dir`` the build runs under cProfile and its stats are
+    dumped there, one file per view, for the caller to merge.
+    """
+    config = config or _worker_config
+    parse_cache = parse_cache or _worker_parse_cache
+    ledger = ledger or _worker_ledger
+    profile_dir = profile_dir or _worker_profile_dir
+    view_name = LookerExploreBuilder.extract_view_name_from_path(view_file)
+    profile_path = None
+    if profile_dir:
+        profile_path = Path(profile_dir) / f"{view_name}-{os.getpid()}-{time.perf_counter_ns()}.pstats"
+
+    try:
+        with profiled(profile_path):
+            results = build_view_file(view_file, config, output_dir, parse_cache=parse_cache, ledger=ledger)
+        return {
+            'view_name': view_name,
+            'view_names': [result['view_name'] for result in results],
+            'source_file': Path(view_file),
+            'results': results,
+            'success': True
+        }
+    except Exception as e:
+        return {
+            'view_name': view_name,
+            'source_file': Path(view_file),
+            'error': str(e),
+            'success': False
+        }
+
+
+def run_batch(view_files: List[Path], config: LookerConfig, output_dir: str, jobs: int = 1,
+              parse_cache: Optional[ParseCache] = None, ledger: Optional[RunLedger] = None,
+              profile_dir: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Build every view file, yielding result records in completion order
+
+    With ``jobs == 1`` views are built in-process, one after another.
+    Otherwise they are distributed over a pool of ``jobs`` worker processes;
+    the configuration is sent to each worker once rather than with every view.
+    Every view is recorded in ``ledger`` (or in its own ledger if None).
+    Per-view cProfile dumps go to ``profile_dir`` when given.
+    """
+    # Every build shares one frozen copy, so nothing a build does can leak into the next
+    config = (config or LookerConfig.get_default_config()).snapshot()
+    if jobs <= 1 or len(view_files) <= 1:
+        for view_file in view_files:
+            yield build_view(str(view_file), output_dir, config, parse_cache, ledger, profile_dir)
+        return
+
+    workers = min(jobs, len(view_files))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config, parse_cache, ledger, profile_dir)) as executor:
+        futures = [executor.submit(build_view, str(view_file), output_dir) for view_file in view_files]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,211 @@
+"""
+Multi-view file support
+Warehouse exports often bundle many views in one .view.lkml file. The file is
+parsed once, split into per-view source text and field tables, and each view
+gets its own source/semantic/style/explore set. Refinements (`view: +name`)
+are not views of their own: they are built as part of the view they refine
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .config import LookerConfig
+from .looker_explore_builder import LookerExploreBuilder, load_field_tables, run_header
+from .output import GeneratedView
+from .parse_cache import ParseCache
+from .profiling import StageTimer
+from .run_ledger import RunLedger, LEDGER_DIR_NAME
+
+T = TypeVar("T")
+
+# Top-level `view: name {` headers (refinements keep their leading +)
+_VIEW_HEADER = re.compile(r"^[ \t]*view:\s*([+\w]+)\s*\{", re.MULTILINE)
+
+# Tokens that matter when matching braces: strings, comments, raw SQL/HTML
+# blocks (which run to `;;` and may contain anything) and the braces themselves
+_BLOCK_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|#[^\n]*|\b(?:sql\w*|html|expression\w*)\s*:.*?;;|[{}]', re.DOTALL)
+
+
+def _block_end(content: str, open_brace: int) -> int:
+    """Index just past the brace matching the one at open_brace"""
+    depth = 0
+    for token in _BLOCK_TOKEN.finditer(content, open_brace):
+        text = token.group()
+        if text == "{":
+            depth += 1
+        elif text == "}":
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    raise ValueError("Unbalanced braces in view definition")
+
+
+def split_view_blocks(lookml_content: str) -> List[Tuple[str, str]]:
+    """(view name, LookML text) for each top-level view in the content, in file order"""
+    blocks = []
+    position = 0
+    while True:
+        header = _VIEW_HEADER.search(lookml_content, position)
+        if header is None:
+            return blocks
+        end = _block_end(lookml_content, header.end() - 1)
+        blocks.append((header.group(1), lookml_content[header.start():end].strip("\n") + "\n"))
+        position = end
+
+
+def _is_refinement(name: str) -> bool:
+    return name.startswith("+")
+
+
+def fold_refinements(items: List[Tuple[str, T]]) -> List[Tuple[str, List[T]]]:
+    """Group (view name, item) pairs by view, in file order
+
+    Each refinement's item joins its base view's items, or the first view's
+    if its base is defined elsewhere. Content with nothing but refinements
+    keeps one group per refinement.
+    """
+    groups: List[Tuple[str, List[T]]] = []
+    bases: Dict[str, List[T]] = {}
+    for name, item in items:
+        if not _is_refinement(name):
+            groups.append((name, [item]))
+            bases.setdefault(name, groups[-1][1])
+    if not groups:
+        return [(name, [item]) for name, item in items]
+    for name, item in items:
+        if _is_refinement(name):
+            bases.get(name[1:], groups[0][1]).append(item)
+    return groups
+
+
+def view_blocks(lookml_content: str) -> List[Tuple[str, str]]:
+    """split_view_blocks for deciding how to build a file, with refinements folded into their views
+
+    A file with at most one view (refinements aside) is returned whole
+    without scanning its braces, and so is one whose braces can't be matched
+    - lkml then parses it (and reports any real syntax error) as for a
+    single view.
+    """
+    headers = _VIEW_HEADER.findall(lookml_content)
+    views = [name for name in headers if not _is_refinement(name)] or headers
+    if len(views) <= 1:
+        return [(views[0], lookml_content)] if views else []
+    try:
+        blocks = split_view_blocks(lookml_content)
+    except ValueError:
+        return [(views[0], lookml_content)]
+    return [(name, "\n".join(texts)) for name, texts in fold_refinements(blocks)]
+
+
+def _dump_view_blocks(lookml_content: str) -> List[Tuple[str, str]]:
+    """Per-view LookML regenerated by lkml - used when the text can't be split reliably"""
+    import lkml
+    return [(view["name"], lkml.dump({"views": [view]})) for view in lkml.load(lookml_content).get("views", [])]
+
+
+def _merge_field_tables(name: str, tables: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One field table holding the fields of a view and its refinements"""
+    if len(tables) == 1:
+        return tables[0]
+    return {"name": name, **{key: [row for table in tables for row in table[key]]
+                             for key in tables[0] if key != "name"}}
+
+
+def split_bundle(lookml_content: str, parse_cache: Optional[ParseCache] = None) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(view name, LookML text, field table) for each view of a multi-view file, parsing it once
+
+    A refinement's text and fields are part of the view it refines.
+    """
+    field_tables = load_field_tables(lookml_content, parse_cache)
+    try:
+        blocks = split_view_blocks(lookml_content)
+    except ValueError:
+        blocks = []
+    if [name for name, _ in blocks] != [table["name"] for table in field_tables]:
+        blocks = _dump_view_blocks(lookml_content)
+    # Same names in the same order, so both fold into the same groups
+    views = fold_refinements(blocks)
+    tables = fold_refinements([(table["name"], table) for table in field_tables])
+    return [(name, "\n".join(texts), _merge_field_tables(name, view_tables))
+            for (name, texts), (_, view_tables) in zip(views, tables)]
+
+
+def count_views(lookml_content: str) -> int:
+    """Number of views defined in the content (at least 1)"""
+    return max(len(view_blocks(lookml_content)), 1)
+
+
+def generate_views(lookml_content: str, config: Optional[LookerConfig] = None,
+                   parse_cache: Optional[ParseCache] = None, new_view_name: Optional[str] = None) -> List[GeneratedView]:
+    """Render every view defined in lookml_content in memory - no files or directories are touched
+
+    Write the results with ``GeneratedView.write(sink)`` if they should be kept.
+    """
+    config = config or LookerConfig.get_default_config()
+    blocks = view_blocks(lookml_content)
+    if not blocks:
+        raise ValueError("No view definition found")
+
+    if len(blocks) == 1:
+        original_name = blocks[0][0]
+        builder = LookerExploreBuilder(new_view_name or original_name, config, parse_cache=parse_cache)
+        return [builder.generate(lookml_content, original_name)]
+
+    if new_view_name:
+        raise ValueError("Cannot rename content that defines more than one view")
+    return [
+        LookerExploreBuilder(view_name, config, parse_cache=parse_cache).generate(
+            view_content, view_name, field_tables=[field_table])
+        for view_name, view_content, field_table in split_bundle(lookml_content, parse_cache)
+    ]
+
+
+def build_view_file(view_path: str, config: Optional[LookerConfig] = None, output_base_dir: str = "model_project",
+                    parse_cache: Optional[ParseCache] = None, ledger: Optional[RunLedger] = None,
+                    new_view_name: Optional[str] = None, keep_original: bool = False,
+                    progress: Optional[Callable[[str], None]] = None,
+                    content: Optional[str] = None, timer: Optional[StageTimer] = None) -> List[Dict[str, Any]]:
+    """Build every view defined in view_path; returns one build result per view
+
+    A single-view file is built exactly as before (and may be renamed). For a
+    multi-view file each view keeps its own name, and the original file is
+    removed only after all of them were built. Pass ``content`` if the file
+    was already read, so it is not read again, with the ``timer`` that timed
+    reading it as the "import" stage.
+    """
+    if timer is None:
+        timer = StageTimer()
+    timer.on_stage = progress
+    if content is None:
+        with timer.stage("import"):
+            with open(view_path, "r") as file:
+                content = file.read()
+
+    if len(view_blocks(content)) <= 1:
+        original_name = LookerExploreBuilder.extract_view_name_from_path(view_path)
+        view_name = new_view_name or original_name
+        builder = LookerExploreBuilder(view_name, config, output_base_dir, parse_cache=parse_cache)
+        results = [{"view_name": view_name,
+                    **builder.build_from_content(content, original_name, ledger=ledger, timer=timer)}]
+    else:
+        if new_view_name:
+            raise ValueError(f"Cannot rename {Path(view_path).name}: it defines more than one view")
+
+        config = config or LookerConfig.get_default_config()
+        if ledger is None:
+            ledger = RunLedger.create(Path(output_base_dir) / LEDGER_DIR_NAME, run_header(config))
+
+        results = []
+        for view_name, view_content, field_table in split_bundle(content, parse_cache):
+            builder = LookerExploreBuilder(view_name, config, output_base_dir, parse_cache=parse_cache)
+            result = builder.build_from_content(view_content, view_name, field_tables=[field_table],
+                                                ledger=ledger, timer=StageTimer(on_stage=progress))
+            results.append({"view_name": view_name, **result})
+
+    original_path = Path(view_path)
+    if not keep_original and original_path.exists():
+        original_path.unlink()
+    for result in results:
+        result["deleted_original"] = None if keep_original else str(original_path)
+    return results
@@ -0,0 +1,303 @@
+"""
+Compiled classification rules
+User rules (field-name globs or regexes, optionally scoped to some views and
+ordered by priority) and the exact-name override lists compile into one
+decision table: exact names are a hash lookup, and each view's pattern rules
+become one combined regex per decision, so a field is classified in a single
+evaluation however many rules there are
+"""
+
+import re
+from dataclasses import dataclass
+from fnmatch import fnmatchcase, translate
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# Roles a rule can assign. A field gets at most one role from each decision:
+# what it is (ID, FLAG, MEASURE) and whether it gets a filter (NO_FILTER).
+# AUTO and FILTER assign nothing, but still stop lower-priority rules.
+ID = "id"
+FLAG = "flag"
+MEASURE = "measure"
+AUTO = "auto"
+NO_FILTER = "no_filter"
+FILTER = "filter"
+
+DECISIONS = ((ID, FLAG, MEASURE, AUTO), (NO_FILTER, FILTER))
+ROLES = tuple(role for roles in DECISIONS for role in roles)
+
+# ClassificationConfig list -> the role it gives the exact names in it
+EXACT_LISTS = (
+    ("force_as_ids", ID),
+    ("force_as_flags", FLAG),
+    ("force_as_measures", MEASURE),
+    ("exclude_from_filters", NO_FILTER),
+)
+
+_RULE_KEYS = {"match", "regex", "role", "views", "priority"}
+
+# Each rule's alternative in a combined regex is the named group _rule<position>
+_GROUP_PREFIX = "_rule"
+_GENERATED_GROUP = re.compile(rf"{_GROUP_PREFIX}\d+")
+# Constructs that change meaning or stop compiling once a regex is combined with others
+_GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+_NUMBERED_CONDITION = re.compile(r"\(\?\(\d")
+
+
+def _uncombinable(pattern: str) -> Optional[str]:
+    """Why pattern can't be one alternative of a combined regex, or None if it can
+
+    Numbered backreferences (and conditionals) would point at another rule's
+    group once the groups are renumbered, and global flags would apply to
+    every rule. Escapes and character classes are skipped over.
+    """
+    position, in_class = 0, False
+    while position < len(pattern):
+        char = pattern[position]
+        if char == "\\":
+            following = pattern[position + 1:position + 2]
+            if not in_class and following.isdigit() and following != "0":
+                return f"a numbered backreference \\{following} (use a named group and (?P=name))"
+            position += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A ']' straight after '[' or '[^' is a literal
+            position += 2 if pattern[position + 1:position + 2] == "^" else 1
+            if pattern[position:position + 1] == "]":
+                position += 1
+            continue
+        elif char == "(":
+            if _NUMBERED_CONDITION.match(pattern, position):
+                return "a numbered group condition (use a named group)"
+            flags = _GLOBAL_FLAGS.match(pattern, position)
+            if flags:
+                return f"global flags {flags.group()} (scope them instead, e.g. (?i:...))"
+        position += 1
+    return None
+
+
+def _compile_rule_regex(pattern: str, described: str) -> "re.Pattern":
+    """pattern compiled on its own, raising ValueError naming the rule if it can't be used"""
+    try:
+        compiled = re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regex in classification rule {described}: {e}") from None
+    problem = _uncombinable(pattern)
+    if problem:
+        raise ValueError(f"Classification rule {described} uses {problem}")
+    for name in compiled.groupindex:
+        if _GENERATED_GROUP.fullmatch(name):
+            raise ValueError(f"Classification rule {described} uses the group name {name!r}, "
+                             f"which is reserved for the rules' own groups")
+    return compiled
+
+
+def _decision(role: str) -> int:
+    return 0 if role in DECISIONS[0] else 1
+
+
+@dataclass(frozen=True)
+class ClassificationRule:
+    """Fields whose whole name matches ``pattern`` (a glob, or a regex if ``regex``) get ``role``
+
+    ``views`` limits the rule to views whose name matches one of its globs;
+    rules with a higher ``priority`` are tried first, and rules of equal
+    priority in the order they are configured. Regexes are combined with the
+    other rules', so they cannot use numbered backreferences, global flags
+    (scoped flags such as ``(?i:...)`` are fine) or ``_rule<n>`` group names,
+    and rules making the same decision cannot share a group name.
+    """
+    pattern: str
+    role: str
+    regex: bool = False
+    views: Tuple[str, ...] = ()
+    priority: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ClassificationRule':
+        """Create a rule from its config entry, raising ValueError if it is malformed"""
+        if not isinstance(data, dict):
+            raise ValueError(f"Classification rule must be a mapping, got {data!r}")
+        unknown = set(data) - _RULE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown key(s) in classification rule {data!r}: {', '.join(sorted(unknown))}")
+        if ("match" in data) == ("regex" in data):
+            raise ValueError(f"Classification rule {data!r} needs exactly one of 'match' or 'regex'")
+        regex = "regex" in data
+        pattern = data["regex" if regex else "match"]
+        if not isinstance(pattern, str) or not pattern:
+            raise ValueError(f"Classification rule {data!r} has an empty or non-string pattern")
+        role = data.get("role")
+        if role not in ROLES:
+            raise ValueError(f"Classification rule {data!r} has role {role!r}; expected one of {', '.join(ROLES)}")
+        views = data.get("views", ())
+        views = (views,) if isinstance(views, str) else tuple(views)
+        if not all(isinstance(view, str) for view in views):
+            raise ValueError(f"Classification rule {data!r} has non-string view patterns")
+        priority = data.get("priority", 0)
+        if not isinstance(priority, int) or isinstance(priority, bool):
+            raise ValueError(f"Classification rule {data!r} has a non-integer priority")
+        if regex:
+            _compile_rule_regex(pattern, repr(data))
+        return cls(pattern=pattern, role=role, regex=regex, views=views, priority=priority)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Config entry for this rule (defaults left out)"""
+        rule: Dict[str, Any] = {"regex" if self.regex else "match": self.pattern, "role": self.role}
+        if self.views:
+            rule["views"] = list(self.views)
+        if self.priority:
+            rule["priority"] = self.priority
+        return rule
+
+    def expression(self) -> str:
+        """Regex source matching the field names this rule applies to"""
+        return self.pattern if self.regex else translate(self.pattern)
+
+    def applies_to(self, view_name: str) -> bool:
+        return not self.views or any(fnmatchcase(view_name, view) for view in self.views)
+
+
+def parse_rules(entries: Optional[Iterable[Dict[str, Any]]]) -> List[ClassificationRule]:
+    """Rules from a config's ``rules`` list"""
+    if entries is None:
+        return []
+    if isinstance(entries, (str, dict)):
+        raise ValueError("classification.rules must be a list of rules")
+    rules = [entry if isinstance(entry, ClassificationRule) else ClassificationRule.from_dict(entry)
+             for entry in entries]
+    check_group_names(rules)
+    return rules
+
+
+def check_group_names(rules: Iterable[ClassificationRule]) -> None:
+    """Raise ValueError, naming the rule, if a regex's named groups would clash in a combined table
+
+    Rules making the same decision share one regex, so their group names must
+    be distinct and must not look like the names generated for the rules.
+    """
+    owners: Dict[Tuple[int, str], ClassificationRule] = {}
+    for rule in rules:
+        if not rule.regex:
+            continue
+        for name in _compile_rule_regex(rule.pattern, repr(rule.to_dict())).groupindex:
+            key = (_decision(rule.role), name)
+            if key in owners:
+                raise ValueError(f"Classification rule {rule.to_dict()!r} reuses the group name {name!r} "
+                                 f"of rule {owners[key].to_dict()!r}")
+            owners[key] = rule
+
+
+class ViewRules:
+    """Decision table for the fields of one view
+
+    Exact names are decided by a dictionary lookup and take precedence over
+    every pattern rule for the decision they make. Otherwise each decision is
+    made by one combined regex over the view's rules in priority order: its
+    alternatives are tried in order, so the first rule whose pattern matches
+    the whole name wins and ``lastgroup`` tells which one it was.
+    """
+
+    __slots__ = ("_exact", "_exact_names", "_patterns", "_roles")
+
+    def __init__(self, exact: Dict[str, Tuple[Optional[FrozenSet[str]], ...]],
+                 exact_names: Dict[str, Tuple[str, ...]], rules: Tuple[ClassificationRule, ...]):
+        self._exact = exact
+        self._exact_names = exact_names
+        self._roles: Dict[str, str] = {}
+        alternatives: Tuple[List[str], List[str]] = ([], [])
+        for position, rule in enumerate(rules):
+            group = f"{_GROUP_PREFIX}{position}"
+            self._roles[group] = rule.role
+            alternatives[_decision(rule.role)].append(f"(?P<{group}>(?:{rule.expression()}))")
+        self._patterns = tuple(re.compile("|".join(parts)) if parts else None for parts in alternatives)
+
+    def _match(self, name: str, decision: int) -> Optional[str]:
+        pattern = self._patterns[decision]
+        if pattern is None:
+            return None
+        match = pattern.fullmatch(name)
+        return self._roles[match.lastgroup] if match else None
+
+    def decide(self, name: str) -> FrozenSet[str]:
+        """Every role the rules give name (AUTO and FILTER are left out)"""
+        exact = self._exact.get(name)
+        roles = set()
+        for decision in range(len(DECISIONS)):
+            if exact is not None and exact[decision] is not None:
+                roles |= exact[decision]
+            else:
+                roles.add(self._match(name, decision))
+        return frozenset(roles - {None, AUTO, FILTER})
+
+    def assign(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        """Names given ID, FLAG, MEASURE and NO_FILTER
+
+        Each role lists the exact names configured for it, in config order
+        (whether or not they are among names), then the names a pattern rule
+        gave it, in the order of names.
+        """
+        assigned = {role: list(exact) for role, exact in self._exact_names.items()}
+        if self._patterns == (None, None):
+            return assigned
+        exact_names = self._exact
+        for name in names:
+            exact = exact_names.get(name)
+            for decision, pattern in enumerate(self._patterns):
+                if pattern is None or (exact is not None and exact[decision] is not None):
+                    continue
+                match = pattern.fullmatch(name)
+                if match:
+                    role = self._roles[match.lastgroup]
+                    if role in assigned:
+                        assigned[role].append(name)
+        return assigned
+
+
+class DecisionTable:
+    """Compiled classification overrides: the exact-name tier plus pattern rules in priority order
+
+    The table for a view holds only the rules scoped to it; views with the
+    same applicable rules share one compiled table.
+    """
+
+    def __init__(self, exact_lists: Dict[str, Tuple[str, ...]], rules: Tuple[ClassificationRule, ...] = ()):
+        self._exact_names = {role: tuple(exact_lists.get(role, ())) for _, role in EXACT_LISTS}
+        exact: Dict[str, List[Optional[set]]] = {}
+        for role, names in self._exact_names.items():
+            for name in names:
+                decided = exact.setdefault(name, [None] * len(DECISIONS))
+                decision = _decision(role)
+                decided[decision] = (decided[decision] or set()) | {role}
+        self._exact = {name: tuple(frozenset(roles) if roles else None for roles in decided)
+                       for name, decided in exact.items()}
+        # Stable sort: equal priorities keep their configured order
+        self.rules = tuple(sorted(rules, key=lambda rule: -rule.priority))
+        self._scoped = any(rule.views for rule in self.rules)
+        self._by_scope: Dict[Tuple[int, ...], ViewRules] = {}
+        self._by_view: Dict[str, ViewRules] = {}
+
+    def for_view(self, view_name: str) -> ViewRules:
+        """Decision table for the fields of view_name (compiled once per distinct set of rules)"""
+        table = self._by_view.get(view_name)
+        if table is None:
+            scope = tuple(position for position, rule in enumerate(self.rules)
+                          if not self._scoped or rule.applies_to(view_name))
+            table = self._by_scope.get(scope)
+            if table is None:
+                table = self._by_scope[scope] = ViewRules(self._exact, self._exact_names,
+                                                          tuple(self.rules[position] for position in scope))
+            self._by_view[view_name] = table
+        return table
+
+
+@lru_cache(maxsize=32)
+def compile_decision_table(force_as_ids: Tuple[str, ...], force_as_flags: Tuple[str, ...],
+                           force_as_measures: Tuple[str, ...], exclude_from_filters: Tuple[str, ...],
+                           rules: Tuple[ClassificationRule, ...] = ()) -> DecisionTable:
+    """Compile (and memoize) the decision table for a set of overrides"""
+    return DecisionTable({ID: force_as_ids, FLAG: force_as_flags, MEASURE: force_as_measures,
+                          NO_FILTER: exclude_from_filters}, rules)
@@ -6,8 +6,57 @@ Looker Explore CLI - Simple command-line interface for generating LookML refinem
 import click
 import sys
 from pathlib import Path
-from .looker_explore_builder import LookerExploreBuilder
-from .config import LookerConfig
+
+# Subcommands import the builder, config and parser modules themselves so that
+# `lookml --version`, `--help` and lightweight commands start without loading them
+
+# Longest file listing printed before batch summarizes the rest
+MAX_LISTED_FILES = 50
+
+
+def _open_parse_cache(cache, cache_dir, output_dir):
+    """Return the parse cache selected by --cache/--cache-dir, or None"""
+    from .parse_cache import ParseCache, default_cache_dir
+    
+    if not (cache or cache_dir):
+        return None
+    return ParseCache(str(cache_dir or default_cache_dir(output_dir)))
+
+
+def _echo_timings(timings_ms, heading):
+    """Print per-stage build timings"""
+    click.echo(f"\n⏱️  {heading}:")
+    for stage, ms in timings_ms.items():
+        click.echo(f"   {stage:<10} {ms:10.1f} ms")
+
+
+def _echo_dry_run(builder):
+    """Print the files and classifications a categorized builder would generate"""
+    view_name = builder.view_name
+    click.echo(f"   📁 Output directory: {builder.view_output_dir}")
+    click.echo(f"   📄 Source file: {view_name}.source.view.lkml")
+    click.echo(f"   📄 Semantic file: {view_name}.semantic.view.lkml")
+    click.echo(f"   📄 Style file: {view_name}.style.view.lkml")
+    click.echo(f"   📄 Explore file: {builder.explore_output_dir}/{view_name}.explore.lkml")
+    
+    # Show what classifications would be applied
+    builder.classify_semantic_fields()
+    
+    click.echo(f"\n📊 Field Classifications:")
+    click.echo(f"   Primary Keys: {builder.primary_key}")
+    click.echo(f"   IDs: {builder.ids}")
+    click.echo(f"   Dimensions: {builder.dimensions}")
+    click.echo(f"   Filters: {builder.filters}")
+    click.echo(f"   Flags: {builder.flags}")
+    click.echo(f"   Measures: {[m['name'] for m in builder.measures]}")
+
+
+def _echo_profile(profile_path):
+    """Print where the merged profile was written and its top entries"""
+    from .profiling import format_profile
+    
+    click.echo(f"\n🔬 Profile written to: {profile_path}")
+    click.echo(format_profile(str(profile_path)))
 
 
 @click.group()
@@ -22,7 +71,10 @@ def lookml():
 @click.argument('new_view_name', required=False)
 @click.option('--output-dir', '-o', default='model_project', help='Output directory (default: model_project)')
 @click.option('--dry-run', is_flag=True, help='Preview what would be generated without writing files')
-def generate(view_file, new_view_name, output_dir, dry_run):
+@click.option('--cache', is_flag=True, help='Reuse parsed views from the on-disk parse cache (.lookml_cache)')
+@click.option('--cache-dir', type=click.Path(path_type=Path), default=None, help='Parse cache location (implies --cache)')
+@click.option('--profile', is_flag=True, help='Run under cProfile and write stats to <output-dir>/runs/<run-id>.pstats')
+def generate(view_file, new_view_name, output_dir, dry_run, cache, cache_dir, profile):
     """Generate LookML refinement layers from a base view file
     
     Automatically looks for config.yaml in the current directory.
@@ -31,7 +83,16 @@ def generate(view_file, new_view_name, output_dir, dry_run):
     Examples:
         lookml generate sample_transactions.view.lkml
         lookml generate sample_transactions.view.lkml financial_transactions
+        lookml generate sample_transactions.view.lkml --dry-run --cache
+        lookml generate sample_transactions.view.lkml --profile
     """
+    from .looker_explore_builder import LookerExploreBuilder, BUILD_STAGES, run_header
+    from .bundle import build_view_file, split_bundle, view_blocks
+    from .config import LookerConfig
+    from .output import WriteStats
+    from .profiling import StageTimer, profiled
+    from .run_ledger import RunLedger, LEDGER_DIR_NAME
+    
     try:
         # Check for config.yaml in current directory
         config_path = Path("config.yaml")
@@ -45,34 +106,40 @@ def generate(view_file, new_view_name, output_dir, dry_run):
         # Use the provided new view name or extract from file
         original_name = LookerExploreBuilder.extract_view_name_from_path(str(view_file))
         view_name = new_view_name if new_view_name else original_name
+        parse_cache = _open_parse_cache(cache, cache_dir, output_dir)
         
-        if new_view_name:
+        # Reading the file is the build's "import" stage (and profiled), as it is for batch runs
+        profiler = None
+        if profile and not dry_run:
+            import cProfile
+            profiler = cProfile.Profile()
+        timer = StageTimer()
+        with profiled(None, profiler), timer.stage("import"):
+            content = view_file.read_text()
+        
+        # A multi-view file produces one set of layers per view, each under its own name
+        view_names = [name for name, _ in view_blocks(content)]
+        if len(view_names) > 1:
+            if new_view_name:
+                click.echo(f"❌ Error: {view_file.name} defines {len(view_names)} views and cannot be renamed", err=True)
+                sys.exit(1)
+            click.echo(f"📚 {view_file.name} defines {len(view_names)} views: {', '.join(view_names)}")
+        elif new_view_name:
             click.echo(f"🏷️  Renaming '{original_name}' → '{view_name}'")
         else:
             click.echo(f"🏷️  Using original name: '{view_name}'")
         
-        # Create builder
-        builder = LookerExploreBuilder(view_name, config, output_dir)
-        
         if dry_run:
             click.echo("\n🔍 DRY RUN - Preview of what would be generated:")
-            click.echo(f"   📁 Output directory: {builder.view_output_dir}")
-            click.echo(f"   📄 Source file: {view_name}.source.view.lkml")
-            click.echo(f"   📄 Semantic file: {view_name}.semantic.view.lkml")
-            click.echo(f"   📄 Style file: {view_name}.style.view.lkml")
-            click.echo(f"   📄 Explore file: {builder.explore_output_dir}/{view_name}.explore.lkml")
-            
-            # Show what classifications would be applied
-            builder.categorize_dimensions(str(view_file))
-            builder.classify_semantic_fields()
-            
-            click.echo(f"\n📊 Field Classifications:")
-            click.echo(f"   Primary Keys: {builder.primary_key}")
-            click.echo(f"   IDs: {builder.ids}")
-            click.echo(f"   Dimensions: {builder.dimensions}")
-            click.echo(f"   Filters: {builder.filters}")
-            click.echo(f"   Flags: {builder.flags}")
-            click.echo(f"   Measures: {[m['name'] for m in builder.measures]}")
+            if len(view_names) > 1:
+                for bundled_name, _, field_table in split_bundle(content, parse_cache):
+                    builder = LookerExploreBuilder(bundled_name, config, output_dir, parse_cache=parse_cache)
+                    builder.categorize_tables([field_table])
+                    _echo_dry_run(builder)
+            else:
+                builder = LookerExploreBuilder(view_name, config, output_dir, parse_cache=parse_cache)
+                builder.categorize_lookml(content)
+                _echo_dry_run(builder)
             
             click.echo("\n✨ Use --dry-run=false to generate files")
             return
@@ -80,30 +147,47 @@ def generate(view_file, new_view_name, output_dir, dry_run):
         # Generate files
         click.echo(f"\n🚀 Generating LookML files...")
         
-        with click.progressbar(length=4, label='Processing') as bar:
-            result = builder.build_complete_explore(str(view_file))
-            bar.update(1)
-            bar.update(1)
-            bar.update(1)
-            bar.update(1)
+        ledger = RunLedger.create(Path(output_dir) / LEDGER_DIR_NAME, run_header(config))
+        profile_path = ledger.path.with_suffix(".pstats") if profile else None
+        
+        # Advance the bar as each build stage actually finishes
+        with click.progressbar(length=len(BUILD_STAGES) * max(len(view_names), 1), label='Processing') as bar:
+            if len(view_names) <= 1:
+                # Reading the file already finished a single view's import stage
+                bar.update(1)
+            with profiled(profile_path, profiler):
+                results = build_view_file(str(view_file), config, output_dir, parse_cache=parse_cache, ledger=ledger,
+                                          new_view_name=new_view_name, progress=lambda stage: bar.update(1),
+                                          content=content, timer=timer)
         
         # Show results
-        click.echo(f"\n✅ Successfully generated files:")
-        for key, file_path in result.items():
-            if key not in ["metadata", "deleted_original"]:  # Don't show metadata or deleted file
-                click.echo(f"   📄 {Path(file_path).name}")
+        for result in results:
+            click.echo(f"\n✅ Successfully generated files:")
+            for key in ("source_file", "semantic_file", "style_file", "explore_file"):
+                click.echo(f"   📄 {Path(result[key]).name}")
+            
+            click.echo(f"\n📁 Files created in: {Path(result['source_file']).parent}")
+            click.echo(f"📁 Explore created in: {Path(result['explore_file']).parent}")
         
-        click.echo(f"\n📁 Files created in: {builder.view_output_dir}")
-        click.echo(f"📁 Explore created in: {builder.explore_output_dir}")
+        click.echo(f"📊 Metadata logged to: {ledger.path}")
+        writes = WriteStats()
+        for result in results:
+            writes.add(result["metadata"].get("writes", {}))
+        click.echo(f"📝 Files: {writes.describe()}")
+        for result in results:
+            heading = "Stage timings" if len(results) == 1 else f"Stage timings ({result['view_name']})"
+            _echo_timings(result["metadata"]["timings_ms"], heading)
         
-        if result.get("metadata"):
-            metadata_dir = builder.output_base_dir / "runs" / result["metadata"]["timestamp"]
-            click.echo(f"📊 Metadata logged to: {metadata_dir}")
+        if profile_path:
+            _echo_profile(profile_path)
         
-        if result.get("deleted_original"):
-            click.echo(f"🗑️  Removed original file: {Path(result['deleted_original']).name}")
+        if results[0].get("deleted_original"):
+            click.echo(f"🗑️  Removed original file: {Path(results[0]['deleted_original']).name}")
         
-        click.echo(f"\n🎉 Done! View '{view_name}' is ready to use.")
+        if len(results) == 1:
+            click.echo(f"\n🎉 Done! View '{view_name}' is ready to use.")
+        else:
+            click.echo(f"\n🎉 Done! {len(results)} views are ready to use.")
         
     except FileNotFoundError as e:
         click.echo(f"❌ Error: {e}", err=True)
@@ -118,18 +202,52 @@ def generate(view_file, new_view_name, output_dir, dry_run):
 @click.option('--output-dir', '-o', default='model_project', help='Output directory (default: model_project)')
 @click.option('--dry-run', is_flag=True, help='Preview what would be generated without writing files')
 @click.option('--exclude', multiple=True, help='Exclude files matching pattern (can be used multiple times)')
-def batch(views_dir, output_dir, dry_run, exclude):
+@click.option('--recursive', '-r', is_flag=True, help='Also scan subdirectories of the views directory')
+@click.option('--files-from', type=click.File('rb'), default=None,
+              help="Read view files from a newline- or NUL-delimited list ('-' for stdin) instead of scanning")
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None, help='Number of worker processes (default: CPU count)')
+@click.option('--force', is_flag=True, help='Regenerate every view, even if its inputs are unchanged')
+@click.option('--cache', is_flag=True, help='Reuse parsed views from the on-disk parse cache (.lookml_cache)')
+@click.option('--cache-dir', type=click.Path(path_type=Path), default=None, help='Parse cache location (implies --cache)')
+@click.option('--profile', is_flag=True, help='Profile every view and merge the stats into <output-dir>/runs/<run-id>.pstats')
+@click.option('--shard', default=None, help='Only build shard i of N (e.g. 2/8); the run ledger becomes a fragment for `lookml merge`')
+@click.option('--shard-by-size', is_flag=True, help='Balance shards by file size instead of hashing paths')
+def batch(views_dir, output_dir, dry_run, exclude, recursive, files_from, jobs, force, cache, cache_dir, profile,
+          shard, shard_by_size):
     """Generate LookML refinement layers for all view files in a directory
     
     Scans the views directory for .view.lkml files and processes each one.
     Uses original view names (no renaming in batch mode).
+    Views whose content, configuration and generator version are unchanged
+    since the last run are skipped (see .lookml_manifest.json); use --force
+    to regenerate everything.
     
     Examples:
         lookml batch
         lookml batch --views-dir custom_views --dry-run
         lookml batch --exclude "*_backup*" --exclude "*_old*"
+        lookml batch --jobs 8
+        lookml batch --force
+        lookml batch --profile
+        lookml batch --recursive --exclude "archive/*"
+        git ls-files -z '*.view.lkml' | lookml batch --files-from -
+        lookml batch --shard 2/8 --shard-by-size
     """
-    import glob
+    from .looker_explore_builder import LookerExploreBuilder, run_header
+    from .bundle import view_blocks
+    from .config import LookerConfig
+    from .batch_runner import run_batch, default_jobs
+    from .run_ledger import RunLedger, LEDGER_DIR_NAME
+    from .manifest import BatchManifest, partition_unchanged
+    from .discovery import discover_view_files, read_file_list, select_listed_files
+    from .profiling import ThroughputMeter, merge_profiles
+    from .output import WriteStats, SKIPPED
+    from .sharding import clear_stale_fragments, create_fragment, parse_shard, select_shard, shard_header
+    
+    try:
+        shard_index, shard_count = parse_shard(shard) if shard else (None, None)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--shard'")
     
     try:
         # Check for config.yaml in current directory
@@ -141,87 +259,129 @@ def batch(views_dir, output_dir, dry_run, exclude):
             click.echo("📋 Using default configuration (no config.yaml found)")
             config = LookerConfig.get_default_config()
         
-        # Find all .view.lkml files in the views directory
+        # Find all .view.lkml files: from an explicit list, or by walking the views directory
         views_path = Path(views_dir)
-        if not views_path.exists():
-            click.echo(f"❌ Views directory not found: {views_path}", err=True)
-            sys.exit(1)
-        
-        # Look for .view.lkml files in the root of views directory
-        view_files = list(views_path.glob("*.view.lkml"))
-        
-        # Apply exclusion patterns
-        if exclude:
-            import fnmatch
-            filtered_files = []
-            for view_file in view_files:
-                should_exclude = False
-                for pattern in exclude:
-                    if fnmatch.fnmatch(view_file.name, pattern):
-                        should_exclude = True
-                        break
-                if not should_exclude:
-                    filtered_files.append(view_file)
-            view_files = filtered_files
+        if files_from is not None:
+            view_files, missing = select_listed_files(read_file_list(files_from), exclude)
+            for listed_path in missing:
+                click.echo(f"⚠️  Listed file not found: {listed_path}", err=True)
+            source_label = "the file list"
+        else:
+            if not views_path.exists():
+                click.echo(f"❌ Views directory not found: {views_path}", err=True)
+                sys.exit(1)
+            view_files = discover_view_files(views_path, recursive=recursive, exclude=exclude)
+            source_label = str(views_path)
         
         if not view_files:
-            click.echo(f"📂 No .view.lkml files found in {views_path}")
+            click.echo(f"📂 No .view.lkml files found in {source_label}")
             if exclude:
                 click.echo(f"   (Excluded patterns: {', '.join(exclude)})")
             return
         
-        click.echo(f"📂 Found {len(view_files)} view file(s) in {views_path}")
-        for vf in view_files:
+        click.echo(f"📂 Found {len(view_files)} view file(s) in {source_label}")
+        for vf in view_files[:MAX_LISTED_FILES]:
             click.echo(f"   📄 {vf.name}")
+        if len(view_files) > MAX_LISTED_FILES:
+            click.echo(f"   ... and {len(view_files) - MAX_LISTED_FILES} more")
         
         if exclude:
             click.echo(f"   (Excluded patterns: {', '.join(exclude)})")
         
+        # Views are written to <output-dir>/views/<name>/, so names must be unique across folders
+        seen_names = {}
+        for vf in view_files:
+            name = LookerExploreBuilder.extract_view_name_from_path(str(vf))
+            if name in seen_names:
+                click.echo(f"⚠️  {vf} and {seen_names[name]} both produce view '{name}'", err=True)
+            else:
+                seen_names[name] = vf
+        
+        # Every node sees the same file list, so each builds a disjoint share of it
+        if shard:
+            all_files = len(view_files)
+            view_files = select_shard(view_files, shard_index, shard_count, shard_by_size)
+            click.echo(f"🧩 Shard {shard_index}/{shard_count}: {len(view_files)} of {all_files} view file(s)")
+        
+        # Skip views whose inputs match the manifest from the previous run
+        manifest = BatchManifest.load(output_dir, config)
+        view_files, unchanged_files, hashes = partition_unchanged(manifest, view_files)
+        if force:
+            view_files, unchanged_files = view_files + unchanged_files, []
+        if unchanged_files:
+            click.echo(f"⏭️  Skipping {len(unchanged_files)} unchanged view file(s)")
+        
         if dry_run:
             click.echo(f"\n🔍 DRY RUN - Preview of batch processing:")
             for view_file in view_files:
-                original_name = LookerExploreBuilder.extract_view_name_from_path(str(view_file))
-                click.echo(f"\n   📄 {view_file.name} → {original_name}")
-                click.echo(f"      📁 Output: {output_dir}/views/{original_name}/")
-                click.echo(f"      📄 Files: {original_name}.source.view.lkml, {original_name}.semantic.view.lkml, {original_name}.style.view.lkml")
-                click.echo(f"      📄 Explore: {output_dir}/explores/{original_name}.explore.lkml")
+                # Multi-view files produce one set of layers per view they define
+                view_names = [name for name, _ in view_blocks(view_file.read_text())]
+                if len(view_names) <= 1:
+                    view_names = [LookerExploreBuilder.extract_view_name_from_path(str(view_file))]
+                click.echo(f"\n   📄 {view_file.name} → {', '.join(view_names)}")
+                for original_name in view_names:
+                    click.echo(f"      📁 Output: {output_dir}/views/{original_name}/")
+                    click.echo(f"      📄 Files: {original_name}.source.view.lkml, {original_name}.semantic.view.lkml, {original_name}.style.view.lkml")
+                    click.echo(f"      📄 Explore: {output_dir}/explores/{original_name}.explore.lkml")
             
             click.echo(f"\n✨ Use --dry-run=false to process all files")
             return
         
+        # Unchanged views are already generated - just retire the original file
+        writes = WriteStats()
+        for view_file in unchanged_files:
+            writes.count(SKIPPED, len(manifest.outputs(str(view_file))))
+            view_file.unlink()
+        
         # Process each file
-        click.echo(f"\n🚀 Processing {len(view_files)} view files...")
+        jobs = jobs or default_jobs()
+        if jobs > 1:
+            click.echo(f"\n🚀 Processing {len(view_files)} view files with {jobs} workers...")
+        else:
+            click.echo(f"\n🚀 Processing {len(view_files)} view files...")
+        
+        # One ledger for the whole batch (a fragment per shard); workers append a record per view
+        if shard:
+            stale = clear_stale_fragments(output_dir, shard_index, shard_count)
+            if stale:
+                click.echo(f"🧹 Removed {len(stale)} stale shard fragment(s) from an earlier run")
+            header = {**run_header(config), **shard_header(shard_index, shard_count, shard_by_size, len(view_files))}
+            ledger = create_fragment(output_dir, header, shard_index, shard_count)
+        else:
+            ledger = RunLedger.create(Path(output_dir) / LEDGER_DIR_NAME, run_header(config))
         
+        # Workers dump one profile per view; they are merged next to the ledger afterwards
+        profile_dir = None
+        if profile:
+            import tempfile
+            profile_dir = tempfile.mkdtemp(prefix=f"{ledger.run_id}-", dir=ledger.path.parent)
+        
+        # Results stream back in completion order; the summary keeps discovery order
+        order = {str(view_file): i for i, view_file in enumerate(view_files)}
         results = []
-        for i, view_file in enumerate(view_files, 1):
-            original_name = LookerExploreBuilder.extract_view_name_from_path(str(view_file))
-            
-            click.echo(f"\n[{i}/{len(view_files)}] Processing: {view_file.name}")
-            click.echo(f"🏷️  Using name: '{original_name}'")
+        stage_totals = {}
+        meter = ThroughputMeter(len(view_files))
+        parse_cache = _open_parse_cache(cache, cache_dir, output_dir)
+        for i, result in enumerate(run_batch(view_files, config, output_dir, jobs, parse_cache, ledger, profile_dir), 1):
+            results.append(result)
+            meter.update()
+            if result['success']:
+                manifest.record(str(result['source_file']), hashes[str(result['source_file'])], result['results'])
+                for view_result in result['results']:
+                    for stage, ms in view_result['metadata']['timings_ms'].items():
+                        stage_totals[stage] = stage_totals.get(stage, 0.0) + ms
+                    writes.add(view_result['metadata'].get('writes', {}))
+            else:
+                manifest.forget(str(result['source_file']))
             
-            try:
-                # Create builder for this view
-                builder = LookerExploreBuilder(original_name, config, output_dir)
-                
-                # Generate files
-                result = builder.build_complete_explore(str(view_file))
-                results.append({
-                    'view_name': original_name,
-                    'source_file': view_file,
-                    'result': result,
-                    'success': True
-                })
-                
-                click.echo(f"   ✅ Generated files for '{original_name}'")
-                
-            except Exception as e:
-                click.echo(f"   ❌ Error processing {view_file.name}: {e}")
-                results.append({
-                    'view_name': original_name,
-                    'source_file': view_file,
-                    'error': str(e),
-                    'success': False
-                })
+            click.echo(f"\n[{i}/{len(view_files)}] Processed: {result['source_file'].name} ({meter.describe()})")
+            if result['success']:
+                click.echo(f"   ✅ Generated files for {', '.join(repr(name) for name in result['view_names'])}")
+            else:
+                click.echo(f"   ❌ Error processing {result['source_file'].name}: {result['error']}")
+        
+        results.sort(key=lambda r: order[str(r['source_file'])])
+        manifest.save()
         
         # Summary
         successful = [r for r in results if r['success']]
@@ -230,17 +390,33 @@ def batch(views_dir, output_dir, dry_run, exclude):
         click.echo(f"\n📊 Batch Processing Summary:")
         click.echo(f"   ✅ Successful: {len(successful)}")
         click.echo(f"   ❌ Failed: {len(failed)}")
+        if unchanged_files:
+            click.echo(f"   ⏭️  Unchanged: {len(unchanged_files)}")
+        click.echo(f"   📝 Files: {writes.describe()}")
         
         if successful:
             click.echo(f"\n✅ Successfully processed views:")
             for result in successful:
-                click.echo(f"   📄 {result['view_name']}")
+                for name in result['view_names']:
+                    click.echo(f"   📄 {name}")
         
         if failed:
             click.echo(f"\n❌ Failed to process:")
             for result in failed:
                 click.echo(f"   📄 {result['view_name']}: {result['error']}")
         
+        if stage_totals:
+            _echo_timings(stage_totals, "Stage timings (all views)")
+        
+        click.echo(f"\n📊 Run ledger: {ledger.path}")
+        
+        if profile_dir:
+            import shutil
+            profile_path = merge_profiles(sorted(Path(profile_dir).glob("*.pstats")), ledger.path.with_suffix(".pstats"))
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            if profile_path:
+                _echo_profile(profile_path)
+        
         click.echo(f"\n🎉 Batch processing complete!")
         
     except Exception as e:
@@ -248,12 +424,320 @@ def batch(views_dir, output_dir, dry_run, exclude):
         sys.exit(1)
 
 
+@lookml.command()
+@click.option('--views-dir', '-v', default='model_project/views', help='Views directory to watch (default: model_project/views)')
+@click.option('--output-dir', '-o', default='model_project', help='Output directory (default: model_project)')
+@click.option('--config', 'config_file', default='config.yaml', help='Config file to watch (default: config.yaml)')
+@click.option('--interval', type=click.FloatRange(min=0.01), default=0.2, help='Polling interval in seconds (default: 0.2)')
+@click.option('--debounce', type=click.FloatRange(min=0), default=0.3, help='Quiet period before rebuilding, in seconds (default: 0.3)')
+@click.option('--initial', is_flag=True, help='Build every view once before watching')
+@click.option('--cache', is_flag=True, help='Reuse parsed views from the on-disk parse cache (.lookml_cache)')
+@click.option('--cache-dir', type=click.Path(path_type=Path), default=None, help='Parse cache location (implies --cache)')
+def watch(views_dir, output_dir, config_file, interval, debounce, initial, cache, cache_dir):
+    """Regenerate views as they are saved
+    
+    Keeps the configuration loaded in one process and polls the views
+    directory and config file. A saved view is rebuilt on its own; a config
+    change rebuilds every view (only the explores if just the ontology
+    changed). Original view files are kept. Press Ctrl+C to stop.
+    
+    Examples:
+        lookml watch
+        lookml watch --initial --cache
+        lookml watch --views-dir custom_views --debounce 1
+    """
+    from .watcher import PollingWatcher, WatchSession
+    
+    views_path = Path(views_dir)
+    if not views_path.exists():
+        click.echo(f"❌ Views directory not found: {views_path}", err=True)
+        sys.exit(1)
+    
+    try:
+        session = WatchSession(views_dir, output_dir, config_file, _open_parse_cache(cache, cache_dir, output_dir))
+    except Exception as e:
+        click.echo(f"❌ Error loading configuration: {e}", err=True)
+        sys.exit(1)
+    
+    def report(results):
+        for result in results:
+            if not result['success']:
+                click.echo(f"   ❌ {result['view_name'] or config_file}: {result['error']}")
+            elif result['action'] == 'explore':
+                click.echo(f"   🧭 Explore regenerated for '{result['view_name']}' in {result['seconds'] * 1000:.0f} ms")
+            else:
+                click.echo(f"   🔄 Regenerated '{result['view_name']}' in {result['seconds'] * 1000:.0f} ms")
+    
+    watcher = PollingWatcher(views_dir, config_file, interval, debounce)
+    if initial:
+        click.echo(f"🚀 Building {len(session.view_files())} view file(s)...")
+        report(session.build_all())
+    
+    click.echo(f"👀 Watching {views_path} and {config_file} (Ctrl+C to stop)")
+    click.echo(f"📊 Run ledger: {session.ledger.path}")
+    try:
+        for changed in watcher.changes():
+            click.echo(f"\n✏️  {len(changed)} change(s) detected")
+            ledger_path = session.ledger.path
+            report(session.handle_changes(changed))
+            if session.ledger.path != ledger_path:
+                click.echo(f"📊 Config reloaded; run ledger: {session.ledger.path}")
+    except KeyboardInterrupt:
+        click.echo("\n👋 Stopped watching")
+
+
+@lookml.command()
+@click.option('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+@click.option('--port', '-p', type=click.IntRange(min=0, max=65535), default=8765, help='Port to listen on (default: 8765)')
+@click.option('--socket', 'socket_path', type=click.Path(path_type=Path), default=None, help='Listen on a Unix socket instead of a TCP port')
+@click.option('--output-dir', '-o', default='model_project', help='Output directory for written files (default: model_project)')
+@click.option('--project-dir', default='.', help="Directory requests may read 'path' from (default: current directory)")
+@click.option('--config', 'config_file', default='config.yaml', help='Config file, reloaded when it changes (default: config.yaml)')
+@click.option('--cache', is_flag=True, help='Back the in-memory parse cache with the on-disk one (.lookml_cache)')
+@click.option('--cache-dir', type=click.Path(path_type=Path), default=None, help='Parse cache location (implies --cache)')
+@click.option('--allow-remote', is_flag=True, help='Allow a non-loopback --host (there is no authentication)')
+@click.option('--verbose', is_flag=True, help='Log every request')
+def serve(host, port, socket_path, output_dir, project_dir, config_file, cache, cache_dir, allow_remote, verbose):
+    """Serve generate/classify/dry-run requests from a warm process
+    
+    Loads the configuration and parser once and answers JSON requests over
+    HTTP (or a Unix socket), so editors and CI skip interpreter startup per
+    file. POST a body like {"content": "...", "view_name": "orders"} or
+    {"path": "views/orders.view.lkml", "write": true} to /generate, /classify
+    or /dry-run; GET /stats reports throughput and latency. Requests can only
+    read files below --project-dir and write below --output-dir, and original
+    view files are never deleted. The server has no authentication, so it
+    only listens on loopback addresses unless --allow-remote is given.
+    Press Ctrl+C to stop.
+    
+    Examples:
+        lookml serve
+        lookml serve --socket /tmp/lookml.sock --cache
+        curl -s localhost:8765/classify -d '{"path": "model_project/views/orders.view.lkml"}'
+    """
+    from .server import GenerationService, create_server, is_loopback, server_address
+    
+    try:
+        service = GenerationService(config_file, output_dir, _open_parse_cache(cache, cache_dir, output_dir),
+                                    project_dir=project_dir)
+    except Exception as e:
+        click.echo(f"❌ Error loading configuration: {e}", err=True)
+        sys.exit(1)
+    
+    if allow_remote and not socket_path and not is_loopback(host):
+        click.echo(f"⚠️  Listening on {host} without authentication: anyone who can reach it can read views "
+                   f"below {service.project_root} and write below {service.output_root}", err=True)
+    try:
+        server = create_server(service, host, port, str(socket_path) if socket_path else None, verbose,
+                               allow_remote=allow_remote)
+    except ValueError as e:
+        click.echo(f"❌ {e} (use --allow-remote to override)", err=True)
+        sys.exit(1)
+    except OSError as e:
+        click.echo(f"❌ Cannot listen on {socket_path or f'{host}:{port}'}: {e}", err=True)
+        sys.exit(1)
+    
+    click.echo(f"🛰️  Serving on {server_address(server)} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path and socket_path.exists():
+            socket_path.unlink()
+    
+    stats = service.stats.snapshot()
+    click.echo(f"\n👋 Stopped after {stats['requests']} request(s) ({stats['requests_per_s']}/s)")
+    for action, action_stats in stats['actions'].items():
+        click.echo(f"   {action:<10} {action_stats['requests']:>6} requests  "
+                   f"p50 {action_stats['p50_ms']:.1f} ms  p95 {action_stats['p95_ms']:.1f} ms")
+
+
+@lookml.command()
+@click.argument('explores', nargs=-1)
+@click.option('--config', 'config_file', default='config.yaml', help='Config file holding the ontology (default: config.yaml)')
+@click.option('--max-depth', type=click.IntRange(min=1), default=4, help='Longest join path to follow (default: 4)')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+@click.option('--check', is_flag=True, help='Exit with status 1 if any explore chains fan-out joins')
+def graph(explores, config_file, max_depth, as_json, check):
+    """Analyze the ontology's join graph
+    
+    Reports, per explore, its one_to_many/many_to_many (fan-out) joins and any
+    join paths that chain two or more of them - those force symmetric
+    aggregates in Looker. Also lists join cycles.
+    
+    Examples:
+        lookml graph
+        lookml graph orders customers --max-depth 6
+        lookml graph --check --json
+    """
+    import json
+    from .config import LookerConfig
+    from .join_graph import JoinGraph
+    
+    config_path = Path(config_file)
+    config = LookerConfig.from_yaml_file(str(config_path)) if config_path.exists() else LookerConfig.get_default_config()
+    join_graph = JoinGraph.from_ontology(config.ontology)
+    reports = join_graph.fanout_reports([explore.lower() for explore in explores] or None, max_depth)
+    cycles = join_graph.cycles()
+    
+    if as_json:
+        click.echo(json.dumps({"explores": [r.to_dict() for r in reports], "cycles": cycles}, indent=2))
+    else:
+        click.echo(f"🕸️  {len(join_graph.explores())} explore(s), {len(join_graph.nodes())} view(s) in the join graph")
+        for report in reports:
+            marker = "⚠️ " if report.flagged else "✅"
+            click.echo(f"\n{marker} {report.explore}: {report.joins} join(s), "
+                       f"{len(report.fanout_joins)} fan-out, {report.reachable} reachable")
+            if report.fanout_joins:
+                click.echo(f"   Fan-out joins: {', '.join(report.fanout_joins)}")
+            for count, path in report.chains:
+                click.echo(f"   🔗 {count} chained fan-out joins: {' → '.join(path)}")
+        if cycles:
+            click.echo(f"\n🔁 Join cycles:")
+            for cycle in cycles:
+                click.echo(f"   {' ↔ '.join(cycle)}")
+    
+    if check and any(report.flagged for report in reports):
+        sys.exit(1)
+
+
+@lookml.command()
+@click.argument('fragments', nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option('--output-dir', '-o', default='model_project', help='Output directory (default: model_project)')
+@click.option('--check', is_flag=True, help='Only verify the fragments; do not write the merged ledger')
+def merge(fragments, output_dir, check):
+    """Merge the run-ledger fragments of a sharded batch into one run
+    
+    Takes the fragment files written by `lookml batch --shard i/N` (or
+    directories holding them). Fails without writing anything if a shard is
+    missing or repeated, the shards used different configurations, or an
+    explore file was produced by more than one shard.
+    
+    Examples:
+        lookml merge model_project/runs/shards
+        lookml merge artifacts/shard-*/runs/shards --check
+    """
+    from .sharding import find_fragments, merge_fragments
+    
+    fragment_paths = find_fragments(str(path) for path in fragments)
+    result = merge_fragments(fragment_paths, output_dir, write=not check)
+    click.echo(f"🧩 {len(fragment_paths)} fragment(s), {result.views} view(s) across {result.count} shard(s)")
+    
+    for error in result.errors:
+        click.echo(f"   ❌ {error}", err=True)
+    if result.missing:
+        click.echo(f"   ❌ Missing shard(s): {', '.join(f'{i}/{result.count}' for i in result.missing)}", err=True)
+    for explore, shards in result.conflicts.items():
+        click.echo(f"   ❌ {explore} produced by shards {', '.join(map(str, shards))}", err=True)
+    if not result.ok:
+        sys.exit(1)
+    
+    if result.ledger:
+        click.echo(f"✅ Merged run ledger: {result.ledger.path}")
+    else:
+        click.echo("✅ Shards are complete and disjoint")
+
+
+@lookml.command()
+@click.argument('view_name', required=False)
+@click.option('--output-dir', '-o', default='model_project', help='Output directory (default: model_project)')
+@click.option('--run-id', default=None, help='Run to summarize (default: the most recent run)')
+def summary(view_name, output_dir, run_id):
+    """Show the summary of a run, or of one view within it
+    
+    Summaries are rendered from the run ledger in <output-dir>/runs/.
+    
+    Examples:
+        lookml summary
+        lookml summary financial_transactions
+        lookml summary --run-id 2025-01-01T12-00-00-1a2b3c4d
+    """
+    from .run_ledger import RunLedger, LEDGER_DIR_NAME, LEDGER_SUFFIX, render_run_summary, render_view_summary
+    
+    runs_dir = Path(output_dir) / LEDGER_DIR_NAME
+    if run_id:
+        ledger = RunLedger(runs_dir / f"{run_id}{LEDGER_SUFFIX}")
+        if not ledger.path.exists():
+            click.echo(f"❌ Run not found: {run_id}", err=True)
+            sys.exit(1)
+    else:
+        ledger = RunLedger.latest(runs_dir)
+        if ledger is None:
+            click.echo(f"❌ No runs found in {runs_dir}", err=True)
+            sys.exit(1)
+    
+    if view_name is None:
+        click.echo(render_run_summary(ledger))
+        return
+    
+    record = ledger.lookup(view_name)
+    if record is None:
+        click.echo(f"❌ View '{view_name}' not found in run {ledger.run_id}", err=True)
+        sys.exit(1)
+    click.echo(render_view_summary(record))
+
+
+@lookml.command()
+@click.argument('project_dir', default='model_project/views', type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option('--output', '-o', default='ontology.yaml', help='Output file name (default: ontology.yaml)')
+@click.option('--exclude', multiple=True, help='Exclude files matching pattern (can be used multiple times)')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None, help='Number of worker processes (default: CPU count)')
+@click.option('--no-cache', is_flag=True, help='Extract every file again instead of reusing cached entities')
+@click.option('--cache-dir', type=click.Path(path_type=Path), default=None, help='Entity cache location (default: .lookml_cache)')
+def init_ontology(project_dir, output, exclude, jobs, no_cache, cache_dir):
+    """Bootstrap an ontology from every view file under a project directory
+    
+    Scans the directory tree for .view.lkml files in parallel and merges
+    their views into ontology entities (primary keys as keys, every other
+    dimension as an attribute). Entities are cached by file content, so
+    re-runs only extract files that changed.
+    
+    Examples:
+        lookml init-ontology
+        lookml init-ontology path/to/lookml/project -o ontology.yaml
+        lookml init-ontology --exclude "*_backup*" --jobs 8
+    """
+    import time
+    import yaml
+    from .batch_runner import default_jobs
+    from .discovery import discover_view_files
+    from .parse_cache import CACHE_DIR_NAME
+    from .project_ontology import EntityCache, merge_entities, ontology_skeleton, scan_entities
+    
+    start = time.perf_counter()
+    paths = discover_view_files(str(project_dir), recursive=True, exclude=exclude)
+    if not paths:
+        click.echo(f"❌ No .view.lkml files found in {project_dir}", err=True)
+        sys.exit(1)
+    
+    cache = None if no_cache else EntityCache(str(cache_dir or CACHE_DIR_NAME))
+    try:
+        results = scan_entities(paths, jobs or default_jobs(), cache)
+    except Exception as e:
+        click.echo(f"❌ Error reading views: {e}", err=True)
+        sys.exit(1)
+    ontology = ontology_skeleton(merge_entities(entities for entities, _ in results))
+    
+    # Large projects produce hundreds of thousands of attributes - use libyaml's emitter when available
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    with open(output, "w") as f:
+        yaml.dump({"ontology": ontology}, f, Dumper=dumper, default_flow_style=False, sort_keys=False, indent=2)
+    
+    cached = sum(1 for _, from_cache in results if from_cache)
+    click.echo(f"🧬 {len(ontology['entities'])} entities from {len(paths)} view file(s) "
+               f"({cached} cached) in {time.perf_counter() - start:.2f}s")
+    click.echo(f"✅ Ontology written to: {output}")
+    click.echo(f"📝 Add relationships and pii_tags, then copy the ontology section into config.yaml")
+
+
 @lookml.command()
 @click.option('--output', '-o', default='config.yaml', help='Output file name (default: config.yaml)')
 def init_config(output):
     """Create a sample configuration file with examples and documentation"""
     try:
-        from lookml_builder.code.config import create_sample_config
+        from .config import create_sample_config
         
         config_path = create_sample_config(output)
         click.echo(f"✅ Created sample configuration: {config_path}")
@@ -3,10 +3,16 @@ Configuration management for LookerExploreBuilder
 Handles YAML configuration files for custom classifications and business rules
 """
 
-import yaml
-from typing import Dict, List, Any, Optional
+import hashlib
+import json
+import textwrap
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from .patterns import FieldPatternMatcher, compile_field_matcher
+from .classification_rules import ClassificationRule, DecisionTable, compile_decision_table, parse_rules
+from .ontology import OntologyIndex
 
 
 @dataclass
@@ -17,6 +23,7 @@ class ClassificationConfig:
     force_as_flags: List[str] = field(default_factory=list)        # Fields that should be flags
     force_as_ids: List[str] = field(default_factory=list)          # Fields that should be IDs
     primary_key: Optional[str] = None
+    rules: List[ClassificationRule] = field(default_factory=list)  # Glob/regex rules, by priority
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ClassificationConfig':
@@ -26,9 +33,16 @@ class ClassificationConfig:
             force_as_measures=data.get('force_as_measures', []),
             force_as_flags=data.get('force_as_flags', []),
             force_as_ids=data.get('force_as_ids', []),
-            primary_key=data.get('primary_key')
+            primary_key=data.get('primary_key'),
+            rules=parse_rules(data.get('rules'))
         )
 
+    def decision_table(self) -> DecisionTable:
+        """Compiled decision table for the exact-name lists and rules"""
+        return compile_decision_table(tuple(self.force_as_ids), tuple(self.force_as_flags),
+                                      tuple(self.force_as_measures), tuple(self.exclude_from_filters),
+                                      tuple(self.rules))
+
 
 @dataclass
 class FormattingConfig:
@@ -53,6 +67,13 @@ class LookerConfig:
     classification: ClassificationConfig = field(default_factory=ClassificationConfig)
     formatting: FormattingConfig = field(default_factory=FormattingConfig)
     ontology: Dict[str, Any] = field(default_factory=dict)
+    # Cached (relationships list, its length, OntologyIndex); dropped whenever ontology is assigned
+    _ontology_index: Any = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == 'ontology':
+            object.__setattr__(self, '_ontology_index', None)
+        object.__setattr__(self, name, value)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'LookerConfig':
@@ -66,6 +87,8 @@ class LookerConfig:
     @classmethod
     def from_yaml_file(cls, config_path: str) -> 'LookerConfig':
         """Load configuration from YAML file"""
+        import yaml
+        
         config_file = Path(config_path)
         if not config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
@@ -82,7 +105,7 @@ class LookerConfig:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary"""
-        return {
+        data = {
             'classification': {
                 'exclude_from_filters': self.classification.exclude_from_filters,
                 'force_as_measures': self.classification.force_as_measures,
@@ -97,9 +120,59 @@ class LookerConfig:
             },
             'ontology': self.ontology
         }
+        # Only present when used, so configs without rules keep their fingerprint
+        if self.classification.rules:
+            data['classification']['rules'] = [rule.to_dict() for rule in self.classification.rules]
+        return data
+    
+    def field_matcher(self) -> FieldPatternMatcher:
+        """Compiled matcher for the formatting patterns and built-in ID/primary-key markers"""
+        return compile_field_matcher(
+            tuple(self.formatting.currency_patterns),
+            tuple(self.formatting.percentage_patterns),
+            tuple(self.formatting.count_patterns)
+        )
+    
+    def classification_rules(self) -> DecisionTable:
+        """Compiled decision table for the classification overrides"""
+        return self.classification.decision_table()
+
+    def ontology_index(self) -> OntologyIndex:
+        """Relationships indexed by from-view, built once per set of relationships
+
+        Checking the cache costs the same however many relationships there
+        are: it is rebuilt when ``ontology`` is assigned, or its relationships
+        list is replaced, grown or shrunk. The index holds the relationship
+        dicts themselves, so edits to their other keys show through; after
+        changing a relationship's ``from`` or replacing one in place, call
+        invalidate_ontology_index().
+        """
+        relationships = self.ontology.get('relationships', []) if self.ontology else []
+        cached = self._ontology_index
+        if cached is None or cached[0] is not relationships or cached[1] != len(relationships):
+            cached = self._ontology_index = (relationships, len(relationships), OntologyIndex(relationships))
+        return cached[2]
+
+    def invalidate_ontology_index(self) -> None:
+        """Rebuild the ontology index on next use (after editing relationships in place)"""
+        self._ontology_index = None
+    
+    def fingerprint(self) -> str:
+        """Stable hash of the effective configuration (classification, formatting, ontology)"""
+        return _fingerprint(self.to_dict())
+    
+    def with_ontology(self, ontology: Dict[str, Any]) -> 'LookerConfig':
+        """Copy of this configuration using a different ontology; this one is left untouched"""
+        return replace(self, ontology=ontology)
+    
+    def snapshot(self) -> 'ConfigSnapshot':
+        """Immutable copy of this configuration that builders on many threads can share"""
+        return ConfigSnapshot.from_dict(self.to_dict())
     
     def save_to_yaml(self, config_path: str) -> None:
         """Save configuration to YAML file"""
+        import yaml
+        
         config_file = Path(config_path)
         config_file.parent.mkdir(parents=True, exist_ok=True)
         
@@ -107,8 +180,153 @@ class LookerConfig:
             yaml.dump(self.to_dict(), f, default_flow_style=False, indent=2)
 
 
+def _fingerprint(data: Dict[str, Any]) -> str:
+    canonical = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only deep copy of YAML data: dicts become mapping proxies and lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain dict/list copy of data frozen by _freeze"""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ClassificationSnapshot:
+    """Immutable ClassificationConfig"""
+    exclude_from_filters: Tuple[str, ...] = ()
+    force_as_measures: Tuple[str, ...] = ()
+    force_as_flags: Tuple[str, ...] = ()
+    force_as_ids: Tuple[str, ...] = ()
+    primary_key: Optional[str] = None
+    rules: Tuple[ClassificationRule, ...] = ()
+
+    def decision_table(self) -> DecisionTable:
+        return compile_decision_table(self.force_as_ids, self.force_as_flags, self.force_as_measures,
+                                      self.exclude_from_filters, self.rules)
+
+
+@dataclass(frozen=True)
+class FormattingSnapshot:
+    """Immutable FormattingConfig"""
+    currency_patterns: Tuple[str, ...]
+    percentage_patterns: Tuple[str, ...]
+    count_patterns: Tuple[str, ...]
+
+
+@dataclass(frozen=True, eq=False)
+class ConfigSnapshot:
+    """Frozen, hashable LookerConfig with its fingerprint, field matcher, decision table and ontology index precomputed
+
+    Reads like a LookerConfig, but nothing on it can change after it is
+    built, so one snapshot can be shared by any number of concurrent builds.
+    Snapshots compare and hash by fingerprint.
+    """
+    classification: ClassificationSnapshot
+    formatting: FormattingSnapshot
+    ontology: Any = field(default_factory=lambda: MappingProxyType({}))
+    _fingerprint: str = field(default="", repr=False)
+    _matcher: Any = field(default=None, repr=False)
+    _rules: Any = field(default=None, repr=False)
+    _ontology_index: Any = field(default=None, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ConfigSnapshot':
+        """Snapshot of the configuration described by a config dictionary"""
+        config = LookerConfig.from_dict(data)
+        classification = ClassificationSnapshot(
+            exclude_from_filters=tuple(config.classification.exclude_from_filters),
+            force_as_measures=tuple(config.classification.force_as_measures),
+            force_as_flags=tuple(config.classification.force_as_flags),
+            force_as_ids=tuple(config.classification.force_as_ids),
+            primary_key=config.classification.primary_key,
+            rules=tuple(config.classification.rules)
+        )
+        formatting = FormattingSnapshot(
+            currency_patterns=tuple(config.formatting.currency_patterns),
+            percentage_patterns=tuple(config.formatting.percentage_patterns),
+            count_patterns=tuple(config.formatting.count_patterns)
+        )
+        ontology = _freeze(config.ontology or {})
+        return cls(
+            classification=classification,
+            formatting=formatting,
+            ontology=ontology,
+            _fingerprint=config.fingerprint(),
+            _matcher=compile_field_matcher(formatting.currency_patterns, formatting.percentage_patterns,
+                                           formatting.count_patterns),
+            _rules=classification.decision_table(),
+            _ontology_index=OntologyIndex.build(ontology)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert configuration to a (mutable) dictionary"""
+        data = {
+            'classification': {
+                'exclude_from_filters': list(self.classification.exclude_from_filters),
+                'force_as_measures': list(self.classification.force_as_measures),
+                'force_as_flags': list(self.classification.force_as_flags),
+                'force_as_ids': list(self.classification.force_as_ids),
+                'primary_key': self.classification.primary_key
+            },
+            'formatting': {
+                'currency_patterns': list(self.formatting.currency_patterns),
+                'percentage_patterns': list(self.formatting.percentage_patterns),
+                'count_patterns': list(self.formatting.count_patterns)
+            },
+            'ontology': _thaw(self.ontology)
+        }
+        if self.classification.rules:
+            data['classification']['rules'] = [rule.to_dict() for rule in self.classification.rules]
+        return data
+
+    def field_matcher(self) -> FieldPatternMatcher:
+        return self._matcher
+
+    def classification_rules(self) -> DecisionTable:
+        return self._rules
+
+    def ontology_index(self) -> OntologyIndex:
+        return self._ontology_index
+
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    def with_ontology(self, ontology: Dict[str, Any]) -> 'ConfigSnapshot':
+        """Snapshot identical to this one but for the ontology"""
+        return ConfigSnapshot.from_dict({**self.to_dict(), 'ontology': ontology})
+
+    def snapshot(self) -> 'ConfigSnapshot':
+        return self
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ConfigSnapshot):
+            return self._fingerprint == other._fingerprint
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._fingerprint)
+
+    def __reduce__(self):
+        # Mapping proxies don't pickle; rebuild from plain data (e.g. in worker processes)
+        return ConfigSnapshot.from_dict, (self.to_dict(),)
+
+
 def create_sample_config(output_path: str = "looker_config.yaml") -> str:
     """Create a sample configuration file with examples and documentation"""
+    import yaml
     
     sample_config = {
         'classification': {
@@ -128,7 +346,13 @@ def create_sample_config(output_path: str = "looker_config.yaml") -> str:
                 'external_ref',    # Example: String external_ref should be an ID, not dimension
                 'tracking_number'  # Example: String tracking_number should be an ID, not dimension
             ],
-            'primary_key': 'transaction_id'  # Example: Override primary key detection
+            'primary_key': 'transaction_id',  # Example: Override primary key detection
+            'rules': [
+                # Example: every numeric *_status_code field is a flag, in any view
+                {'match': '*_status_code', 'role': 'flag'},
+                # Example: no filters for ETL bookkeeping fields in staging views
+                {'match': 'etl_*', 'role': 'no_filter', 'views': ['staging_*']}
+            ]
         },
         'formatting': {
             'currency_patterns': [
@@ -158,6 +382,9 @@ def create_sample_config(output_path: str = "looker_config.yaml") -> str:
         }
     }
     
+    rules_yaml = textwrap.indent(
+        yaml.dump(sample_config['classification']['rules'], default_flow_style=False, sort_keys=False), '    ').rstrip()
+
     # Add comments to the YAML file
     yaml_content = f"""# Looker Explore Builder Configuration
 # This file defines custom classification rules and formatting preferences
@@ -183,6 +410,12 @@ classification:
   
   # Override primary key detection (optional)
   primary_key: {sample_config['classification']['primary_key']}
+  
+  # Pattern rules: a glob (match) or regex over whole field names, assigning
+  # id, flag, measure, auto, no_filter or filter; optionally limited to some
+  # views, and tried highest priority first (exact names above always win)
+  rules:
+{rules_yaml}
 
 # Formatting rules for measures
 # Fields matching these patterns will get appropriate value_format
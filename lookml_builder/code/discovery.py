@@ -0,0 +1,99 @@
+"""
+View file discovery for batch processing
+Walks the views tree with os.scandir (optionally recursively), applies the
+exclusion patterns through one precompiled regex, and reads explicit file
+lists such as the output of `git ls-files -z` or `find -print0`
+"""
+
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, List, Optional, Tuple
+
+VIEW_SUFFIX = ".view.lkml"
+
+# Layers written by the builder itself - never inputs, even when they live under the views directory
+GENERATED_SUFFIXES = (".source.view.lkml", ".semantic.view.lkml", ".style.view.lkml")
+
+
+def is_view_input(name: str) -> bool:
+    """True for base view files (not the generated source/semantic/style layers)"""
+    return name.endswith(VIEW_SUFFIX) and not name.endswith(GENERATED_SUFFIXES)
+
+
+def compile_excludes(patterns: Iterable[str]) -> Callable[[str, str], bool]:
+    """Compile --exclude glob patterns into one predicate over (file name, relative path)
+
+    Patterns containing a `/` are matched against the path relative to the
+    views directory; all others against the file name, as before.
+    """
+    name_patterns = [p for p in patterns if "/" not in p]
+    path_patterns = [p for p in patterns if "/" in p]
+    name_regex = re.compile("|".join(fnmatch.translate(p) for p in name_patterns)) if name_patterns else None
+    path_regex = re.compile("|".join(fnmatch.translate(p) for p in path_patterns)) if path_patterns else None
+
+    def excluded(name: str, relative_path: str) -> bool:
+        return bool((name_regex and name_regex.match(name)) or (path_regex and path_regex.match(relative_path)))
+
+    return excluded
+
+
+def discover_view_files(views_dir: str, recursive: bool = False, exclude: Iterable[str] = ()) -> List[Path]:
+    """Base view files under views_dir in a stable order
+
+    Each directory's files come first (by name), then its subdirectories
+    (by name, depth-first). Hidden directories are skipped and directory
+    symlinks are not followed.
+    """
+    excluded = compile_excludes(exclude)
+    root = os.fspath(views_dir)
+    found: List[Path] = []
+    stack = [(root, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        with os.scandir(directory) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+        subdirectories = []
+        for entry in entries:
+            relative_path = prefix + entry.name
+            if entry.is_file():
+                if is_view_input(entry.name) and not excluded(entry.name, relative_path):
+                    found.append(Path(entry.path))
+            elif recursive and entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."):
+                subdirectories.append((entry.path, relative_path + "/"))
+        # Push in reverse so subdirectories are visited in name order
+        stack.extend(reversed(subdirectories))
+    return found
+
+
+def read_file_list(stream: BinaryIO) -> List[str]:
+    """Paths from a newline- or NUL-delimited list (NUL if the input contains any)"""
+    data = stream.read()
+    separator = b"\0" if b"\0" in data else b"\n"
+    return [os.fsdecode(item.rstrip(b"\r") if separator == b"\n" else item)
+            for item in data.split(separator) if item.strip()]
+
+
+def select_listed_files(paths: Iterable[str], exclude: Iterable[str] = (),
+                        base_dir: Optional[str] = None) -> Tuple[List[Path], List[str]]:
+    """Base view files from an explicit list, and the listed paths that don't exist
+
+    Paths that aren't base view files (other LookML, generated layers) are
+    ignored, so an unfiltered `git ls-files` can be piped in as is.
+    """
+    excluded = compile_excludes(exclude)
+    selected: List[Path] = []
+    missing: List[str] = []
+    seen = set()
+    for raw_path in paths:
+        path = Path(base_dir, raw_path) if base_dir else Path(raw_path)
+        name = path.name
+        if not is_view_input(name) or excluded(name, path.as_posix()) or path in seen:
+            continue
+        seen.add(path)
+        if path.is_file():
+            selected.append(path)
+        else:
+            missing.append(raw_path)
+    return selected, missing
@@ -0,0 +1,328 @@
+"""
+Field index used by semantic classification
+Stores each field name of a view once, with its kind, source LookML type and
+classified roles as bit flags in compact arrays. The ordered category lists
+(strings, ids, measures, ...) are columns of field positions exposed as
+read-only list views, so membership checks are constant-time lookups
+"""
+
+from array import array
+from collections.abc import Sequence
+from enum import IntFlag
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+
+class FieldKind(IntFlag):
+    """Dimension categories produced by categorize_dimensions"""
+    NONE = 0
+    STRING = 1
+    NUMBER = 2
+    TIME = 4
+    BOOLEAN = 8
+
+
+class FieldRole(IntFlag):
+    """Semantic roles assigned by classification"""
+    NONE = 0
+    PRIMARY_KEY = 1
+    ID = 2
+    DIMENSION = 4
+    FILTER = 8
+    FLAG = 16
+    MEASURE = 32
+
+
+# Default measures sum one field and are named after it
+MEASURE_SUFFIX = "_total"
+MEASURE_TYPE = "sum"
+
+
+class FieldEntry:
+    """Index record for a single field name"""
+    __slots__ = ("name", "kind", "source_type", "roles")
+
+    def __init__(self, name: str, kind: FieldKind = FieldKind.NONE, source_type: Optional[str] = None):
+        self.name = name
+        self.kind = kind
+        self.source_type = source_type
+        self.roles = FieldRole.NONE
+
+    def __repr__(self) -> str:
+        return f"FieldEntry({self.name!r}, kind={self.kind!r}, source_type={self.source_type!r}, roles={self.roles!r})"
+
+
+class Measure:
+    """Sum measure over one field; reads like the {"name", "type", "sql"} dict it replaces"""
+    __slots__ = ("field",)
+
+    type = MEASURE_TYPE
+
+    def __init__(self, field: str):
+        self.field = field
+
+    @classmethod
+    def from_dict(cls, measure: Dict[str, Any]) -> 'Measure':
+        """Measure for a default sum measure dict; anything else is rejected"""
+        sql = measure.get("sql", "")
+        field = sql[2:-1] if sql.startswith("${") and sql.endswith("}") else None
+        if field is None or measure.get("type") != MEASURE_TYPE or measure.get("name") != field + MEASURE_SUFFIX:
+            raise ValueError(f"Only default sum measures can be stored, got {measure!r}")
+        return cls(field)
+
+    @property
+    def name(self) -> str:
+        return self.field + MEASURE_SUFFIX
+
+    @property
+    def sql(self) -> str:
+        return f"${{{self.field}}}"
+
+    def keys(self):
+        return ("name", "type", "sql")
+
+    def __getitem__(self, key: str) -> str:
+        # Renderers read these per measure, so skip the property lookups
+        if key == "name":
+            return self.field + MEASURE_SUFFIX
+        if key == "sql":
+            return "${" + self.field + "}"
+        if key == "type":
+            return MEASURE_TYPE
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in ("name", "type", "sql") else default
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"name": self.name, "type": self.type, "sql": self.sql}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Measure):
+            return self.field == other.field
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+class FieldListView(Sequence):
+    """Read-only list of the field names in one column of a FieldIndex
+
+    Compares equal to a list with the same names, and ``copy()`` or ``+``
+    return plain lists for callers that need to build on it.
+    """
+    __slots__ = ("_index", "_key", "_flags")
+
+    def __init__(self, index: 'FieldIndex', key: Union[FieldKind, FieldRole]):
+        self._index = index
+        self._key = key
+        self._flags = index.kinds if isinstance(key, FieldKind) else index.roles
+
+    def _column(self) -> array:
+        return self._index._column(self._key)
+
+    def _item(self, position: int) -> Any:
+        return self._index.names[position]
+
+    def __len__(self) -> int:
+        return len(self._column())
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self._index.names.__getitem__, self._column())
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._item(position) for position in self._column()[item]]
+        return self._item(self._column()[item])
+
+    def __contains__(self, name: object) -> bool:
+        position = self._index._positions.get(name)
+        return position is not None and bool(self._flags[position] & self._key)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, FieldListView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other: Iterable) -> List:
+        return list(self) + list(other)
+
+    def __radd__(self, other: Iterable) -> List:
+        return list(other) + list(self)
+
+    def copy(self) -> List:
+        return list(self)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class MeasureListView(FieldListView):
+    """Read-only list of the measures, created from the measured fields as they are read"""
+    __slots__ = ()
+
+    def _item(self, position: int) -> Measure:
+        return Measure(self._index.names[position])
+
+    def __iter__(self) -> Iterator[Measure]:
+        return map(Measure, map(self._index.names.__getitem__, self._column()))
+
+    def __contains__(self, measure: object) -> bool:
+        if isinstance(measure, dict):
+            try:
+                measure = Measure.from_dict(measure)
+            except ValueError:
+                return False
+        return isinstance(measure, Measure) and super().__contains__(measure.field)
+
+
+class FieldIndex:
+    """Name-keyed index over a view's categorized and classified fields
+
+    Every name is stored once; ``kinds`` and ``roles`` hold its flags by
+    position. A name that appears in several categories (e.g. the same
+    dimension in two views of one file) carries every one of those kinds.
+    Names referenced only by a classification (a forced measure that is not a
+    field of the view) get a position with no kind and are not part of the
+    index proper. Measures are stored as the fields they sum; a measure list
+    assigned with anything other than default sum measures is kept as given
+    in ``custom_measures`` instead.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self.kinds = array("B")
+        self.roles = array("B")
+        self._source_types: Dict[int, str] = {}
+        # Ordered positions per category; kinds and roles share bit values, so they are kept apart
+        self._kind_columns: Dict[FieldKind, array] = {kind: array("I") for kind in FieldKind if kind}
+        self._role_columns: Dict[FieldRole, array] = {role: array("I") for role in FieldRole if role}
+        self.custom_measures: Optional[List[Any]] = None
+
+    @classmethod
+    def build(cls, strings: Iterable[str], numbers: Iterable[str], times: Iterable[str], booleans: Iterable[str],
+              source_types: Optional[Dict[str, str]] = None) -> 'FieldIndex':
+        """Build the index from categorized field lists"""
+        index = cls()
+        for kind, names in ((FieldKind.STRING, strings), (FieldKind.NUMBER, numbers),
+                            (FieldKind.TIME, times), (FieldKind.BOOLEAN, booleans)):
+            index.set_kind(kind, names)
+        if source_types:
+            index.set_source_types(source_types)
+        return index
+
+    def position(self, name: str) -> int:
+        """Position of name, adding it (with no kind or role) if it is new"""
+        position = self._positions.get(name)
+        if position is None:
+            position = self._positions[name] = len(self.names)
+            self.names.append(name)
+            self.kinds.append(0)
+            self.roles.append(0)
+        return position
+
+    def _column(self, key: Union[FieldKind, FieldRole]) -> array:
+        return self._kind_columns[key] if isinstance(key, FieldKind) else self._role_columns[key]
+
+    def _set_column(self, columns: Dict, key: Union[FieldKind, FieldRole], flags: array, names: Iterable[str]) -> None:
+        bit = int(key)
+        for position in columns[key]:
+            flags[position] &= ~bit
+        column = array("I", map(self.position, names))
+        for position in column:
+            flags[position] |= bit
+        columns[key] = column
+
+    def set_kind(self, kind: FieldKind, names: Iterable[str]) -> None:
+        """Replace the (ordered) names categorized as kind"""
+        self._set_column(self._kind_columns, kind, self.kinds, names)
+
+    def set_role(self, role: FieldRole, names: Iterable[str]) -> None:
+        """Replace the (ordered) names assigned role; for MEASURE these are the measured fields"""
+        if role is FieldRole.MEASURE:
+            self.custom_measures = None
+        self._set_column(self._role_columns, role, self.roles, names)
+
+    def set_measures(self, measures: Iterable[Any]) -> None:
+        """Replace the measures: compactly if they are all default sums, otherwise as a plain list"""
+        measures = list(measures)
+        try:
+            fields = [(measure if isinstance(measure, Measure) else Measure.from_dict(measure)).field
+                      for measure in measures]
+        except ValueError:
+            self.set_role(FieldRole.MEASURE, [])
+            self.custom_measures = measures
+            return
+        self.set_role(FieldRole.MEASURE, fields)
+
+    def measures(self) -> Union['MeasureListView', List[Any]]:
+        """The measures: a read-only view of the default sums, or the custom list as assigned"""
+        if self.custom_measures is not None:
+            return self.custom_measures
+        return MeasureListView(self, FieldRole.MEASURE)
+
+    def clear_roles(self) -> None:
+        self.custom_measures = None
+        self._role_columns = {role: array("I") for role in self._role_columns}
+        # Cleared in place: list views hold on to the flags array
+        self.roles[:] = array("B", bytes(len(self.names)))
+
+    def set_source_types(self, source_types: Dict[str, str]) -> None:
+        self._source_types = {self._positions[name]: field_type for name, field_type in source_types.items()
+                              if name in self._positions}
+
+    def source_types(self) -> Dict[str, str]:
+        """Declared LookML type of each field"""
+        return {self.names[position]: field_type for position, field_type in self._source_types.items()}
+
+    def column(self, key: Union[FieldKind, FieldRole]) -> FieldListView:
+        """Read-only view of the names in one category or role, in classification order"""
+        return MeasureListView(self, key) if key is FieldRole.MEASURE else FieldListView(self, key)
+
+    def _entry(self, position: int) -> FieldEntry:
+        entry = FieldEntry(self.names[position], FieldKind(self.kinds[position]),
+                           self._source_types.get(position))
+        entry.roles = FieldRole(self.roles[position])
+        return entry
+
+    def __len__(self) -> int:
+        return sum(1 for kind in self.kinds if kind)
+
+    def __iter__(self) -> Iterator[FieldEntry]:
+        return (self._entry(position) for position, kind in enumerate(self.kinds) if kind)
+
+    def __contains__(self, name: str) -> bool:
+        position = self._positions.get(name)
+        return position is not None and bool(self.kinds[position])
+
+    def get(self, name: str) -> Optional[FieldEntry]:
+        return self._entry(self._positions[name]) if name in self else None
+
+    def is_kind(self, name: str, kind: FieldKind) -> bool:
+        """True if name was categorized as any of the given kinds"""
+        position = self._positions.get(name)
+        return position is not None and bool(self.kinds[position] & kind)
+
+    def has_role(self, name: str, role: FieldRole) -> bool:
+        """True if name is a field of the view and has been assigned any of the given roles"""
+        position = self._positions.get(name)
+        return position is not None and bool(self.kinds[position]) and bool(self.roles[position] & role)
+
+    def assign(self, names: Iterable[str], role: FieldRole) -> None:
+        """Add role to every indexed name in names that does not have it yet"""
+        for name in names:
+            if name in self and not self.roles[self._positions[name]] & role:
+                self.roles[self._positions[name]] |= role
+                self._role_columns[role].append(self._positions[name])
+
+    def with_role(self, role: FieldRole) -> List[str]:
+        """Names carrying the given role, in index order"""
+        return [self.names[position] for position, roles in enumerate(self.roles)
+                if roles & role and self.kinds[position]]
@@ -0,0 +1,216 @@
+"""
+Field-signature scanner
+Classification only needs the name and type of each dimension and
+dimension_group (ontology bootstrapping also its primary_key), so this reads
+them from LookML in one linear pass over its tokens instead of building the
+full lkml parse tree. The tokens follow lkml's lexer; on anything the scanner
+can't vouch for it gives up and callers fall back to lkml.load
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Token kinds (regex group numbers)
+_COMMENT = 1
+_EXPRESSION = 3
+_QUOTED = 4
+_PUNCTUATION = 5
+_LITERAL = 6
+
+_FIELD_KEYS = ("dimension", "dimension_group")
+
+# Frame kinds of the block stack
+_TOP, _VIEW, _FIELD, _OTHER = range(4)
+
+# Keys that would clash with the name/plural keys lkml.load puts in the same dict
+_RESERVED_KEYS = {
+    _TOP: frozenset(("views",)),
+    _VIEW: frozenset(("name", "dimensions", "dimension_groups")),
+    _FIELD: frozenset(("name",)),
+    _OTHER: frozenset(),
+}
+
+
+class UnsupportedLookML(Exception):
+    """Content the scanner can't guarantee to read exactly like lkml.load"""
+
+
+@lru_cache(maxsize=None)
+def _grammar() -> Tuple[Any, frozenset, frozenset]:
+    """Token regex, plural keys and expression block keys, built from lkml's own key tables"""
+    from lkml.keys import EXPR_BLOCK_KEYS, PLURAL_KEYS
+    expression_keys = "|".join(map(re.escape, sorted(EXPR_BLOCK_KEYS, key=len, reverse=True)))
+    token = re.compile(
+        r'[ \t\n]*(?:'
+        r'(#[^\n]*)'
+        rf'|({expression_keys}):(.*?);;'
+        r'|"((?:[^"\\]|\\.)*)"'
+        r'|([{}\[\],:])'
+        r'|([^ \t\n:{}\[\],#";\0][^ \t\n:{},\]\0]*)'
+        r')?', re.DOTALL)
+    return token, frozenset(PLURAL_KEYS), frozenset(EXPR_BLOCK_KEYS)
+
+
+class _Tokens:
+    """Significant tokens of the content as (kind, text), with one token of pushback"""
+    __slots__ = ("_content", "_match", "_position", "_pending")
+
+    def __init__(self, content: str, token: Any):
+        self._content = content
+        self._match = token.match
+        self._position = 0
+        self._pending = None
+
+    def take(self) -> Tuple[Optional[int], Optional[str]]:
+        if self._pending is not None:
+            token, self._pending = self._pending, None
+            return token
+        while True:
+            match = self._match(self._content, self._position)
+            kind = match.lastindex
+            if kind is None:
+                if match.end() == len(self._content):
+                    return None, None
+                # A character lkml's lexer doesn't turn into a token (e.g. a lone ';')
+                raise UnsupportedLookML(f"Unexpected character at offset {match.end()}")
+            self._position = match.end()
+            if kind == _EXPRESSION:
+                return _EXPRESSION, match.group(2)
+            if kind != _COMMENT:
+                return kind, match.group(kind)
+
+    def push(self, token: Tuple[Optional[int], Optional[str]]) -> None:
+        self._pending = token
+
+
+def scan_field_tables(lookml_content: str) -> Optional[List[Dict[str, Any]]]:
+    """Field tables equal to extract_field_tables(lkml.load(content)), or None if lkml must parse it"""
+    return scan_field_signatures(lookml_content, ("type",))
+
+
+def scan_field_signatures(lookml_content: str, properties: Tuple[str, ...]) -> Optional[List[Dict[str, Any]]]:
+    """Per-view tables of [name, *values of properties] for each dimension and dimension_group
+
+    Properties a field doesn't set are None. Returns None if lkml must parse the content.
+    """
+    try:
+        return _scan(lookml_content, properties)
+    except UnsupportedLookML:
+        return None
+
+
+def _scan(lookml_content: str, properties: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    token, plural_keys, expression_keys = _grammar()
+    tokens = _Tokens(lookml_content, token)
+    take = tokens.take
+    field_tables: List[Dict[str, Any]] = []
+    slots = {key: slot for slot, key in enumerate(properties, 1)}
+    # Open blocks as [frame kind, keys seen, view table or field signature]
+    stack: List[list] = [[_TOP, set(), None]]
+
+    def declare(frame: list, key: str) -> None:
+        frame_kind, keys, _ = frame
+        if key in _RESERVED_KEYS[frame_kind]:
+            raise UnsupportedLookML(f"Reserved key '{key}'")
+        if key not in plural_keys:
+            # lkml keeps the last of repeated top-level keys but rejects repeats inside blocks
+            if key in keys and frame_kind != _TOP:
+                raise UnsupportedLookML(f"Repeated key '{key}'")
+            keys.add(key)
+
+    while True:
+        kind, text = take()
+        if kind is None:
+            if len(stack) > 1:
+                raise UnsupportedLookML("Unclosed block")
+            return field_tables
+        if kind == _PUNCTUATION and text == "}":
+            if len(stack) == 1:
+                raise UnsupportedLookML("Unmatched '}'")
+            stack.pop()
+            continue
+
+        frame = stack[-1]
+        frame_kind = frame[0]
+        if kind == _EXPRESSION:
+            declare(frame, text)
+            continue
+        # An expression key only lexes as a literal when its ';;' is missing
+        if kind != _LITERAL or text in expression_keys or take() != (_PUNCTUATION, ":"):
+            raise UnsupportedLookML(f"Expected a key, got {text!r}")
+        key = text
+        declare(frame, key)
+        # Views and their fields must be blocks, and the properties of a field plain values
+        collected = (frame_kind == _TOP and key == "view") or (frame_kind == _VIEW and key in _FIELD_KEYS)
+        slot = slots.get(key) if frame_kind == _FIELD else None
+
+        kind, text = take()
+        name = None
+        if kind == _LITERAL:
+            if text == "-":
+                # lkml joins a detached minus sign to the next literal
+                raise UnsupportedLookML("Detached '-'")
+            following = take()
+            if following == (_PUNCTUATION, "{"):
+                name, kind, text = text, _PUNCTUATION, "{"
+            else:
+                tokens.push(following)
+
+        if kind == _PUNCTUATION and text == "{" and slot is None:
+            if not collected:
+                stack.append([_OTHER, set(), None])
+            elif frame_kind == _TOP:
+                view = {"name": name, "dimensions": [], "dimension_groups": []}
+                field_tables.append(view)
+                stack.append([_VIEW, set(), view])
+            else:
+                signature = [name] + [None] * len(properties)
+                frame[2][key + "s"].append(signature)
+                stack.append([_FIELD, set(), signature])
+        elif kind in (_LITERAL, _QUOTED) and not collected:
+            if slot is not None:
+                frame[2][slot] = text
+        elif kind == _PUNCTUATION and text == "[" and not collected and slot is None:
+            _skip_list(take, tokens.push)
+        else:
+            raise UnsupportedLookML(f"Unexpected value for '{key}'")
+
+
+def _skip_list(take, push) -> None:
+    """Consume a list after its '[': comma-separated values or key: value pairs, one kind throughout"""
+    kind, text = take()
+    if (kind, text) == (_PUNCTUATION, "]"):
+        return
+    if (kind, text) == (_PUNCTUATION, ","):
+        kind, text = take()
+    pairs = None
+    while True:
+        if kind == _LITERAL:
+            following = take()
+            is_pair = following == (_PUNCTUATION, ":")
+            if is_pair:
+                kind, text = take()
+                if kind not in (_LITERAL, _QUOTED):
+                    raise UnsupportedLookML("Unexpected list pair value")
+            else:
+                push(following)
+        elif kind == _QUOTED:
+            is_pair = False
+        else:
+            raise UnsupportedLookML("Unexpected list item")
+        if text == "-" and kind == _LITERAL:
+            raise UnsupportedLookML("Detached '-'")
+        if pairs is None:
+            pairs = is_pair
+        elif pairs != is_pair:
+            raise UnsupportedLookML("List mixes values and pairs")
+
+        kind, text = take()
+        if (kind, text) == (_PUNCTUATION, "]"):
+            return
+        if (kind, text) != (_PUNCTUATION, ","):
+            raise UnsupportedLookML("Expected ',' or ']' in list")
+        kind, text = take()
+        if (kind, text) == (_PUNCTUATION, "]"):
+            return
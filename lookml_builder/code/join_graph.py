@@ -0,0 +1,221 @@
+"""
+Project-wide join graph built from the ontology
+Supports transitive reachability, cycle detection and a per-explore fan-out
+report that flags chains of one_to_many joins (which force Looker to use
+symmetric aggregates)
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .ontology import WILDCARD_VIEW
+
+# Relationships that multiply the rows of the view they are joined from
+FANOUT_RELATIONSHIPS = frozenset({"one_to_many", "many_to_many"})
+DEFAULT_RELATIONSHIP = "many_to_one"
+DEFAULT_MAX_DEPTH = 4
+
+
+@dataclass(frozen=True)
+class JoinEdge:
+    """One relationship from a view to the view it joins"""
+    source: str
+    target: str
+    relationship: str = DEFAULT_RELATIONSHIP
+    join_type: str = "left_outer"
+
+    @property
+    def fans_out(self) -> bool:
+        return self.relationship in FANOUT_RELATIONSHIPS
+
+
+@dataclass
+class FanoutReport:
+    """Join shape of one explore"""
+    explore: str
+    joins: int
+    fanout_joins: List[str]
+    reachable: int
+    # Paths (explore first) whose fan-out joins chain together, worst first
+    chains: List[Tuple[int, List[str]]] = field(default_factory=list)
+
+    @property
+    def max_chain(self) -> int:
+        """Most fan-out joins on any one path from the explore"""
+        return self.chains[0][0] if self.chains else (1 if self.fanout_joins else 0)
+
+    @property
+    def flagged(self) -> bool:
+        """True if some path chains two or more fan-out joins"""
+        return bool(self.chains)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "explore": self.explore,
+            "joins": self.joins,
+            "fanout_joins": self.fanout_joins,
+            "reachable": self.reachable,
+            "max_chain": self.max_chain,
+            "chains": [{"fanout_joins": count, "path": path} for count, path in self.chains],
+        }
+
+
+class JoinGraph:
+    """Directed graph of view joins; `from: any` joins apply to every explore's first hop"""
+
+    def __init__(self, edges: Iterable[JoinEdge] = ()):
+        self._edges: Dict[str, List[JoinEdge]] = {}
+        self._wildcard: List[JoinEdge] = []
+        for edge in edges:
+            self.add(edge)
+
+    @classmethod
+    def from_ontology(cls, ontology: Dict[str, Any]) -> 'JoinGraph':
+        """Build the graph from every relationship in one pass"""
+        graph = cls()
+        for rel in (ontology or {}).get("relationships", []):
+            if rel.get("from") is None or rel.get("to") is None:
+                continue
+            # Joins are named after the lower-cased target view, as in the generated explores;
+            # sources are lower-cased the same way so `from: Orders` and `to: Orders` are one node
+            graph.add(JoinEdge(
+                source=rel["from"].lower(),
+                target=rel["to"].lower(),
+                relationship=rel.get("relationship", DEFAULT_RELATIONSHIP),
+                join_type=rel.get("type", "left_outer"),
+            ))
+        return graph
+
+    def add(self, edge: JoinEdge) -> None:
+        if edge.source == WILDCARD_VIEW:
+            self._wildcard.append(edge)
+        else:
+            self._edges.setdefault(edge.source, []).append(edge)
+
+    def explores(self) -> List[str]:
+        """Views whose explore has joins: those with joins of their own, then (if
+        there are wildcard joins) every other view in the graph, which gets only those"""
+        explores = list(self._edges)
+        if self._wildcard:
+            explores.extend(sorted(self.nodes() - set(self._edges)))
+        return explores
+
+    def nodes(self) -> Set[str]:
+        nodes = set(self._edges)
+        for edges in list(self._edges.values()) + [self._wildcard]:
+            nodes.update(edge.target for edge in edges)
+        return nodes
+
+    def joins_from(self, view: str, include_wildcard: bool = True) -> List[JoinEdge]:
+        """Direct joins of view (its own, then wildcard joins)"""
+        own = self._edges.get(view, [])
+        return own + self._wildcard if include_wildcard else list(own)
+
+    def reachable(self, view: str, max_depth: Optional[int] = None) -> Dict[str, int]:
+        """Views reachable from view by following joins, with their hop distance
+
+        Wildcard joins are only taken from the starting view.
+        """
+        distances = {view: 0}
+        frontier = [view]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for edge in self.joins_from(node, include_wildcard=node == view):
+                    if edge.target not in distances:
+                        distances[edge.target] = depth
+                        next_frontier.append(edge.target)
+            frontier = next_frontier
+        del distances[view]
+        return distances
+
+    def cycles(self) -> List[List[str]]:
+        """Groups of views that can reach each other (strongly connected components), incl. self-joins"""
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        # Iterative Tarjan, so deep ontologies don't hit the recursion limit
+        for root in sorted(self.nodes()):
+            if root in index:
+                continue
+            work = [(root, iter(self._edges.get(root, [])))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, edges = work[-1]
+                advanced = False
+                for edge in edges:
+                    target = edge.target
+                    if target not in index:
+                        index[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self._edges.get(target, []))))
+                        advanced = True
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index[target])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    self_join = any(edge.target == node for edge in self._edges.get(node, []))
+                    if len(component) > 1 or self_join:
+                        components.append(sorted(component))
+        return sorted(components)
+
+    def fanout_report(self, explore: str, max_depth: int = DEFAULT_MAX_DEPTH) -> FanoutReport:
+        """Join shape of explore: its fan-out joins and every path chaining two or more of them
+
+        Paths are simple (no view twice) and at most max_depth joins long; for
+        each reachable view the path with the most fan-out joins is kept.
+        """
+        direct = self.joins_from(explore)
+        best: Dict[str, Tuple[int, List[str]]] = {explore: (0, [explore])}
+        frontier = [explore]
+        for _ in range(max_depth):
+            next_frontier = []
+            for node in frontier:
+                count, path = best[node]
+                for edge in self.joins_from(node, include_wildcard=node == explore):
+                    if edge.target in path:
+                        continue
+                    chained = count + edge.fans_out
+                    if edge.target not in best or chained > best[edge.target][0]:
+                        best[edge.target] = (chained, path + [edge.target])
+                        next_frontier.append(edge.target)
+            frontier = next_frontier
+
+        chains = sorted(((count, path) for node, (count, path) in best.items() if count >= 2),
+                        key=lambda chain: (-chain[0], chain[1]))
+        return FanoutReport(
+            explore=explore,
+            joins=len(direct),
+            fanout_joins=[edge.target for edge in direct if edge.fans_out],
+            reachable=len(best) - 1,
+            chains=chains,
+        )
+
+    def fanout_reports(self, explores: Optional[Iterable[str]] = None,
+                       max_depth: int = DEFAULT_MAX_DEPTH) -> List[FanoutReport]:
+        """Fan-out reports for the given explores (default: every explore)"""
+        return [self.fanout_report(explore, max_depth) for explore in (explores or self.explores())]
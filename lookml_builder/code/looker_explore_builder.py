@@ -3,37 +3,65 @@ Looker Explore Builder - Core Functions
 Refactored from notebook for CLI conversion
 """
 
-import lkml
-from typing import List, Dict, Any, Tuple, Optional
+import io
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Tuple, Optional, Callable, TextIO, Union
 from pathlib import Path
-import json
 from datetime import datetime
-from .config import LookerConfig, ClassificationConfig, FormattingConfig
+from .config import ConfigSnapshot, LookerConfig, ClassificationConfig, FormattingConfig
+from .parse_cache import ParseCache
+from .field_scanner import scan_field_tables
+from .field_index import FieldIndex, FieldKind, FieldListView, FieldRole, Measure, MeasureListView
+from .ontology import OntologyIndex
+from .run_ledger import RunLedger, LEDGER_DIR_NAME
+from .profiling import StageTimer
+from .output import GeneratedView, DirectorySink, WriteStats, source_path, semantic_path, style_path, explore_path
+from . import classification_rules, patterns, renderer
+
+# Field names that are always treated as primary keys by automatic detection
+PRIMARY_KEY_NAMES = frozenset(["primary_key", "pk", "synthetic_key", "sk", "id"])
+
+GENERATOR_VERSION = "0.1.0"
+
+# Timed stages of build_complete_explore, in execution order
+BUILD_STAGES = ("import", "parse", "classify", "source", "semantic", "style", "explore", "metadata")
+
+
+@dataclass
+class BuildState:
+    """Everything one build of a view works on: its field index (categories and roles), stage timings and write counts
+
+    Builders share their (read-only) configuration; all state a build
+    changes lives here, and each build starts from a fresh one.
+    """
+    field_index: FieldIndex = field(default_factory=FieldIndex)
+    timer: StageTimer = field(default_factory=StageTimer)
+    writes: WriteStats = field(default_factory=WriteStats)
+
+
+def _field_column(key) -> property:
+    """Builder attribute that reads as a view of one field index column; assigning a list replaces it"""
+    setter = FieldIndex.set_kind if isinstance(key, FieldKind) else FieldIndex.set_role
+    return property(lambda self: self.field_index.column(key),
+                    lambda self, names: setter(self.field_index, key, names))
 
 
 class LookerExploreBuilder:
     """Main class for building Looker explores from base views"""
     
-    def __init__(self, view_name: str, config: Optional[LookerConfig] = None, output_base_dir: str = "model_project"):
+    def __init__(self, view_name: str, config: Optional[Union[LookerConfig, ConfigSnapshot]] = None,
+                 output_base_dir: str = "model_project", parse_cache: Optional[ParseCache] = None, sink=None):
         self.view_name = view_name
         self.config = config or LookerConfig.get_default_config()
+        self.parse_cache = parse_cache
         self.output_base_dir = Path(output_base_dir)
         self.view_output_dir = self.output_base_dir / "views" / view_name
         self.explore_output_dir = self.output_base_dir / "explores"
-        self.strings = []
-        self.numbers = []
-        self.times = []
-        self.booleans = []
-        self.dimensions = []
-        self.filters = []
-        self.ids = []
-        self.primary_key = []
-        self.flags = []
-        self.measures = []
+        # Field categories and roles live in the build state's index; the list attributes below are read-only views of it
+        self.state = BuildState()
         
-        # Create output directories
-        self.view_output_dir.mkdir(parents=True, exist_ok=True)
-        self.explore_output_dir.mkdir(parents=True, exist_ok=True)
+        # Files go through the sink, which creates output directories only when something is written
+        self.sink = sink if sink is not None else DirectorySink(self.output_base_dir)
     
     @staticmethod
     def extract_view_name_from_path(file_path: str) -> str:
@@ -67,108 +95,124 @@ class LookerExploreBuilder:
             view_name = cls.extract_view_name_from_path(original_view_path)
         return cls(view_name, config, output_base_dir)
 
+    strings = _field_column(FieldKind.STRING)
+    numbers = _field_column(FieldKind.NUMBER)
+    times = _field_column(FieldKind.TIME)
+    booleans = _field_column(FieldKind.BOOLEAN)
+    primary_key = _field_column(FieldRole.PRIMARY_KEY)
+    ids = _field_column(FieldRole.ID)
+    dimensions = _field_column(FieldRole.DIMENSION)
+    filters = _field_column(FieldRole.FILTER)
+    flags = _field_column(FieldRole.FLAG)
+
+    @property
+    def measures(self) -> Union[MeasureListView, List[Dict[str, Any]]]:
+        return self.field_index.measures()
+
+    @measures.setter
+    def measures(self, measures: List) -> None:
+        self.field_index.set_measures(measures)
+
+    @property
+    def field_index(self) -> FieldIndex:
+        return self.state.field_index
+
+    @field_index.setter
+    def field_index(self, field_index: FieldIndex) -> None:
+        self.state.field_index = field_index
+
+    @property
+    def timer(self) -> StageTimer:
+        return self.state.timer
+
+    @timer.setter
+    def timer(self, timer: StageTimer) -> None:
+        self.state.timer = timer
+
+    @property
+    def source_types(self) -> Dict[str, str]:
+        return self.field_index.source_types()
+
+    @source_types.setter
+    def source_types(self, source_types: Dict[str, str]) -> None:
+        self.field_index.set_source_types(source_types)
+
     def reset(self) -> None:
         """Reset all lists to empty state"""
-        self.strings = []
-        self.numbers = []
-        self.times = []
-        self.booleans = []
-        self.dimensions = []
-        self.filters = []
-        self.ids = []
-        self.primary_key = []
-        self.flags = []
-        self.measures = []
+        self.state = BuildState()
 
     def import_base_view(self, original_view_path: str) -> str:
         """Copy and rename original view file to source view in proper folder structure"""
-        import re
-        
         # Read the original file content
         with open(original_view_path, "r") as file:
             original_content = file.read()
         
         # Extract the original view name from the file path for replacement
         original_view_name = self.extract_view_name_from_path(original_view_path)
+        updated_content = self.rename_view_content(original_content, original_view_name)
         
-        # Replace the view name in the content while preserving SQL table references
-        # This regex looks for "view: original_name {" and replaces with "view: new_name {"
-        updated_content = re.sub(
-            rf'(\bview:\s+){re.escape(original_view_name)}(\s*\{{)',
+        return self.write_source_view(updated_content)
+
+    def rename_view_content(self, lookml_content: str, original_view_name: str) -> str:
+        """Rename the view in LookML content while preserving SQL table references"""
+        import re
+        
+        # This regex looks for "view: original_name {" (or its refinement "view: +original_name {")
+        # and replaces with "view: new_name {"
+        return re.sub(
+            rf'(\bview:\s+\+?){re.escape(original_view_name)}(\s*\{{)',
             rf'\g<1>{self.view_name}\g<2>',
-            original_content,
+            lookml_content,
             flags=re.MULTILINE
         )
-        
-        # Create the source view file name and path
-        source_view_name = f"{self.view_name}.source.view.lkml"
-        source_view_path = self.view_output_dir / source_view_name
-        
-        # Write the updated content to the new location
-        with open(source_view_path, "w") as file:
-            file.write(updated_content)
-        
-        return str(source_view_path)
+
+    def write_source_view(self, source_content: str) -> str:
+        """Write the renamed source view into the view's output folder"""
+        return self._write(source_path(self.view_name), source_content)
+
+    def _write(self, relative_path: str, content: str) -> str:
+        """Hand one document to the sink, counting whether it changed; returns where it went"""
+        self.state.writes.count(self.sink.write(relative_path, content))
+        return self.sink.location(relative_path)
+
+    def _stream(self, relative_path: str, render: Callable[[TextIO], None]) -> str:
+        """Stream one rendered document into the sink, counting whether it changed; returns where it went"""
+        self.state.writes.count(self.sink.stream(relative_path, render))
+        return self.sink.location(relative_path)
 
     def parse_lookml_with_lkml(self, lookml_content: str) -> Tuple[List[str], List[str], List[str], List[str]]:
         """Parse LookML content and categorize dimensions by type"""
-        # Parse the LookML content
-        parsed_lookml = lkml.load(lookml_content)
-        dimensions_string = []
-        dimensions_number = []
-        dimensions_time = []
-        dimensions_boolean = []
-
-        # Traverse the views in LookML
-        for view in parsed_lookml.get("views", []):
-            # Handle regular dimensions
-            for dimension in view.get("dimensions", []):
-                dimension_name = dimension.get("name")
-                dimension_type = dimension.get("type")
-
-                # Categorize dimensions based on their type
-                if dimension_type == "string":
-                    dimensions_string.append(dimension_name)
-                elif "_id" in dimension_name:
-                    dimensions_string.append(dimension_name)
-                elif dimension_type == "number":
-                    dimensions_number.append(dimension_name)
-                elif dimension_type == "time":
-                    dimensions_time.append(dimension_name)
-                elif dimension_type == "yesno":
-                    dimensions_boolean.append(dimension_name)
-            
-            # Handle dimension groups
-            for dimension_group in view.get("dimension_groups", []):
-                dimension_group_name = dimension_group.get("name")
-                dimension_group_type = dimension_group.get("type")
-
-                # Categorize dimension groups of type time
-                if dimension_group_type == "time":
-                    dimensions_time.append(dimension_group_name)
-
-        return dimensions_string, dimensions_number, dimensions_time, dimensions_boolean
+        return categorize_field_tables(self._load_field_tables(lookml_content))
+
+    def _load_field_tables(self, lookml_content: str) -> List[Dict[str, Any]]:
+        """Parse LookML content into field tables, reusing the parse cache when available"""
+        return load_field_tables(lookml_content, self.parse_cache)
 
     def categorize_dimensions(self, base_view_path: str) -> None:
         """Process and categorize dimensions from base view"""
-        # Clear existing categorizations to make function idempotent
-        self.strings = []
-        self.numbers = []
-        self.times = []
-        self.booleans = []
-        
         # Read LookML content from .lkml file
         with open(base_view_path, "r") as file:
             lookml_content = file.read()
 
-        # Parse the LookML
-        self.strings, self.numbers, self.times, self.booleans = self.parse_lookml_with_lkml(lookml_content)
+        self.categorize_lookml(lookml_content)
+
+    def categorize_lookml(self, lookml_content: str) -> None:
+        """Process and categorize dimensions from LookML content already in memory"""
+        # Parse the LookML (categorizing replaces the whole field index, so this is idempotent)
+        self.categorize_tables(self._load_field_tables(lookml_content))
+
+    def categorize_tables(self, field_tables: List[Dict[str, Any]]) -> None:
+        """Categorize dimensions from already-parsed field tables"""
+        strings, numbers, times, booleans = categorize_field_tables(field_tables)
 
         # Move date fields from strings to times
-        for item in self.strings[:]:  # iterate over a copy of the list
-            if "_date" in item:
-                self.strings.remove(item)
-                self.times.append(item)
+        dates = [item for item in strings if "_date" in item]
+        if dates:
+            strings = [item for item in strings if "_date" not in item]
+            times += dates
+
+        self.field_index = FieldIndex.build(strings, numbers, times, booleans, field_source_types(field_tables))
+
     def classify_semantic_fields(self, filters_list: List[str] = None, measure_list: List[str] = None, flags_list: List[str] = None, id_list: List[str] = None) -> None:
         """Classify fields into semantic categories using automatic detection + configuration overrides"""
         # For backward compatibility, if old-style parameters are provided, use them
@@ -183,12 +227,7 @@ class LookerExploreBuilder:
             id_list = id_list or []
 
         # Clear existing classifications to make function idempotent
-        self.filters = []
-        self.measures = []
-        self.flags = []
-        self.dimensions = []
-        self.primary_key = []
-        self.ids = []
+        self.field_index.clear_roles()
 
         if use_legacy_params:
             # Legacy parameter-based approach (for backward compatibility)
@@ -197,378 +236,234 @@ class LookerExploreBuilder:
             # New config-driven approach with automatic detection + overrides
             self._classify_with_config_overrides()
 
+    def _key_term_ids(self) -> set:
+        """Lower-cased '<term>_id' names that mark a primary key for this view"""
+        # Define key terms for PRIMARY KEYS
+        terms = self.view_name.split("_")
+        key_terms = terms + [
+            term[:-3] + "y" if term.endswith("ies")
+            else term[:-1] if term.endswith("s") and not term.endswith("ss")
+            else term
+            for term in terms
+        ]
+        return {f"{key_term.lower()}_id" for key_term in key_terms}
+
+    def _detect_primary_keys(self) -> List[str]:
+        """Automatic primary key detection over string and number fields"""
+        key_term_ids = self._key_term_ids()
+        matcher = self.config.field_matcher()
+        primary_key = []
+        for item in self.strings + self.numbers:
+            lower = item.lower()
+            if lower in PRIMARY_KEY_NAMES or patterns.PRIMARY_KEY in matcher.match(lower):
+                primary_key.append(item)
+                break
+            elif lower in key_term_ids:
+                primary_key.append(item)
+        return primary_key
+
     def _classify_with_legacy_params(self, filters_list: List[str], measure_list: List[str], flags_list: List[str], id_list: List[str]) -> None:
         """Legacy classification method using parameter lists"""
-        # Define key terms for PRIMARY KEYS
-        key_terms = list(set(
-            self.view_name.split("_") + [
-                term[:-3] + "y" if term.endswith("ies")
-                else term[:-1] if term.endswith("s") and not term.endswith("ss")
-                else term
-                for term in self.view_name.split("_")
-            ]
-        ))
+        index = self.field_index
 
         # Build PRIMARY KEYS section
-        for item in self.strings + self.numbers:
-            if item.lower() in ["primary_key", "pk", "synthetic_key", "sk", "id"]:
-                self.primary_key.append(item)
-                break
-            elif "_pk" in item.lower() or "_sk" in item.lower():
-                self.primary_key.append(item)
-                break
-            else:
-                for key_term in key_terms:
-                    if f"{key_term.lower()}_id" == item.lower():
-                        self.primary_key.append(item)
-                        break
+        self.primary_key = self._detect_primary_keys()
+        primary_keys = self.primary_key
         
-        conditions = ["_id", "_krn", "realm"]
-        self.ids = [item for item in self.strings if item not in self.primary_key and any(condition in item.lower() for condition in conditions)]
+        matcher = self.config.field_matcher()
+        ids = [item for item in self.strings if item not in primary_keys and patterns.ID in matcher.match(item)]
         
         # Add numeric fields that are specified as IDs
+        id_set = set(ids)
         for item in id_list:
-            if item in self.numbers and item not in self.ids and item not in self.primary_key:
-                self.ids.append(item)
+            if index.is_kind(item, FieldKind.NUMBER) and item not in id_set and item not in primary_keys:
+                ids.append(item)
+                id_set.add(item)
+        self.ids = ids
 
         # DIMENSIONS - Define dimensions first
-        self.dimensions = [item for item in self.strings if item not in self.ids and item not in self.times and item not in self.primary_key]
+        self.dimensions = [item for item in self.strings if item not in id_set and not index.is_kind(item, FieldKind.TIME) and item not in primary_keys]
 
         # FLAGS - Add both boolean fields and explicitly specified flag fields
-        for item in self.booleans:
-            self.flags.append(item)
+        flags = self.booleans.copy()
+        flag_set = set(flags)
         # Add numeric fields that are specified as flags
         for item in flags_list:
-            if item not in self.flags:  # Avoid duplicates
-                self.flags.append(item)
+            if item not in flag_set:  # Avoid duplicates
+                flags.append(item)
+                flag_set.add(item)
+        self.flags = flags
 
         # MEASURES - Exclude fields that are in flags_list or id_list
-        for item in self.numbers + measure_list:
-            if item not in flags_list and item not in id_list:  # Don't create measures for flag fields or ID fields
-                measure = {
-                    "name": f"{item}_total",  # Append "_total" to measure names
-                    "type": "sum",  # Default measure type
-                    "sql": f"${{{item}}}"  # Reference the numeric field
-                }
-                self.measures.append(measure)
+        # (each measure is a sum over its field, named "<field>_total"; only the field is stored)
+        not_measures = set(flags_list) | set(id_list)
+        index.set_role(FieldRole.MEASURE, [item for item in self.numbers + measure_list if item not in not_measures])
 
         # FILTERS - Automatically create filters for each dimension and each time dimension_group
-        # Add all dimensions as filters
-        for item in self.dimensions:
-            self.filters.append(item)
-        # Add all time dimension_groups as filters
-        for item in self.times:
-            self.filters.append(item)
+        # Add all dimensions and time dimension_groups as filters
+        filters = self.dimensions + self.times
+        filter_set = set(filters)
         # Explicitly add any fields passed in filters_list (e.g., IDs that should have filters)
         for item in filters_list:
-            if item not in self.filters:  # Avoid duplicates
-                self.filters.append(item)
+            if item not in filter_set:  # Avoid duplicates
+                filters.append(item)
+                filter_set.add(item)
+        self.filters = filters
 
     def _classify_with_config_overrides(self) -> None:
         """New classification method using automatic detection with config overrides"""
-        # Define key terms for PRIMARY KEYS
-        key_terms = list(set(
-            self.view_name.split("_") + [
-                term[:-3] + "y" if term.endswith("ies")
-                else term[:-1] if term.endswith("s") and not term.endswith("ss")
-                else term
-                for term in self.view_name.split("_")
-            ]
-        ))
+        index = self.field_index
+        classification = self.config.classification
 
         # 1. PRIMARY KEYS - Check config override first
-        if self.config.classification.primary_key:
+        if classification.primary_key:
             # Use configured primary key if it exists in the fields
-            if self.config.classification.primary_key in (self.strings + self.numbers):
-                self.primary_key.append(self.config.classification.primary_key)
+            if index.is_kind(classification.primary_key, FieldKind.STRING | FieldKind.NUMBER):
+                self.primary_key = [classification.primary_key]
         else:
             # Use automatic detection
-            for item in self.strings + self.numbers:
-                if item.lower() in ["primary_key", "pk", "synthetic_key", "sk", "id"]:
-                    self.primary_key.append(item)
-                    break
-                elif "_pk" in item.lower() or "_sk" in item.lower():
-                    self.primary_key.append(item)
-                    break
-                else:
-                    for key_term in key_terms:
-                        if f"{key_term.lower()}_id" == item.lower():
-                            self.primary_key.append(item)
-                            break
+            self.primary_key = self._detect_primary_keys()
+        # Role views answer membership from the index's flags in O(1)
+        primary_keys = self.primary_key
+
+        # Config overrides: exact names plus any glob/regex rules for this view, each field decided once
+        overrides = self.config.classification_rules().for_view(self.view_name).assign(
+            name for name in index.names if name in index)
 
         # 2. IDs - Automatic detection + config overrides
-        id_conditions = ["_id", "_krn", "realm"]
-        # Start with automatic detection for strings
-        auto_detected_ids = [item for item in self.strings if item not in self.primary_key and any(condition in item.lower() for condition in id_conditions)]
+        # Start with automatic detection for strings (names containing _id, _krn or realm)
+        matcher = self.config.field_matcher()
+        self.ids = [item for item in self.strings if item not in primary_keys and patterns.ID in matcher.match(item)]
+        ids = self.ids
         
         # Add config overrides (additional fields that should be IDs)
-        for item in self.config.classification.force_as_ids:
-            if item in self.strings and item not in auto_detected_ids and item not in self.primary_key:
-                auto_detected_ids.append(item)
-        
-        self.ids = auto_detected_ids
+        index.assign((item for item in overrides[classification_rules.ID]
+                      if index.is_kind(item, FieldKind.STRING) and item not in primary_keys), FieldRole.ID)
 
         # 3. FLAGS - Automatic detection (booleans) + config overrides (numbers)
         # Start with all boolean fields
-        self.flags = self.booleans.copy()
+        self.flags = self.booleans
+        flags = self.flags
         
         # Add numbers that should be flags instead of measures
-        for item in self.config.classification.force_as_flags:
-            if item in self.numbers and item not in self.flags:
-                self.flags.append(item)
+        index.assign((item for item in overrides[classification_rules.FLAG] if index.is_kind(item, FieldKind.NUMBER)),
+                     FieldRole.FLAG)
 
         # 4. DIMENSIONS - Automatic detection
         # Start with strings that are not IDs, times, or primary keys
-        auto_detected_dimensions = [item for item in self.strings if item not in self.ids and item not in self.times and item not in self.primary_key]
-        
-        self.dimensions = auto_detected_dimensions
+        self.dimensions = [item for item in self.strings if item not in ids and not index.is_kind(item, FieldKind.TIME) and item not in primary_keys]
+        dimensions = self.dimensions
 
         # 5. MEASURES - Automatic detection (numbers) minus exclusions (flags, IDs, dimensions, primary keys)
-        excluded_from_measures = set(self.flags + self.ids + self.dimensions + self.primary_key)
-        
-        for item in self.numbers:
-            if item not in excluded_from_measures:
-                measure = {
-                    "name": f"{item}_total",  # Append "_total" to measure names
-                    "type": "sum",  # Default measure type
-                    "sql": f"${{{item}}}"  # Reference the numeric field
-                }
-                self.measures.append(measure)
+        # (each measure is a sum over its field, named "<field>_total"; only the field is stored)
+        measured = [item for item in self.numbers
+                    if item not in flags and item not in ids and item not in dimensions and item not in primary_keys]
         
         # Add additional measures from config
-        for item in self.config.classification.force_as_measures:
+        existing_measures = set(measured)
+        for item in overrides[classification_rules.MEASURE]:
             # Create measure if it doesn't already exist
-            existing_measure_names = [m["name"] for m in self.measures]
-            measure_name = f"{item}_total"
-            if measure_name not in existing_measure_names:
-                measure = {
-                    "name": measure_name,
-                    "type": "sum",
-                    "sql": f"${{{item}}}"
-                }
-                self.measures.append(measure)
+            if item not in existing_measures:
+                measured.append(item)
+                existing_measures.add(item)
+        index.set_role(FieldRole.MEASURE, measured)
 
         # 6. FILTERS - Automatic detection (dimensions + times) minus exclusions
         # Start with all dimensions and time fields (default behavior)
-        auto_detected_filters = self.dimensions.copy() + self.times.copy()
+        auto_detected_filters = self.dimensions + self.times
         
         # Remove fields that are explicitly excluded from filters via config
-        excluded_from_filters = self.config.classification.exclude_from_filters
+        excluded_from_filters = set(overrides[classification_rules.NO_FILTER])
         self.filters = [item for item in auto_detected_filters if item not in excluded_from_filters]
+
     def create_semantic_file(self, dimensions_list: List[str], filters_list: List[str],
                            ids_list: List[str], primary_key_list: List[str],
                            flags_list: List[str], measures_list: List[Dict],
                            times_list: List[str]) -> str:
         """Create semantic layer LookML file"""
-        # Write the LookML with standalone comments for the logical layer
-        refinement_lookml = f'''include: "{self.view_name}.source.view"
-
-view: +{self.view_name} {{
-
-  # IDs
-
-'''
-
-        # Add PRIMARY KEYS
-        for key in primary_key_list:
-            refinement_lookml += f'  dimension: {key} {{\n'
-            refinement_lookml += f'    primary_key: yes\n'
-            refinement_lookml += f'  }}\n\n'
+        # Stream the refinement LookML into the sink, which only writes it if it changed
+        return self._stream(semantic_path(self.view_name), lambda sink: renderer.render_semantic(
+            sink, self.view_name, primary_key_list, ids_list, measures_list))
 
-        for field in ids_list:
-            refinement_lookml += f'  dimension: {field} {{\n'
-            refinement_lookml += f'  }}\n\n'
-
-        # Add METRICS section comment
-        refinement_lookml += f'  # METRICS\n\n'
-
-        # Add METRICS
-        for field in measures_list:
-            refinement_lookml += f'  measure: {field["name"]} {{\n'
-            refinement_lookml += f'    type: {field["type"]}\n'
-            refinement_lookml += f'    sql: {field["sql"]};;\n'
-            refinement_lookml += f'  }}\n\n'
-
-        refinement_lookml += f'}}'
-
-        # Define the refinement file name and path
-        semantic_file_name = f"{self.view_name}.semantic.view.lkml"
-        semantic_file_path = self.view_output_dir / semantic_file_name
-
-        # Write the refinement LookML to the file
-        with open(semantic_file_path, "w") as file:
-            file.write(refinement_lookml)
-
-        return str(semantic_file_path)
     def create_style_file(self, dimensions_list: List[str], filters_list: List[str],
                          ids_list: List[str], primary_key_list: List[str],
                          flags_list: List[str], measures_list: List[Dict],
                          times_list: List[str]) -> str:
         """Create style layer LookML file"""
-        # Initialize the LookML structure
-        refinement_lookml = f'''include: "{self.view_name}.semantic.view"
-
-view: +{self.view_name} {{
-'''
-
-        # Section for IDs
-        refinement_lookml += f'  #########################\n'
-        refinement_lookml += f'  ## IDS\n'
-        refinement_lookml += f'  #########################\n\n'
-
-        # Section for Primary Key
-        refinement_lookml += f'  # PRIMARY KEY\n\n'
-        for field in primary_key_list:
-            refinement_lookml += f'  dimension: {field} {{\n'
-            refinement_lookml += f'    group_label: "IDs"\n'
-            refinement_lookml += f'    # hidden: yes\n'
-            refinement_lookml += f'  }}\n\n'
-
-        for field in ids_list:
-            refinement_lookml += f'  dimension: {field} {{\n'
-            refinement_lookml += f'    group_label: "IDs"\n'
-            refinement_lookml += f'    # hidden: yes\n'
-            refinement_lookml += f'  }}\n\n'
-
-        # Section for Dates and Timestamps
-        refinement_lookml += f'  #########################\n'
-        refinement_lookml += f'  ## DATES & TIMESTAMPS\n'
-        refinement_lookml += f'  #########################\n\n'
-
-        for field in times_list:
-            conditions = ["insert_timestamp", "update_timestamp",]
-            # Remove suffixes "_date", "_timestamp", "_ts" from the field name for label and group_label
-            formatted_field = (field.replace("_date", "")
-                                    .replace("_timestamp", "")
-                                    .replace("_ts", ""))
-            formatted_field = formatted_field.replace("_", " ").title()
-
-            refinement_lookml += f'  dimension_group: {field} {{\n'
-            refinement_lookml += f'    label: "{formatted_field.title()}"\n'
-            refinement_lookml += f'    group_label: " {formatted_field.title()}"\n'
-            refinement_lookml += f'    can_filter: no\n'
-            if any(condition in field.lower() for condition in conditions):
-                refinement_lookml += f'    hidden: yes\n'
-            refinement_lookml += f'  }}\n\n'
-
-            # Create filter dimension_group for time dimension_group in the DATES section
-            refinement_lookml += f'  dimension_group: {field}_filter {{\n'
-            refinement_lookml += f'    view_label: "FILTERS"\n'
-            refinement_lookml += f'    # view_label: ""\n'
-            refinement_lookml += f'    label: "{formatted_field.title()}"\n'
-            refinement_lookml += f'    group_label: " {formatted_field.title()}"\n'
-            refinement_lookml += f'    type: time\n'
-            refinement_lookml += f'    sql: ${{{field}_raw}};;\n'
-            refinement_lookml += f'  }}\n\n'
-
-        measure_names = [m["name"] for m in measures_list]
-
-        # Section for Metrics
-        refinement_lookml += f'  #########################\n'
-        refinement_lookml += f'  ## METRICS\n'
-        refinement_lookml += f'  #########################\n\n'
-
-        for measure in measure_names:
-            # Determine the appropriate value format based on configuration patterns
-            if any(pattern in measure.lower() for pattern in self.config.formatting.currency_patterns):
-                value_format = '"$#,##0.00"'  # Currency format
-            elif any(pattern in measure.lower() for pattern in self.config.formatting.percentage_patterns):
-                value_format = '"0.00%"'  # Percentage format
-            else:
-                value_format = '"#,##0"'  # Standard number format
-
-            refinement_lookml += f'  measure: {measure} {{\n'
-            refinement_lookml += f'  value_format: {value_format}\n'
-            refinement_lookml += f'  }}\n\n'
-
-        refinement_lookml += f'  measure: count {{\n'
-        refinement_lookml += f'    hidden: yes\n'
-        refinement_lookml += f'  }}\n\n'
-
-        refinement_lookml += f'  #########################\n'
-        refinement_lookml += f'  ## MEASURE DIMS\n'
-        refinement_lookml += f'  #########################\n\n'
-
-        # Only create measure dims for numbers that are not IDs or primary keys
-        for field in self.numbers:
-            if field not in ids_list and field not in primary_key_list:  # Exclude numbers that are IDs or primary keys
-                refinement_lookml += f'  dimension: {field} {{\n'
-                refinement_lookml += f'    group_label: "Measure Dims"\n'
-                refinement_lookml += f'    hidden: yes\n'
-                refinement_lookml += f'  }}\n\n'
-
-        # Section for Filters (regular dimensions)
-        refinement_lookml += f'  #########################\n'
-        refinement_lookml += f'  ## DIMENSIONS\n'
-        refinement_lookml += f'  #########################\n\n'
-        refinement_lookml += f'  suggestions: yes\n\n'
-
-        for field in filters_list:
-            # Skip time dimension_groups - they're handled in the DATES & TIMESTAMPS section
-            if field in times_list:
-                continue
-            # For regular dimensions, disable filtering on the original dimension
-            refinement_lookml += f'  dimension: {field} {{\n'
-            refinement_lookml += f'    can_filter: no\n'
-            refinement_lookml += f'  }}\n\n'
-
-            # Create a filter dimension
-            refinement_lookml += f'  dimension: {field}_filter {{\n'
-            refinement_lookml += f'    view_label: "FILTERS"\n'
-            refinement_lookml += f'    # view_label: ""\n'
-            refinement_lookml += f'    label: "{field.replace("_", " ").title()}"\n'
-            refinement_lookml += f'    type: string\n'
-            refinement_lookml += f'    case_sensitive: no\n'
-            refinement_lookml += f'    sql: ${{{field}}};;\n'
-            refinement_lookml += f'  }}\n\n'
-
-        # Close the LookML structure
-        refinement_lookml += f'}}'
-
-        # Define the file name and path
-        style_file_name = f"{self.view_name}.style.view.lkml"
-        style_file_path = self.view_output_dir / style_file_name
-
-        # Write the refinement LookML to the file
-        with open(style_file_path, "w") as file:
-            file.write(refinement_lookml)
-
-        return str(style_file_path)
+        # Stream the refinement LookML into the sink, which only writes it if it changed
+        matcher = self.config.field_matcher()
+        return self._stream(style_path(self.view_name), lambda sink: renderer.render_style(
+            sink, self.view_name, primary_key_list, ids_list, times_list, measures_list, self.numbers,
+            filters_list, matcher))
+
     def generate_explore_file(self, ontology_config: Dict[str, Any] = None) -> str:
         """Generate explore file from ontology configuration"""
-        config = ontology_config or self.config.ontology
-        explore_lookml = f'''explore: {self.view_name} {{
-'''
-        # Add joins from ontology relationships
-        if 'relationships' in config:
-            for rel in config['relationships']:
-                if rel.get('from') == self.view_name or rel.get('from') == 'any':
-                    explore_lookml += f'  join: {rel["to"].lower()} {{\n'
-                    explore_lookml += f'    type: {rel.get("type", "left_outer")}\n'
-                    explore_lookml += f'    relationship: {rel.get("relationship", "many_to_one")}\n'
-                    explore_lookml += f'    sql_on: {rel["via"]} ;;\n'
-                    explore_lookml += f'  }}\n\n'
-
-        explore_lookml += f'}}'
-        explore_file_name = f"{self.view_name}.explore.lkml"
-        explore_file_path = self.explore_output_dir / explore_file_name
-        with open(explore_file_path, "w") as file:
-            file.write(explore_lookml)
-        return str(explore_file_path)
-
-    def log_run_metadata(self, output_dir: str = None) -> Dict[str, Any]:
-        """Log run metadata for tracking"""
-        timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
-        # Default to runs directory inside the output base directory
-        if output_dir is None:
-            output_dir = self.output_base_dir / "runs"
-        run_dir = Path(output_dir) / timestamp
-        run_dir.mkdir(parents=True, exist_ok=True)
-        
-        metadata = {
-            "timestamp": timestamp,
+        # Add joins from ontology relationships (the config's index is built once and shared by every view)
+        index = OntologyIndex.build(ontology_config) if ontology_config else self.config.ontology_index()
+        relationships = index.joins_for(self.view_name)
+
+        return self._stream(explore_path(self.view_name),
+                            lambda sink: renderer.render_explore(sink, self.view_name, relationships))
+
+    def render_semantic(self) -> str:
+        """Semantic layer for the current classification, as a string"""
+        buffer = io.StringIO()
+        renderer.render_semantic(buffer, self.view_name, self.primary_key, self.ids, self.measures)
+        return buffer.getvalue()
+
+    def render_style(self) -> str:
+        """Style layer for the current classification, as a string"""
+        buffer = io.StringIO()
+        renderer.render_style(buffer, self.view_name, self.primary_key, self.ids, self.times, self.measures,
+                              self.numbers, self.filters, self.config.field_matcher())
+        return buffer.getvalue()
+
+    def render_explore(self) -> str:
+        """Explore for this view from the configured ontology, as a string"""
+        buffer = io.StringIO()
+        renderer.render_explore(buffer, self.view_name, self.config.ontology_index().joins_for(self.view_name))
+        return buffer.getvalue()
+
+    def classification(self) -> Dict[str, Any]:
+        """Current field categories and semantic classification as plain data"""
+        return {
+            "strings": list(self.strings),
+            "numbers": list(self.numbers),
+            "times": list(self.times),
+            "booleans": list(self.booleans),
+            "primary_key": list(self.primary_key),
+            "ids": list(self.ids),
+            "dimensions": list(self.dimensions),
+            "filters": list(self.filters),
+            "flags": list(self.flags),
+            "measures": [dict(measure) for measure in self.measures]
+        }
+
+    def generate(self, original_content: str, original_view_name: Optional[str] = None,
+                 field_tables: Optional[List[Dict[str, Any]]] = None) -> GeneratedView:
+        """Render all four layers and the classification in memory, without touching the filesystem"""
+        self.state = BuildState()
+        source_content = self.rename_view_content(original_content, original_view_name or self.view_name)
+        if field_tables is None:
+            self.categorize_lookml(original_content)
+        else:
+            self.categorize_tables(field_tables)
+        self.classify_semantic_fields()
+        return GeneratedView(
+            view_name=self.view_name,
+            source=source_content,
+            semantic=self.render_semantic(),
+            style=self.render_style(),
+            explore=self.render_explore(),
+            classification=self.classification()
+        )
+
+    def collect_run_metadata(self) -> Dict[str, Any]:
+        """Metadata describing the current build of this view"""
+        return {
+            "timestamp": datetime.now().strftime("%Y-%m-%dT%H-%M-%S"),
             "view_name": self.view_name,
-            "generator_version": "0.1.0",
+            "generator_version": GENERATOR_VERSION,
             "counts": {
                 "strings": len(self.strings),
                 "numbers": len(self.numbers),
@@ -581,89 +476,198 @@ view: +{self.view_name} {{
                 "flags": len(self.flags),
                 "measures": len(self.measures)
             },
-            "ontology_config": self.config.ontology
+            "timings_ms": self.timer.as_ms(),
+            "writes": self.state.writes.to_dict()
         }
-        
-        # Write metadata
-        with open(run_dir / "metadata.json", "w") as f:
-            json.dump(metadata, f, indent=2)
-
-        # Write summary
-        summary = f"""# Run Summary - {timestamp}
-
-## View: {self.view_name}
-
-### Field Counts
-- String dimensions: {len(self.strings)}
-- Boolean dimensions: {len(self.booleans)}
-- Number dimensions: {len(self.numbers)}
-- Time dimensions: {len(self.times)}
-
-### Semantic Classifications
-- Dimensions: {len(self.dimensions)}
-- Filters: {len(self.filters)}
-- IDs: {len(self.ids)}
-- Primary Keys: {len(self.primary_key)}
-- Booleans: {len(self.booleans)}
-- Flags: {len(self.flags)}
-- Measures: {len(self.measures)}
-- Numbers: {len(self.numbers)}
-
-### Generated Files
-- {self.view_name}.source.view.lkml
-- {self.view_name}.semantic.view.lkml
-- {self.view_name}.style.view.lkml
-- {self.view_name}.explore.lkml
-"""
-        with open(run_dir / "summary.md", "w") as f:
-            f.write(summary)
-        
+
+    def log_run_metadata(self, output_dir: str = None, ledger: Optional[RunLedger] = None) -> Dict[str, Any]:
+        """Log run metadata for tracking
+
+        Appends one record to ``ledger``; without a ledger, a new single-view
+        run ledger is started in the runs directory.
+        """
+        if ledger is None:
+            # Default to runs directory inside the output base directory
+            if output_dir is None:
+                output_dir = self.output_base_dir / LEDGER_DIR_NAME
+            ledger = RunLedger.create(output_dir, run_header(self.config))
+
+        metadata = self.collect_run_metadata()
+        ledger.append_view(metadata)
+        metadata["run_id"] = ledger.run_id
         return metadata
 
-    def build_complete_explore(self, original_view_path: str, ontology_config: Dict[str, Any] = None) -> Dict[str, str]:
-        """Complete workflow to build all LookML files from original view file"""
-        # Override ontology config if provided (for backward compatibility)
+    def build_complete_explore(self, original_view_path: str, ontology_config: Dict[str, Any] = None,
+                               ledger: Optional[RunLedger] = None,
+                               progress: Optional[Callable[[str], None]] = None,
+                               keep_original: bool = False) -> Dict[str, str]:
+        """Complete workflow to build all LookML files from original view file
+
+        Each step is timed as one of BUILD_STAGES; ``progress`` is called with
+        the stage name as each one finishes. The original view file is removed
+        afterwards unless ``keep_original`` is set.
+        """
+        # Override ontology config if provided (for backward compatibility); the override
+        # applies to this builder only - a config shared with other builders is never changed
         if ontology_config:
-            self.config.ontology = ontology_config
-        
-        # Step 1: Import and rename the base view file
-        source_view_path = self.import_base_view(original_view_path)
+            self.config = self.config.with_ontology(ontology_config)
+        timer = StageTimer(on_stage=progress)
         
-        # Step 2: Categorize dimensions from the source view
-        self.categorize_dimensions(source_view_path)
+        # Step 1: Read the original view once
+        with timer.stage("import"):
+            with open(original_view_path, "r") as file:
+                original_content = file.read()
         
-        # Step 3: Classify semantic fields
-        self.classify_semantic_fields()
+        result = self.build_from_content(original_content, self.extract_view_name_from_path(original_view_path),
+                                         ledger=ledger, timer=timer)
         
-        # Step 4: Generate refinement files
-        semantic_file = self.create_semantic_file(
-            self.dimensions, self.filters, self.ids,
-            self.primary_key, self.flags, self.measures, self.times
-        )
+        # Step 6: Remove the original view file (it's now been copied to source.view.lkml)
+        original_path = Path(original_view_path)
+        if original_path.exists() and not keep_original:
+            original_path.unlink()
         
-        style_file = self.create_style_file(
-            self.dimensions, self.filters, self.ids,
-            self.primary_key, self.flags, self.measures, self.times
-        )
+        result["deleted_original"] = None if keep_original else str(original_path)
+        return result
+
+    def build_from_content(self, original_content: str, original_view_name: str,
+                           field_tables: Optional[List[Dict[str, Any]]] = None,
+                           ledger: Optional[RunLedger] = None,
+                           timer: Optional[StageTimer] = None) -> Dict[str, Any]:
+        """Build all LookML files from view LookML already in memory
+
+        ``field_tables`` skips parsing when the content was already parsed
+        (e.g. as part of a multi-view file).
+        """
+        self.state = BuildState(timer=timer or StageTimer())
+        timer = self.timer
+        
+        # Step 1: Rename the view in memory
+        with timer.stage("import"):
+            source_content = self.rename_view_content(original_content, original_view_name)
+        
+        # Step 2: Categorize dimensions from the in-memory content
+        # (renaming only touches the view header, so the original parses to the same fields)
+        with timer.stage("parse"):
+            if field_tables is None:
+                self.categorize_lookml(original_content)
+            else:
+                self.categorize_tables(field_tables)
         
-        explore_file = self.generate_explore_file()
+        # Step 3: Classify semantic fields
+        with timer.stage("classify"):
+            self.classify_semantic_fields()
         
-        # Step 5: Log metadata
-        metadata = self.log_run_metadata()
+        # Nothing has touched disk so far; write the source layer alongside the others
+        with timer.stage("source"):
+            source_view_path = self.write_source_view(source_content)
         
-        # Step 6: Remove the original view file (it's now been copied to source.view.lkml)
-        original_path = Path(original_view_path)
-        if original_path.exists():
-            original_path.unlink()
+        # Step 4: Generate refinement files
+        with timer.stage("semantic"):
+            semantic_file = self.create_semantic_file(
+                self.dimensions, self.filters, self.ids,
+                self.primary_key, self.flags, self.measures, self.times
+            )
+        
+        with timer.stage("style"):
+            style_file = self.create_style_file(
+                self.dimensions, self.filters, self.ids,
+                self.primary_key, self.flags, self.measures, self.times
+            )
+        
+        with timer.stage("explore"):
+            explore_file = self.generate_explore_file()
+        
+        # Step 5: Log metadata (the ledger record holds every stage before this one)
+        with timer.stage("metadata"):
+            metadata = self.log_run_metadata(ledger=ledger)
+        metadata["timings_ms"] = timer.as_ms()
+        metadata["total_ms"] = round(timer.total * 1000, 3)
         
         return {
             "source_file": source_view_path,
             "semantic_file": semantic_file,
             "style_file": style_file,
             "explore_file": explore_file,
-            "metadata": metadata,
-            "deleted_original": str(original_path)
+            "metadata": metadata
+        }
+
+
+def run_header(config: Union[LookerConfig, ConfigSnapshot]) -> Dict[str, Any]:
+    """Run-level ledger header: generator version and the configuration the run used"""
+    return {
+        "generator_version": GENERATOR_VERSION,
+        "config_fingerprint": config.fingerprint(),
+        "ontology_config": config.to_dict()["ontology"]
+    }
+
+
+def load_field_tables(lookml_content: str, parse_cache: Optional[ParseCache] = None) -> List[Dict[str, Any]]:
+    """Parse LookML content into per-view field tables, reusing the parse cache when available"""
+    # Reuse the field tables from a previous parse of identical content if cached
+    field_tables = parse_cache.get(lookml_content) if parse_cache else None
+    if field_tables is None:
+        # Scan just the field signatures; anything unusual gets the full lkml parse
+        field_tables = scan_field_tables(lookml_content)
+        if field_tables is None:
+            # lkml is only imported when something actually needs parsing
+            import lkml
+            field_tables = extract_field_tables(lkml.load(lookml_content))
+        if parse_cache:
+            parse_cache.put(lookml_content, field_tables)
+    return field_tables
+
+
+def extract_field_tables(parsed_lookml: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Reduce parsed LookML to per-view dimension/dimension_group (name, type) tables"""
+    return [
+        {
+            "name": view.get("name"),
+            "dimensions": [[d.get("name"), d.get("type")] for d in view.get("dimensions", [])],
+            "dimension_groups": [[g.get("name"), g.get("type")] for g in view.get("dimension_groups", [])]
         }
+        for view in parsed_lookml.get("views", [])
+    ]
+
+
+def categorize_field_tables(field_tables: List[Dict[str, Any]]) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """Categorize dimensions from field tables into string, number, time and boolean lists"""
+    dimensions_string = []
+    dimensions_number = []
+    dimensions_time = []
+    dimensions_boolean = []
+
+    # Traverse the views in LookML
+    for view in field_tables:
+        # Handle regular dimensions
+        for dimension_name, dimension_type in view["dimensions"]:
+            # Categorize dimensions based on their type
+            if dimension_type == "string":
+                dimensions_string.append(dimension_name)
+            elif "_id" in dimension_name:
+                dimensions_string.append(dimension_name)
+            elif dimension_type == "number":
+                dimensions_number.append(dimension_name)
+            elif dimension_type == "time":
+                dimensions_time.append(dimension_name)
+            elif dimension_type == "yesno":
+                dimensions_boolean.append(dimension_name)
+
+        # Handle dimension groups
+        for dimension_group_name, dimension_group_type in view["dimension_groups"]:
+            # Categorize dimension groups of type time
+            if dimension_group_type == "time":
+                dimensions_time.append(dimension_group_name)
+
+    return dimensions_string, dimensions_number, dimensions_time, dimensions_boolean
+
+
+def field_source_types(field_tables: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map each field name to the LookML type it was declared with (first declaration wins)"""
+    source_types = {}
+    for view in field_tables:
+        for name, field_type in view["dimensions"] + view["dimension_groups"]:
+            source_types.setdefault(name, field_type)
+    return source_types
 
 
 # Convenience functions for CLI conversion
@@ -686,43 +690,10 @@ def build_explore_from_config_file(original_view_path: str,
 
 def init_ontology_from_lookml(lookml_file_path: str) -> Dict[str, Any]:
     """Initialize ontology from existing LookML file"""
+    from .project_ontology import extract_entities, ontology_skeleton
+    
     with open(lookml_file_path, "r") as file:
         lookml_content = file.read()
     
-    parsed_lookml = lkml.load(lookml_content)
-    
-    # Extract basic structure
-    ontology = {
-        "project": {
-            "name": "extracted_from_lookml",
-            "governance_status": "in_development"
-        },
-        "entities": {},
-        "relationships": []
-    }
-    
-    for view in parsed_lookml.get("views", []):
-        view_name = view.get("name", "unknown")
-        entity_name = view_name.replace("_", "").title()
-        
-        # Extract dimensions
-        attributes = []
-        keys = []
-        for dimension in view.get("dimensions", []):
-            dim_name = dimension.get("name")
-            if dimension.get("primary_key"):
-                keys.append(dim_name)
-            else:
-                attributes.append(dim_name)
-        
-        # Extract dimension groups
-        for dim_group in view.get("dimension_groups", []):
-            attributes.append(dim_group.get("name"))
-        
-        ontology["entities"][entity_name] = {
-            "keys": keys,
-            "attributes": attributes,
-            "pii_tags": []  # Empty - manual flagging required
-        }
-    
-    return ontology
\ No newline at end of file
+    # Keys and attributes per view; pii_tags are left empty - manual flagging required
+    return ontology_skeleton(dict(extract_entities(lookml_content)))
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Build manifest for incremental batch regeneration
+Records the content hash of every input view alongside a fingerprint of the
+configuration and generator version, so unchanged views can be skipped
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .config import LookerConfig
+from .looker_explore_builder import GENERATOR_VERSION
+
+MANIFEST_FILE_NAME = ".lookml_manifest.json"
+OUTPUT_KEYS = ("source_file", "semantic_file", "style_file", "explore_file")
+
+
+def hash_file(file_path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class BatchManifest:
+    """Persisted record of the inputs each generated view was built from"""
+
+    def __init__(self, output_base_dir: str, config: LookerConfig, generator_version: str = GENERATOR_VERSION):
+        self.output_base_dir = Path(output_base_dir)
+        self.path = self.output_base_dir / MANIFEST_FILE_NAME
+        self.config_fingerprint = config.fingerprint()
+        self.generator_version = generator_version
+        self.views: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, output_base_dir: str, config: LookerConfig) -> 'BatchManifest':
+        """Load the manifest for output_base_dir, discarding it if config or generator changed"""
+        manifest = cls(output_base_dir, config)
+        if not manifest.path.exists():
+            return manifest
+
+        try:
+            with open(manifest.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupt manifest only costs a full rebuild
+            return manifest
+
+        if (data.get("config_fingerprint") == manifest.config_fingerprint
+                and data.get("generator_version") == manifest.generator_version):
+            manifest.views = data.get("views", {})
+        return manifest
+
+    def _key(self, view_file: str) -> str:
+        """Manifest key for a view file - its path relative to the output directory"""
+        return Path(os.path.relpath(Path(view_file).resolve(), self.output_base_dir.resolve())).as_posix()
+
+    def _output_paths(self, entry: Dict[str, Any]) -> List[Path]:
+        """Recorded outputs of a manifest entry (stored relative to the output directory)"""
+        return [self.output_base_dir / output for output in entry.get("outputs", [])]
+
+    def is_current(self, view_file: str, content_hash: str) -> bool:
+        """True if view_file was already built from identical content and its outputs still exist"""
+        entry = self.views.get(self._key(view_file))
+        if not entry or entry.get("hash") != content_hash:
+            return False
+        return all(output.exists() for output in self._output_paths(entry))
+
+    def record(self, view_file: str, content_hash: str, results: List[Dict[str, Any]]) -> None:
+        """Record a successful build of view_file (one result per view it defines)"""
+        self.views[self._key(view_file)] = {
+            "hash": content_hash,
+            "outputs": [self._key(result[key]) for result in results for key in OUTPUT_KEYS if key in result]
+        }
+
+    def outputs(self, view_file: str) -> List[Path]:
+        """Files generated from view_file in the recorded build"""
+        return self._output_paths(self.views.get(self._key(view_file), {}))
+
+    def forget(self, view_file: str) -> None:
+        """Drop view_file from the manifest (e.g. after a failed build)"""
+        self.views.pop(self._key(view_file), None)
+
+    def save(self) -> None:
+        """Write the manifest to disk"""
+        self.output_base_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            "generator_version": self.generator_version,
+            "config_fingerprint": self.config_fingerprint,
+            "views": self.views
+        }
+        with open(self.path, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+
+def partition_unchanged(manifest: BatchManifest, view_files: List[Path]) -> Tuple[List[Path], List[Path], Dict[str, str]]:
+    """Split view files into those that need building and those whose inputs are unchanged"""
+    hashes: Dict[str, str] = {}
+    changed: List[Path] = []
+    unchanged: List[Path] = []
+    for view_file in view_files:
+        content_hash = hash_file(str(view_file))
+        hashes[str(view_file)] = content_hash
+        if manifest.is_current(str(view_file), content_hash):
+            unchanged.append(view_file)
+        else:
+            changed.append(view_file)
+    return changed, unchanged, hashes
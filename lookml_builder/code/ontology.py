@@ -0,0 +1,49 @@
+"""
+Indexed ontology relationships
+Groups the ontology's relationships by their `from` view once, so finding a
+view's joins costs time proportional to its own joins rather than the size
+of the whole ontology
+"""
+
+from heapq import merge
+from typing import Any, Dict, List, Tuple
+
+WILDCARD_VIEW = "any"
+
+# (position in the ontology's relationship list, relationship)
+_Entry = Tuple[int, Dict[str, Any]]
+
+
+class OntologyIndex:
+    """from-view -> joins map, with wildcard (`from: any`) joins kept separately"""
+
+    def __init__(self, relationships: List[Dict[str, Any]]):
+        self._by_view: Dict[str, List[_Entry]] = {}
+        self._wildcard: List[_Entry] = []
+        for position, rel in enumerate(relationships):
+            source = rel.get("from")
+            if source == WILDCARD_VIEW:
+                self._wildcard.append((position, rel))
+            elif source is not None:
+                self._by_view.setdefault(source, []).append((position, rel))
+
+    @classmethod
+    def build(cls, ontology: Dict[str, Any]) -> 'OntologyIndex':
+        """Index an ontology config section"""
+        return cls(ontology.get("relationships", []) if ontology else [])
+
+    def joins_for(self, view_name: str) -> List[Dict[str, Any]]:
+        """Relationships from view_name or from any view, in ontology order"""
+        own = self._by_view.get(view_name, [])
+        if not self._wildcard:
+            return [rel for _, rel in own]
+        if not own:
+            return [rel for _, rel in self._wildcard]
+        return [rel for _, rel in merge(own, self._wildcard, key=lambda entry: entry[0])]
+
+    def views(self) -> List[str]:
+        """Views with at least one relationship of their own"""
+        return list(self._by_view)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._by_view.values()) + len(self._wildcard)
@@ -0,0 +1,309 @@
+"""
+Generated documents and the sinks that persist them
+A GeneratedView holds the four rendered LookML documents and the field
+classification in memory; sinks decide where (and whether) they are written
+"""
+
+import io
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+# Outcome of writing one document
+WRITTEN = "written"
+UNCHANGED = "unchanged"
+SKIPPED = "skipped"
+
+# Text buffered by a streamed document before it is compared with (or written to) disk
+STREAM_CHUNK_CHARS = 64 * 1024
+
+
+def source_path(view_name: str) -> str:
+    """Path of a view's source layer, relative to the output directory"""
+    return f"views/{view_name}/{view_name}.source.view.lkml"
+
+
+def semantic_path(view_name: str) -> str:
+    """Path of a view's semantic layer, relative to the output directory"""
+    return f"views/{view_name}/{view_name}.semantic.view.lkml"
+
+
+def style_path(view_name: str) -> str:
+    """Path of a view's style layer, relative to the output directory"""
+    return f"views/{view_name}/{view_name}.style.view.lkml"
+
+
+def explore_path(view_name: str) -> str:
+    """Path of a view's explore, relative to the output directory"""
+    return f"explores/{view_name}.explore.lkml"
+
+
+@dataclass
+class WriteStats:
+    """Counts of documents written, left unchanged (identical on disk) and skipped (not rebuilt)"""
+    written: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    _lock: Any = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def count(self, status: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, status, getattr(self, status) + n)
+
+    def add(self, counts: Dict[str, int]) -> None:
+        """Add counts from another WriteStats' to_dict()"""
+        for status in (WRITTEN, UNCHANGED, SKIPPED):
+            self.count(status, counts.get(status, 0))
+
+    def to_dict(self) -> Dict[str, int]:
+        return {WRITTEN: self.written, UNCHANGED: self.unchanged, SKIPPED: self.skipped}
+
+    def describe(self) -> str:
+        return f"{self.written} written, {self.unchanged} unchanged, {self.skipped} skipped"
+
+
+@dataclass
+class GeneratedView:
+    """Rendered LookML for one view, plus how its fields were classified"""
+    view_name: str
+    source: str
+    semantic: str
+    style: str
+    explore: str
+    classification: Dict[str, Any] = field(default_factory=dict)
+
+    def documents(self) -> Dict[str, str]:
+        """Document contents keyed by path relative to the output directory"""
+        return {
+            source_path(self.view_name): self.source,
+            semantic_path(self.view_name): self.semantic,
+            style_path(self.view_name): self.style,
+            explore_path(self.view_name): self.explore,
+        }
+
+    def write(self, sink) -> Dict[str, str]:
+        """Write every document to sink; returns the builder's result keys mapped to locations"""
+        locations = {}
+        for key, (relative_path, content) in zip(("source_file", "semantic_file", "style_file", "explore_file"),
+                                                 self.documents().items()):
+            sink.write(relative_path, content)
+            locations[key] = sink.location(relative_path)
+        return locations
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"view_name": self.view_name, "documents": self.documents(), "classification": self.classification}
+
+
+class MemorySink:
+    """Keeps written documents in a dict keyed by relative path; touches no files"""
+
+    def __init__(self):
+        self.documents: Dict[str, str] = {}
+        self.stats = WriteStats()
+
+    def write(self, relative_path: str, content: str) -> str:
+        """Store content; returns WRITTEN, or UNCHANGED if identical content is already stored"""
+        status = UNCHANGED if self.documents.get(relative_path) == content else WRITTEN
+        self.documents[relative_path] = content
+        self.stats.count(status)
+        return status
+
+    @contextmanager
+    def open(self, relative_path: str) -> Iterator[TextIO]:
+        buffer = io.StringIO()
+        yield buffer
+        self.write(relative_path, buffer.getvalue())
+
+    def stream(self, relative_path: str, render: Callable[[TextIO], None]) -> str:
+        """Store what render writes to the stream it is given; returns WRITTEN or UNCHANGED"""
+        buffer = io.StringIO()
+        render(buffer)
+        return self.write(relative_path, buffer.getvalue())
+
+    def location(self, relative_path: str) -> str:
+        return relative_path
+
+
+class DirectorySink:
+    """Writes documents under a base directory, only when their content changed
+
+    A document identical to the file on disk (same size, then same bytes) is
+    left alone, so its mtime is kept. Changed documents are written to a
+    temporary file next to the target and renamed over it, so readers never
+    see a partially written file. Streamed documents (``open``/``stream``)
+    are compared with the file chunk by chunk as they are rendered, so memory
+    stays bounded whatever their size and unchanged ones write nothing.
+    """
+
+    def __init__(self, base_dir: str):
+        self.base_dir = Path(base_dir)
+        self.stats = WriteStats()
+        self._created: set = set()
+
+    def write(self, relative_path: str, content: str) -> str:
+        """Write content to relative_path; returns WRITTEN or UNCHANGED"""
+        path = self.base_dir / relative_path
+        data = content.encode("utf-8")
+        status = UNCHANGED if _same_content(path, data) else WRITTEN
+        if status == WRITTEN:
+            self._create_parent(path)
+            _replace_atomically(path, data)
+        self.stats.count(status)
+        return status
+
+    def _create_parent(self, path: Path) -> None:
+        if path.parent not in self._created:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._created.add(path.parent)
+
+    @contextmanager
+    def open(self, relative_path: str) -> Iterator[TextIO]:
+        """Text stream for relative_path; its content replaces the file (if changed) when the block exits"""
+        stream = _ComparingStream(self.base_dir / relative_path, self._create_parent)
+        try:
+            yield stream
+        except BaseException:
+            stream.discard()
+            raise
+        self.stats.count(stream.commit())
+
+    def stream(self, relative_path: str, render: Callable[[TextIO], None]) -> str:
+        """Write what render writes to the stream it is given; returns WRITTEN or UNCHANGED"""
+        stream = _ComparingStream(self.base_dir / relative_path, self._create_parent)
+        try:
+            render(stream)
+            status = stream.commit()
+        except BaseException:
+            stream.discard()
+            raise
+        self.stats.count(status)
+        return status
+
+    def location(self, relative_path: str) -> str:
+        return str(self.base_dir / relative_path)
+
+
+def _same_content(path: Path, data: bytes) -> bool:
+    """True if path holds exactly data - the size is compared first, so most changes cost one stat"""
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as file:
+            return file.read() == data
+    except OSError:
+        return False
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _rename_over(temp_path: Path, path: Path) -> None:
+    try:
+        # Keep the permissions of the file being replaced
+        shutil.copymode(path, temp_path)
+    except OSError:
+        pass
+    os.replace(temp_path, path)
+
+
+def _unlink_quietly(path: Path) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _replace_atomically(path: Path, data: bytes) -> None:
+    """Write data to a temporary sibling of path, then rename it over path"""
+    temp_path = _temp_path(path)
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        _rename_over(temp_path, path)
+    except BaseException:
+        _unlink_quietly(temp_path)
+        raise
+
+
+class _ComparingStream:
+    """Text stream that checks what is written against the file at path as it goes
+
+    Writes are buffered up to STREAM_CHUNK_CHARS, then compared with the next
+    bytes of the existing file. Nothing is written while they match; at the
+    first difference a temporary sibling is started with the matched prefix,
+    and everything after goes straight into it. ``commit`` renames it over the
+    file, or reports UNCHANGED if the output matched the whole file.
+    """
+
+    def __init__(self, path: Path, create_parent: Callable[[Path], None]):
+        self.path = path
+        self._create_parent = create_parent
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._matched = 0
+        self._temp = None
+        try:
+            self._existing = open(path, "rb")
+        except OSError:
+            self._existing = None
+
+    def write(self, text: str) -> int:
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        if self._pending_chars >= STREAM_CHUNK_CHARS:
+            self._flush()
+        return len(text)
+
+    def _flush(self) -> None:
+        data = "".join(self._pending).encode("utf-8")
+        self._pending, self._pending_chars = [], 0
+        if self._temp is None:
+            if self._existing is not None and self._existing.read(len(data)) == data:
+                self._matched += len(data)
+                return
+            self._diverge()
+        self._temp.write(data)
+
+    def _diverge(self) -> None:
+        """Start the temporary file, copying the prefix that matched the existing file"""
+        self._create_parent(self.path)
+        self._temp = open(_temp_path(self.path), "wb")
+        if self._existing is not None:
+            self._existing.seek(0)
+            remaining = self._matched
+            while remaining:
+                chunk = self._existing.read(min(remaining, 1024 * 1024))
+                self._temp.write(chunk)
+                remaining -= len(chunk)
+            self._existing.close()
+            self._existing = None
+
+    def commit(self) -> str:
+        """Keep the rendered document; returns WRITTEN, or UNCHANGED if the file already held it"""
+        self._flush()
+        if self._temp is None:
+            if self._existing is not None and not self._existing.read(1):
+                self._existing.close()
+                return UNCHANGED
+            self._diverge()
+        temp_path = Path(self._temp.name)
+        try:
+            self._temp.close()
+            _rename_over(temp_path, self.path)
+        except BaseException:
+            _unlink_quietly(temp_path)
+            raise
+        return WRITTEN
+
+    def discard(self) -> None:
+        """Drop whatever was rendered, leaving the file as it was"""
+        if self._existing is not None:
+            self._existing.close()
+        if self._temp is not None:
+            self._temp.close()
+            _unlink_quietly(Path(self._temp.name))
@@ -0,0 +1,192 @@
+"""
+Persistent cache of parsed LookML field tables
+Entries are keyed by a hash of the file content plus the parser version, so a
+view is only handed to lkml.load once until it (or the parser) changes
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CACHE_DIR_NAME = ".lookml_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 4096
+
+# Bump FIELD_TABLE_VERSION whenever the shape of the cached field tables changes
+FIELD_TABLE_VERSION = 1
+
+
+def _parser_version() -> str:
+    """Version string of the parser that produced the cached tables"""
+    try:
+        from importlib.metadata import version
+        lkml_version = version("lkml")
+    except Exception:
+        lkml_version = "unknown"
+    return f"lkml-{lkml_version}/fields-{FIELD_TABLE_VERSION}"
+
+
+PARSER_VERSION = _parser_version()
+
+
+def default_cache_dir(output_base_dir: str) -> Path:
+    """Cache location next to the output directory (e.g. ./.lookml_cache for model_project)"""
+    return Path(output_base_dir).resolve().parent / CACHE_DIR_NAME
+
+
+class ParseCache:
+    """Size-bounded on-disk LRU cache of view field tables
+
+    Each entry is a small JSON file named after the content hash. Hits refresh
+    the entry's modification time; when the cache grows past ``max_bytes`` the
+    least recently used entries are evicted first.
+    """
+
+    # Part of every key; subclasses caching other per-file results use their own
+    version = PARSER_VERSION
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._total_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def key(cls, lookml_content: str) -> str:
+        """Cache key for LookML content under the current parser version"""
+        digest = hashlib.sha256(cls.version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(lookml_content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, lookml_content: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached field tables for the content, or None on a miss"""
+        entry_path = self._entry_path(self.key(lookml_content))
+        try:
+            with open(entry_path, "r") as f:
+                field_tables = json.load(f)
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return field_tables
+
+    def put(self, lookml_content: str, field_tables: List[Dict[str, Any]]) -> None:
+        """Store field tables for the content, evicting old entries if over budget"""
+        entry_path = self._entry_path(self.key(lookml_content))
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(field_tables, separators=(",", ":"))
+
+        # Write to a temporary file and rename so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(payload)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        else:
+            self._total_bytes += len(payload)
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """Yield (path, size, mtime) for every cache entry"""
+        if not self.cache_dir.exists():
+            return
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime_ns
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in 90% of its budget"""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def clear(self) -> None:
+        """Remove every cache entry"""
+        for path, _, _ in list(self._entries()):
+            os.unlink(path)
+        self._total_bytes = 0
+
+
+class MemoryParseCache:
+    """Thread-safe in-process LRU cache of field tables, optionally backed by a ParseCache
+
+    Used by long-running processes (``lookml serve``) so repeated requests for
+    the same content skip parsing entirely. Cached tables are shared between
+    callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, backing: Optional[ParseCache] = None):
+        self.max_entries = max_entries
+        self.backing = backing
+        self._entries: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, lookml_content: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached field tables for the content, or None on a miss"""
+        key = ParseCache.key(lookml_content)
+        with self._lock:
+            field_tables = self._entries.get(key)
+            if field_tables is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return field_tables
+        field_tables = self.backing.get(lookml_content) if self.backing else None
+        if field_tables is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        self._store(key, field_tables)
+        with self._lock:
+            self.hits += 1
+        return field_tables
+
+    def put(self, lookml_content: str, field_tables: List[Dict[str, Any]]) -> None:
+        """Store field tables for the content (and in the backing cache, if any)"""
+        self._store(ParseCache.key(lookml_content), field_tables)
+        if self.backing:
+            self.backing.put(lookml_content, field_tables)
+
+    def _store(self, key: str, field_tables: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = field_tables
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
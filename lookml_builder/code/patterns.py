@@ -0,0 +1,91 @@
+"""
+Compiled substring matcher for field-name heuristics
+All substring rules (formatting patterns, ID and primary-key markers) are
+compiled into a single Aho-Corasick automaton, so one scan over a field name
+reports every rule class that matches, whatever the number of patterns
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+# Rule classes reported by FieldPatternMatcher
+CURRENCY = "currency"
+PERCENTAGE = "percentage"
+COUNT = "count"
+ID = "id"
+PRIMARY_KEY = "primary_key"
+
+# Built-in substring heuristics used by classification
+ID_CONDITIONS = ("_id", "_krn", "realm")
+PRIMARY_KEY_MARKERS = ("_pk", "_sk")
+
+
+class FieldPatternMatcher:
+    """Aho-Corasick automaton mapping substrings to rule classes
+
+    Field names are lower-cased before matching (patterns are used as given,
+    like the ``pattern in name.lower()`` checks they replace). ``match`` walks
+    the name once and returns the set of rule classes with at least one
+    pattern occurring in it.
+    """
+
+    def __init__(self, rules: Dict[str, Iterable[str]]):
+        # Trie as parallel lists: goto transitions, failure links and output classes per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[FrozenSet[str]] = [frozenset()]
+
+        outputs: List[set] = [set()]
+        for rule_class, patterns in rules.items():
+            for pattern in patterns:
+                state = 0
+                for char in pattern:
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        outputs.append(set())
+                    state = next_state
+                outputs[state].add(rule_class)
+
+        # Breadth-first pass to compute failure links and merge outputs along them
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                outputs[next_state] |= outputs[self._fail[next_state]]
+
+        self._out = [frozenset(classes) for classes in outputs]
+
+    def match(self, name: str) -> FrozenSet[str]:
+        """Return every rule class with a pattern occurring in name"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        matched = out[0]  # an empty pattern occurs in every name
+        for char in name.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                matched = matched | out[state]
+        return matched
+
+
+@lru_cache(maxsize=32)
+def compile_field_matcher(currency_patterns: Tuple[str, ...], percentage_patterns: Tuple[str, ...],
+                          count_patterns: Tuple[str, ...]) -> FieldPatternMatcher:
+    """Compile (and memoize) the matcher for a set of formatting patterns"""
+    return FieldPatternMatcher({
+        CURRENCY: currency_patterns,
+        PERCENTAGE: percentage_patterns,
+        COUNT: count_patterns,
+        ID: ID_CONDITIONS,
+        PRIMARY_KEY: PRIMARY_KEY_MARKERS,
+    })
@@ -0,0 +1,112 @@
+"""
+Timing and profiling helpers for the build pipeline
+StageTimer records wall-clock time per pipeline stage; the cProfile helpers
+dump, merge and format pstats output for `--profile` runs
+"""
+
+import cProfile
+import io
+import pstats
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+
+class StageTimer:
+    """Accumulates elapsed wall-clock time per named stage, in execution order
+
+    A stage may be entered several times; ``on_stage`` is called the first
+    time each stage finishes.
+    """
+
+    def __init__(self, on_stage: Optional[Callable[[str], None]] = None):
+        self.timings: Dict[str, float] = {}
+        self.on_stage = on_stage
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            first = name not in self.timings
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+            if first and self.on_stage:
+                self.on_stage(name)
+
+    def as_ms(self) -> Dict[str, float]:
+        """Stage timings in milliseconds, rounded for reporting"""
+        return {name: round(seconds * 1000, 3) for name, seconds in self.timings.items()}
+
+    @property
+    def total(self) -> float:
+        return sum(self.timings.values())
+
+
+class ThroughputMeter:
+    """Tracks completed items to report rate and estimated time remaining"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.completed = 0
+        self.start = time.perf_counter()
+
+    def update(self, count: int = 1) -> None:
+        self.completed += count
+
+    @property
+    def rate(self) -> float:
+        """Items per second so far"""
+        elapsed = time.perf_counter() - self.start
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float:
+        """Estimated seconds until all items complete"""
+        rate = self.rate
+        return (self.total - self.completed) / rate if rate > 0 else 0.0
+
+    def describe(self) -> str:
+        eta = int(round(self.eta))
+        return f"{self.rate:.1f} views/s, ETA {eta // 3600}:{eta % 3600 // 60:02d}:{eta % 60:02d}"
+
+
+@contextmanager
+def profiled(dump_path: Optional[str], profiler: Optional[cProfile.Profile] = None) -> Iterator[None]:
+    """Profile the enclosed block with cProfile and dump stats to dump_path (no-op if both are None)
+
+    Passing the same ``profiler`` to several blocks accumulates them; each
+    block with a dump_path dumps everything profiled so far.
+    """
+    if dump_path is None and profiler is None:
+        yield
+        return
+    profiler = profiler or cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if dump_path is not None:
+            Path(dump_path).parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(dump_path))
+
+
+def merge_profiles(paths: Iterable[str], output_path: str) -> Optional[str]:
+    """Combine pstats dumps into one file; returns output_path, or None if there was nothing to merge"""
+    paths = [str(p) for p in paths]
+    if not paths:
+        return None
+    stats = pstats.Stats(*paths)
+    stats.dump_stats(str(output_path))
+    return str(output_path)
+
+
+def format_profile(path: str, limit: int = 15) -> str:
+    """Top entries of a pstats dump by cumulative time"""
+    stream = io.StringIO()
+    stats = pstats.Stats(str(path), stream=stream)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
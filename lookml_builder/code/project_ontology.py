@@ -0,0 +1,138 @@
+"""
+Project-wide ontology bootstrapping
+Extracts the ontology entities (keys and attributes) of every view in a
+LookML project tree, in parallel and with per-file results cached by content
+hash, and merges them into one ontology in a stable file order
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .discovery import discover_view_files
+from .field_scanner import scan_field_signatures
+from .parse_cache import PARSER_VERSION, ParseCache
+
+# Bump ENTITY_VERSION whenever the shape of the cached entities changes
+ENTITY_VERSION = 1
+
+# Files handed to a worker process at a time
+CHUNK_SIZE = 32
+
+# (entity name, {"keys", "attributes", "pii_tags"}) in file order
+Entity = Tuple[str, Dict[str, Any]]
+
+_worker_cache: Optional[ParseCache] = None
+
+
+class EntityCache(ParseCache):
+    """On-disk cache of the ontology entities extracted from each file's content"""
+
+    version = f"{PARSER_VERSION}/entities-{ENTITY_VERSION}"
+
+
+def entity_name(view_name: str) -> str:
+    """Ontology entity name of a view (order_items -> Orderitems)"""
+    return view_name.replace("_", "").title()
+
+
+def extract_entities(lookml_content: str) -> List[Entity]:
+    """Entities for the views defined in LookML content, in file order
+
+    Dimensions with a primary_key are the entity's keys; every other
+    dimension and each dimension_group is an attribute.
+    """
+    tables = scan_field_signatures(lookml_content, ("primary_key",))
+    if tables is None:
+        import lkml
+        tables = [
+            {
+                "name": view.get("name"),
+                "dimensions": [[d.get("name"), d.get("primary_key")] for d in view.get("dimensions", [])],
+                "dimension_groups": [[g.get("name"), None] for g in view.get("dimension_groups", [])],
+            }
+            for view in lkml.load(lookml_content).get("views", [])
+        ]
+
+    entities = []
+    for view in tables:
+        keys = [name for name, primary_key in view["dimensions"] if primary_key]
+        attributes = [name for name, primary_key in view["dimensions"] if not primary_key]
+        attributes.extend(name for name, _ in view["dimension_groups"])
+        entities.append((entity_name(view["name"] or "unknown"),
+                         {"keys": keys, "attributes": attributes, "pii_tags": []}))
+    return entities
+
+
+def ontology_skeleton(entities: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Ontology config section holding entities and no relationships yet"""
+    return {
+        "project": {
+            "name": "extracted_from_lookml",
+            "governance_status": "in_development"
+        },
+        "entities": entities,
+        "relationships": []
+    }
+
+
+def _init_worker(cache: Optional[ParseCache]) -> None:
+    global _worker_cache
+    _worker_cache = cache
+
+
+def file_entities(path: str, cache: Optional[ParseCache] = None) -> Tuple[List[Entity], bool]:
+    """Entities of one file and whether they came from the cache"""
+    cache = cache or _worker_cache
+    with open(path, "r") as file:
+        content = file.read()
+    cached = cache.get(content) if cache else None
+    if cached is not None:
+        return [(name, entity) for name, entity in cached], True
+    entities = extract_entities(content)
+    if cache:
+        cache.put(content, entities)
+    return entities, False
+
+
+def scan_entities(paths: List[Path], jobs: int = 1,
+                  cache: Optional[ParseCache] = None) -> List[Tuple[List[Entity], bool]]:
+    """file_entities for every path, in the order of paths, over up to jobs worker processes"""
+    if jobs <= 1 or len(paths) <= 1:
+        return [file_entities(str(path), cache) for path in paths]
+    workers = min(jobs, len(paths))
+    chunk_size = max(1, min(CHUNK_SIZE, len(paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache,)) as executor:
+        return list(executor.map(file_entities, map(str, paths), chunksize=chunk_size))
+
+
+def merge_entities(per_file: Iterable[List[Entity]]) -> Dict[str, Dict[str, Any]]:
+    """One entity per name; an entity defined in several files (or refined) gets the union of their keys and attributes
+
+    Entities are ordered by first appearance and their fields by file order,
+    so the result depends only on the order of the files.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for entities in per_file:
+        for name, entity in entities:
+            target = merged.get(name)
+            if target is None:
+                merged[name] = {field: list(values) for field, values in entity.items()}
+                continue
+            for field, values in entity.items():
+                existing = target.setdefault(field, [])
+                existing.extend(value for value in values if value not in existing)
+    return merged
+
+
+def init_ontology_from_project(project_dir: str, recursive: bool = True, exclude: Iterable[str] = (),
+                               jobs: Optional[int] = None, cache: Optional[ParseCache] = None) -> Dict[str, Any]:
+    """Initialize an ontology from every base view file under project_dir
+
+    Files are scanned over ``jobs`` worker processes (default: one per CPU)
+    and reuse the entities cached for unchanged content when ``cache`` is given.
+    """
+    paths = discover_view_files(project_dir, recursive=recursive, exclude=exclude)
+    results = scan_entities(paths, jobs or os.cpu_count() or 1, cache)
+    return ontology_skeleton(merge_entities(entities for entities, _ in results))
@@ -0,0 +1,153 @@
+"""
+Streaming LookML renderers for the semantic, style and explore layers
+Each renderer writes its sections straight to a text sink (an open file, a
+StringIO, ...) through precompiled templates instead of building the whole
+document as one string
+"""
+
+from typing import Any, Dict, Iterable, List, TextIO
+
+from . import patterns
+from .patterns import FieldPatternMatcher
+
+SECTION_RULE = "  #########################\n"
+
+# Semantic layer templates
+_SEMANTIC_HEADER = 'include: "%s.source.view"\n\nview: +%s {\n\n  # IDs\n\n'
+_SEMANTIC_PRIMARY_KEY = "  dimension: %s {\n    primary_key: yes\n  }\n\n"
+_SEMANTIC_ID = "  dimension: %s {\n  }\n\n"
+_SEMANTIC_METRICS = "  # METRICS\n\n"
+_SEMANTIC_MEASURE = "  measure: %s {\n    type: %s\n    sql: %s;;\n  }\n\n"
+
+# Style layer templates
+_STYLE_HEADER = 'include: "%s.semantic.view"\n\nview: +%s {\n'
+_STYLE_SECTION = SECTION_RULE + "  ## %s\n" + SECTION_RULE + "\n"
+_STYLE_ID = '  dimension: %s {\n    group_label: "IDs"\n    # hidden: yes\n  }\n\n'
+_STYLE_TIME_OPEN = '  dimension_group: %s {\n    label: "%s"\n    group_label: " %s"\n    can_filter: no\n'
+_STYLE_HIDDEN = "    hidden: yes\n"
+_STYLE_CLOSE = "  }\n\n"
+_STYLE_TIME_FILTER = ('  dimension_group: %s_filter {\n    view_label: "FILTERS"\n    # view_label: ""\n'
+                      '    label: "%s"\n    group_label: " %s"\n    type: time\n    sql: ${%s_raw};;\n  }\n\n')
+_STYLE_MEASURE = "  measure: %s {\n  value_format: %s\n  }\n\n"
+_STYLE_COUNT = "  measure: count {\n    hidden: yes\n  }\n\n"
+_STYLE_MEASURE_DIM = '  dimension: %s {\n    group_label: "Measure Dims"\n    hidden: yes\n  }\n\n'
+_STYLE_SUGGESTIONS = "  suggestions: yes\n\n"
+_STYLE_NO_FILTER = "  dimension: %s {\n    can_filter: no\n  }\n\n"
+_STYLE_FILTER = ('  dimension: %s_filter {\n    view_label: "FILTERS"\n    # view_label: ""\n'
+                 '    label: "%s"\n    type: string\n    case_sensitive: no\n    sql: ${%s};;\n  }\n\n')
+
+# Explore templates
+_EXPLORE_HEADER = "explore: %s {\n"
+_EXPLORE_JOIN = "  join: %s {\n    type: %s\n    relationship: %s\n    sql_on: %s ;;\n  }\n\n"
+
+# Value formats applied to measures by name pattern
+CURRENCY_FORMAT = '"$#,##0.00"'
+PERCENTAGE_FORMAT = '"0.00%"'
+NUMBER_FORMAT = '"#,##0"'
+
+# Time fields hidden in the style layer
+HIDDEN_TIME_CONDITIONS = ("insert_timestamp", "update_timestamp")
+
+
+def render_semantic(sink: TextIO, view_name: str, primary_key_list: Iterable[str],
+                    ids_list: Iterable[str], measures_list: Iterable[Dict[str, Any]]) -> None:
+    """Write the semantic layer (primary keys, IDs and measures) to sink"""
+    write = sink.write
+    write(_SEMANTIC_HEADER % (view_name, view_name))
+
+    # Add PRIMARY KEYS
+    for key in primary_key_list:
+        write(_SEMANTIC_PRIMARY_KEY % (key,))
+
+    for field in ids_list:
+        write(_SEMANTIC_ID % (field,))
+
+    # Add METRICS
+    write(_SEMANTIC_METRICS)
+    for field in measures_list:
+        write(_SEMANTIC_MEASURE % (field["name"], field["type"], field["sql"]))
+
+    write("}")
+
+
+def time_label(field: str) -> str:
+    """Label for a time dimension_group, without _date/_timestamp/_ts suffixes"""
+    formatted_field = (field.replace("_date", "")
+                            .replace("_timestamp", "")
+                            .replace("_ts", ""))
+    return formatted_field.replace("_", " ").title()
+
+
+def value_format(measure_name: str, matcher: FieldPatternMatcher) -> str:
+    """Value format for a measure based on the configured formatting patterns"""
+    rule_classes = matcher.match(measure_name)
+    if patterns.CURRENCY in rule_classes:
+        return CURRENCY_FORMAT
+    elif patterns.PERCENTAGE in rule_classes:
+        return PERCENTAGE_FORMAT
+    return NUMBER_FORMAT
+
+
+def render_style(sink: TextIO, view_name: str, primary_key_list: List[str], ids_list: List[str],
+                 times_list: List[str], measures_list: Iterable[Dict[str, Any]], numbers_list: Iterable[str],
+                 filters_list: Iterable[str], matcher: FieldPatternMatcher) -> None:
+    """Write the style layer (grouping, labels, value formats and filters) to sink"""
+    write = sink.write
+    write(_STYLE_HEADER % (view_name, view_name))
+
+    # Section for IDs
+    write(_STYLE_SECTION % "IDS")
+    write("  # PRIMARY KEY\n\n")
+    for field in primary_key_list:
+        write(_STYLE_ID % (field,))
+    for field in ids_list:
+        write(_STYLE_ID % (field,))
+
+    # Section for Dates and Timestamps
+    write(_STYLE_SECTION % "DATES & TIMESTAMPS")
+    for field in times_list:
+        label = time_label(field)
+        write(_STYLE_TIME_OPEN % (field, label, label))
+        lower = field.lower()
+        if any(condition in lower for condition in HIDDEN_TIME_CONDITIONS):
+            write(_STYLE_HIDDEN)
+        write(_STYLE_CLOSE)
+        # Filter dimension_group for the time dimension_group
+        write(_STYLE_TIME_FILTER % (field, label, label, field))
+
+    # Section for Metrics
+    write(_STYLE_SECTION % "METRICS")
+    for measure in measures_list:
+        write(_STYLE_MEASURE % (measure["name"], value_format(measure["name"], matcher)))
+    write(_STYLE_COUNT)
+
+    # Only create measure dims for numbers that are not IDs or primary keys
+    write(_STYLE_SECTION % "MEASURE DIMS")
+    not_measure_dims = set(ids_list) | set(primary_key_list)
+    for field in numbers_list:
+        if field not in not_measure_dims:
+            write(_STYLE_MEASURE_DIM % (field,))
+
+    # Section for Filters (regular dimensions)
+    write(_STYLE_SECTION % "DIMENSIONS")
+    write(_STYLE_SUGGESTIONS)
+    times = set(times_list)
+    for field in filters_list:
+        # Skip time dimension_groups - they're handled in the DATES & TIMESTAMPS section
+        if field in times:
+            continue
+        # Disable filtering on the original dimension and add a separate filter dimension
+        write(_STYLE_NO_FILTER % (field,))
+        write(_STYLE_FILTER % (field, field.replace("_", " ").title(), field))
+
+    write("}")
+
+
+def render_explore(sink: TextIO, view_name: str, relationships: Iterable[Dict[str, Any]]) -> None:
+    """Write an explore joining view_name to its ontology relationships"""
+    write = sink.write
+    write(_EXPLORE_HEADER % (view_name,))
+    for rel in relationships:
+        write(_EXPLORE_JOIN % (rel["to"].lower(), rel.get("type", "left_outer"),
+                              rel.get("relationship", "many_to_one"), rel["via"]))
+    write("}")
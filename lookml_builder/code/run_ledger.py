@@ -0,0 +1,196 @@
+"""
+Append-only run ledger for build metadata
+Each run (a `generate` or a whole `batch`) writes one JSONL file under
+<output-dir>/runs/: a header record describing the run followed by one record
+per view. Summaries are rendered from the ledger on demand.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+LEDGER_DIR_NAME = "runs"
+LEDGER_SUFFIX = ".jsonl"
+
+
+def new_run_id() -> str:
+    """Sortable, collision-resistant run identifier"""
+    return f"{datetime.now().strftime('%Y-%m-%dT%H-%M-%S')}-{uuid.uuid4().hex[:8]}"
+
+
+class RunLedger:
+    """JSONL ledger holding one header record and one record per built view"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.run_id = self.path.name[:-len(LEDGER_SUFFIX)] if self.path.name.endswith(LEDGER_SUFFIX) else self.path.stem
+        self._offsets: Optional[Dict[str, List[int]]] = None
+
+    @classmethod
+    def create(cls, runs_dir: str, header: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None) -> 'RunLedger':
+        """Start a new ledger in runs_dir and write its header record"""
+        run_id = run_id or new_run_id()
+        Path(runs_dir).mkdir(parents=True, exist_ok=True)
+        ledger = cls(Path(runs_dir) / f"{run_id}{LEDGER_SUFFIX}")
+        ledger._append({"type": "run", "run_id": run_id, "started": datetime.now().isoformat(), **(header or {})})
+        return ledger
+
+    @classmethod
+    def latest(cls, runs_dir: str) -> Optional['RunLedger']:
+        """Most recent ledger in runs_dir, or None"""
+        runs_path = Path(runs_dir)
+        if not runs_path.exists():
+            return None
+        ledgers = sorted(runs_path.glob(f"*{LEDGER_SUFFIX}"))
+        return cls(ledgers[-1]) if ledgers else None
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append one record as a single write, so concurrent writers never interleave lines"""
+        self._write((json.dumps(record, default=str) + "\n").encode("utf-8"))
+
+    def _write(self, line: bytes) -> None:
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+        self._offsets = None
+
+    def append_view(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Record a built view; returns the stored record"""
+        record = {"type": "view", "run_id": self.run_id, **metadata}
+        self._append(record)
+        return record
+
+    def append_views(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Record many views (e.g. copied from other ledgers) in one write"""
+        self._write("".join(json.dumps({**record, "type": "view", "run_id": self.run_id}, default=str) + "\n"
+                            for record in records).encode("utf-8"))
+
+    def header(self) -> Dict[str, Any]:
+        """The run header record"""
+        for record in self.records(record_type="run"):
+            return record
+        return {}
+
+    def records(self, record_type: Optional[str] = "view") -> Iterator[Dict[str, Any]]:
+        """Iterate ledger records of the given type (all records if None)"""
+        with open(self.path, "r") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record_type is None or record.get("type") == record_type:
+                        yield record
+
+    def _index(self) -> Dict[str, List[int]]:
+        """Byte offsets of each view's records, built with one scan of the ledger"""
+        if self._offsets is None:
+            offsets: Dict[str, List[int]] = {}
+            with open(self.path, "rb") as f:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        if record.get("type") == "view":
+                            offsets.setdefault(record.get("view_name"), []).append(offset)
+                    offset += len(line)
+            self._offsets = offsets
+        return self._offsets
+
+    def view_names(self) -> List[str]:
+        """Names of every view recorded in this run"""
+        return list(self._index())
+
+    def lookup(self, view_name: str) -> Optional[Dict[str, Any]]:
+        """Latest record for view_name in this run, or None"""
+        offsets = self._index().get(view_name)
+        if not offsets:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(offsets[-1])
+            return json.loads(f.readline())
+
+
+def _render_timings(timings: Dict[str, float]) -> str:
+    """Markdown list of stage timings in milliseconds"""
+    return "".join(f"- {stage}: {ms:.1f} ms\n" for stage, ms in timings.items())
+
+
+def render_view_summary(record: Dict[str, Any]) -> str:
+    """Markdown summary of a single view record"""
+    counts = record.get("counts", {})
+    view_name = record.get("view_name")
+    timings = record.get("timings_ms")
+    summary = f"""# Run Summary - {record.get("timestamp")}
+
+## View: {view_name}
+
+### Field Counts
+- String dimensions: {counts.get("strings", 0)}
+- Boolean dimensions: {counts.get("booleans", 0)}
+- Number dimensions: {counts.get("numbers", 0)}
+- Time dimensions: {counts.get("times", 0)}
+
+### Semantic Classifications
+- Dimensions: {counts.get("dimensions", 0)}
+- Filters: {counts.get("filters", 0)}
+- IDs: {counts.get("ids", 0)}
+- Primary Keys: {counts.get("primary_key", 0)}
+- Booleans: {counts.get("booleans", 0)}
+- Flags: {counts.get("flags", 0)}
+- Measures: {counts.get("measures", 0)}
+- Numbers: {counts.get("numbers", 0)}
+
+### Generated Files
+- {view_name}.source.view.lkml
+- {view_name}.semantic.view.lkml
+- {view_name}.style.view.lkml
+- {view_name}.explore.lkml
+"""
+    if timings:
+        summary += "\n### Stage Timings\n" + _render_timings(timings)
+    writes = record.get("writes")
+    if writes:
+        summary += f"\n### Files\n- Written: {writes.get('written', 0)}\n- Unchanged: {writes.get('unchanged', 0)}\n"
+    return summary
+
+
+def render_run_summary(ledger: RunLedger) -> str:
+    """Markdown summary of a whole run"""
+    header = ledger.header()
+    views = list(ledger.records())
+    lines = [
+        f"# Run {ledger.run_id}",
+        "",
+        f"- Started: {header.get('started')}",
+        f"- Generator version: {header.get('generator_version')}",
+        f"- Views: {len(views)}",
+        "",
+        "## Views",
+    ]
+    stage_totals: Dict[str, float] = {}
+    write_totals: Dict[str, int] = {}
+    for record in views:
+        counts = record.get("counts", {})
+        lines.append(f"- {record.get('view_name')}: {counts.get('measures', 0)} measures, "
+                     f"{counts.get('dimensions', 0)} dimensions, {counts.get('filters', 0)} filters")
+        for stage, ms in record.get("timings_ms", {}).items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + ms
+        for status, count in record.get("writes", {}).items():
+            write_totals[status] = write_totals.get(status, 0) + count
+    if write_totals:
+        lines[5:5] = [f"- Files: {write_totals.get('written', 0)} written, {write_totals.get('unchanged', 0)} unchanged"]
+    summary = "\n".join(lines) + "\n"
+    if stage_totals:
+        summary += "\n## Stage Timings (all views)\n" + _render_timings(stage_totals)
+    return summary
@@ -0,0 +1,326 @@
+"""
+Local generation server
+Keeps the configuration, parser and an in-memory parse cache warm in one
+process and answers generate / classify / dry-run requests as JSON over HTTP
+on localhost or a Unix socket, so editors and CI avoid a cold start per file
+"""
+
+import http.client
+import ipaddress
+import json
+import os
+import re
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .bundle import generate_views, view_blocks
+from .config import ConfigSnapshot, LookerConfig
+from .looker_explore_builder import LookerExploreBuilder
+from .output import DirectorySink
+from .parse_cache import MemoryParseCache, ParseCache
+
+ACTIONS = ("generate", "classify", "dry-run")
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Request bodies larger than this are rejected
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+# Latency samples kept per action for percentiles
+LATENCY_WINDOW = 4096
+# View names a request may give: they become folder names below the output directory
+_VIEW_NAME = re.compile(r"\w+")
+
+
+class LatencyStats:
+    """Thread-safe request counts, throughput and latency percentiles per action"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.started = time.perf_counter()
+        self._window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, action: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            self._samples.setdefault(action, deque(maxlen=self._window)).append(seconds)
+            self._counts[action] = self._counts.get(action, 0) + 1
+            if not ok:
+                self._errors[action] = self._errors.get(action, 0) + 1
+
+    @staticmethod
+    def _percentile(ordered: List[float], fraction: float) -> float:
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Totals and per-action latency (ms) over the most recent requests"""
+        with self._lock:
+            samples = {action: sorted(values) for action, values in self._samples.items()}
+            counts = dict(self._counts)
+            errors = dict(self._errors)
+        uptime = time.perf_counter() - self.started
+        total = sum(counts.values())
+        actions = {}
+        for action, ordered in samples.items():
+            actions[action] = {
+                "requests": counts[action],
+                "errors": errors.get(action, 0),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+                "p50_ms": round(self._percentile(ordered, 0.50) * 1000, 3),
+                "p95_ms": round(self._percentile(ordered, 0.95) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+            }
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": total,
+            "requests_per_s": round(total / uptime, 2) if uptime else 0.0,
+            "actions": actions,
+        }
+
+
+def is_loopback(host: str) -> bool:
+    """True if host only accepts connections from this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _inside(path: str, root: Path, label: str) -> Path:
+    """path resolved (symlinks included), if it lies within root; ValueError otherwise"""
+    resolved = Path(path).resolve()
+    if resolved != root and root not in resolved.parents:
+        raise ValueError(f"'{label}' must be inside {root}")
+    return resolved
+
+
+class GenerationService:
+    """Warm generation state shared by every request of a server
+
+    The config is loaded once and reloaded only when its file changes; parsed
+    views are kept in a MemoryParseCache (backed by the on-disk cache if given).
+    Requests may only read views below ``project_dir`` and write below
+    ``output_dir``.
+    """
+
+    def __init__(self, config_path: Optional[str] = "config.yaml", output_dir: str = "model_project",
+                 parse_cache: Optional[ParseCache] = None, project_dir: str = "."):
+        self.config_path = Path(config_path) if config_path else None
+        self.output_dir = output_dir
+        self.project_root = Path(project_dir).resolve()
+        self.output_root = Path(output_dir).resolve()
+        self.parse_cache = MemoryParseCache(backing=parse_cache)
+        self.stats = LatencyStats()
+        self._config: Optional[ConfigSnapshot] = None
+        self._config_key = None
+        self._lock = threading.Lock()
+        self.config()
+        # Import the parser now rather than on the first request
+        import lkml  # noqa: F401
+
+    def _stat_config(self):
+        try:
+            st = os.stat(self.config_path)
+        except (TypeError, FileNotFoundError):
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def config(self) -> ConfigSnapshot:
+        """The current configuration, reloaded if config.yaml changed since the last request"""
+        key = self._stat_config()
+        with self._lock:
+            if self._config is None or key != self._config_key:
+                config = (LookerConfig.from_yaml_file(str(self.config_path)) if key
+                          else LookerConfig.get_default_config())
+                # Request threads share the frozen snapshot, so concurrent builds can't affect each other
+                self._config = config.snapshot()
+                self._config_key = key
+            return self._config
+
+    def handle(self, action: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request; raises ValueError for bad requests"""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action '{action}' (expected one of: {', '.join(ACTIONS)})")
+
+        if not isinstance(request, dict):
+            raise ValueError("Request body must be a JSON object")
+
+        content = request.get("content")
+        view_name = request.get("view_name")
+        if view_name is not None and not (isinstance(view_name, str) and _VIEW_NAME.fullmatch(view_name)):
+            raise ValueError("'view_name' must be a plain identifier (letters, digits and underscores)")
+        if content is None:
+            if not request.get("path"):
+                raise ValueError("Request needs 'content' or 'path'")
+            path = _inside(request["path"], self.project_root, "path")
+            with open(path, "r") as file:
+                content = file.read()
+            # A single view is named after its file, as `lookml generate` does
+            if view_name is None and len(view_blocks(content)) == 1:
+                view_name = LookerExploreBuilder.extract_view_name_from_path(str(path))
+        views = generate_views(content, self.config(), self.parse_cache, view_name)
+
+        if action == "classify":
+            return {"views": [{"view_name": view.view_name, "classification": view.classification}
+                              for view in views]}
+        output_dir = request.get("output_dir") or self.output_dir
+        if request.get("output_dir"):
+            _inside(output_dir, self.output_root, "output_dir")
+        if action == "dry-run":
+            return {"views": [{"view_name": view.view_name,
+                               "files": [str(Path(output_dir) / path) for path in view.documents()],
+                               "classification": view.classification} for view in views]}
+
+        # generate: return the documents, and write them only when asked to
+        results = []
+        for view in views:
+            result = view.to_dict()
+            if request.get("write"):
+                for relative_path in view.documents():
+                    _inside(str(Path(output_dir) / relative_path), self.output_root, "view_name")
+                result["files"] = view.write(DirectorySink(output_dir))
+            results.append(result)
+        return {"views": results}
+
+    def timed(self, action: str, request: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """(HTTP status, response body) for a request, recording its latency"""
+        start = time.perf_counter()
+        try:
+            status, body = 200, {"ok": True, **self.handle(action, request)}
+        except (ValueError, OSError) as e:
+            status, body = 400, {"ok": False, "error": str(e)}
+        except Exception as e:
+            status, body = 500, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        elapsed = time.perf_counter() - start
+        self.stats.record(action, elapsed, ok=status == 200)
+        body["elapsed_ms"] = round(elapsed * 1000, 3)
+        return status, body
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ok": True,
+            "config": str(self.config_path) if self._config_key else None,
+            "output_dir": self.output_dir,
+            "project_dir": str(self.project_root),
+            "parse_cache": {"entries": self.parse_cache.size, "hits": self.parse_cache.hits,
+                            "misses": self.parse_cache.misses},
+            **self.stats.snapshot(),
+        }
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """POST /generate, /classify, /dry-run with a JSON body; GET /stats"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") in ("/stats", "/health"):
+            self._reply(200, self.server.service.status())
+        else:
+            self._reply(404, {"ok": False, "error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_BYTES:
+            self.close_connection = True
+            self._reply(413, {"ok": False, "error": "Request body too large"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._reply(400, {"ok": False, "error": f"Invalid JSON: {e}"})
+            return
+        status, body = self.server.service.timed(self.path.strip("/"), request)
+        self._reply(status, body)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if self.client_address else "local"
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(service: GenerationService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  socket_path: Optional[str] = None, verbose: bool = False,
+                  allow_remote: bool = False) -> socketserver.BaseServer:
+    """A threaded server for service on host:port, or on a Unix socket if socket_path is given
+
+    The server has no authentication, so a host other than a loopback
+    address raises ValueError unless ``allow_remote`` is set.
+    """
+    if not socket_path and not allow_remote and not is_loopback(host):
+        raise ValueError(f"Refusing to listen on non-loopback host {host} without authentication")
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixHTTPServer(socket_path, RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def server_address(server: socketserver.BaseServer) -> str:
+    """Address clients should use: host:port, or the Unix socket path"""
+    if isinstance(server.server_address, str):
+        return server.server_address
+    host, port = server.server_address[:2]
+    return f"{host}:{port}"
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ServerClient:
+    """Minimal client for a running server (host:port or a Unix socket path); keeps its connection open"""
+
+    def __init__(self, address: str, timeout: float = 60.0):
+        if ":" in address and os.path.sep not in address:
+            host, port = address.rsplit(":", 1)
+            self._connection = http.client.HTTPConnection(host, int(port), timeout=timeout)
+        else:
+            self._connection = _UnixHTTPConnection(address, timeout)
+
+    def request(self, action: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """POST payload to /action (GET for "stats") and return the decoded response"""
+        if action == "stats":
+            self._connection.request("GET", "/stats")
+        else:
+            body = json.dumps(payload or {}).encode("utf-8")
+            self._connection.request("POST", f"/{action}", body, {"Content-Type": "application/json"})
+        return json.loads(self._connection.getresponse().read())
+
+    def close(self) -> None:
+        self._connection.close()
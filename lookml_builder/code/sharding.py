@@ -0,0 +1,190 @@
+"""
+Deterministic batch sharding
+Splits the view files of a batch into N shards by a stable hash of their
+paths (or by size, balanced greedily) so CI nodes can each build one shard
+without coordinating, and merges the shards' run-ledger fragments afterwards,
+checking that no explore was produced by two shards
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .output import explore_path
+from .run_ledger import LEDGER_DIR_NAME, LEDGER_SUFFIX, RunLedger, new_run_id
+
+# Fragments live below the runs directory, so they are never taken for a whole run
+SHARD_DIR_NAME = "shards"
+
+# Fragment ledger names end in ".shard-<index>-of-<count>.jsonl"
+_FRAGMENT_NAME = re.compile(rf"\.shard-(\d+)-of-(\d+){re.escape(LEDGER_SUFFIX)}$")
+
+# Header fields every fragment of one batch must agree on
+_CONSISTENT_FIELDS = ("generator_version", "config_fingerprint")
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """(index, count) from an "i/N" spec, where 1 <= i <= N"""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}' (expected i/N, e.g. 2/8)") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}': index must be between 1 and {max(count, 1)}")
+    return index, count
+
+
+def shard_key(path: Path) -> str:
+    """Machine-independent key of a view file: its POSIX path relative to the working directory"""
+    return Path(os.path.relpath(path)).as_posix()
+
+
+def stable_hash(key: str) -> int:
+    """64-bit hash of key that is the same on every machine and Python process"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def assign_shards(paths: List[Path], count: int, weighted: bool = False) -> List[int]:
+    """1-based shard of each path
+
+    Unweighted, a file's shard depends only on its path. Weighted, files are
+    placed largest first onto the shard with the fewest bytes so far (ties
+    broken by hash, then shard number), which balances work when view sizes
+    vary widely; that depends on the whole file set, so every node must see
+    the same files.
+    """
+    keys = [stable_hash(shard_key(path)) for path in paths]
+    if not weighted:
+        return [key % count + 1 for key in keys]
+
+    sizes = [os.path.getsize(path) for path in paths]
+    loads = [0] * count
+    shards = [0] * len(paths)
+    for position in sorted(range(len(paths)), key=lambda i: (-sizes[i], keys[i])):
+        target = min(range(count), key=lambda shard: (loads[shard], shard))
+        loads[target] += sizes[position]
+        shards[position] = target + 1
+    return shards
+
+
+def select_shard(paths: List[Path], index: int, count: int, weighted: bool = False) -> List[Path]:
+    """The paths assigned to shard index of count, in their original order"""
+    return [path for path, shard in zip(paths, assign_shards(paths, count, weighted)) if shard == index]
+
+
+def shard_header(index: int, count: int, weighted: bool, files: int) -> Dict[str, Any]:
+    """Ledger header fields identifying a fragment"""
+    return {"shard": {"index": index, "count": count, "weighted": weighted, "files": files}}
+
+
+def fragment_dir(output_dir: str) -> Path:
+    return Path(output_dir) / LEDGER_DIR_NAME / SHARD_DIR_NAME
+
+
+def clear_stale_fragments(output_dir: str, index: int, count: int) -> List[Path]:
+    """Remove fragments a new run of shard index/count would be merged with by mistake
+
+    Those are earlier fragments of the same shard (a rerun) and fragments of
+    any shard from a run split N ways for a different N. Fragments of the
+    other shards of the same N are kept, since they may belong to this run.
+    Returns the fragments removed.
+    """
+    removed = []
+    runs_dir = fragment_dir(output_dir)
+    if not runs_dir.is_dir():
+        return removed
+    for path in sorted(runs_dir.glob(f"*{LEDGER_SUFFIX}")):
+        match = _FRAGMENT_NAME.search(path.name)
+        if match and (int(match.group(1)) == index or int(match.group(2)) != count):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            removed.append(path)
+    return removed
+
+
+def create_fragment(output_dir: str, header: Dict[str, Any], index: int, count: int) -> RunLedger:
+    """Run ledger for one shard, under <output-dir>/runs/shards/"""
+    return RunLedger.create(fragment_dir(output_dir), header, run_id=f"{new_run_id()}.shard-{index}-of-{count}")
+
+
+def find_fragments(paths: Iterable[str]) -> List[Path]:
+    """Ledger fragments named by paths; directories contribute every ledger below them"""
+    found: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(sorted(path.rglob(f"*{LEDGER_SUFFIX}")))
+        else:
+            found.append(path)
+    return found
+
+
+@dataclass
+class ShardMerge:
+    """Outcome of merging ledger fragments; ``ok`` only if the shards are complete and disjoint"""
+    count: int = 0
+    fragments: List[str] = field(default_factory=list)
+    views: int = 0
+    # explore file -> shards that produced it, for explores built by more than one shard
+    conflicts: Dict[str, List[int]] = field(default_factory=dict)
+    missing: List[int] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    ledger: Optional[RunLedger] = None
+
+    @property
+    def ok(self) -> bool:
+        return not (self.conflicts or self.missing or self.errors)
+
+
+def merge_fragments(fragment_paths: List[Path], output_dir: str, write: bool = True) -> ShardMerge:
+    """Combine shard fragments into one run ledger in <output-dir>/runs/
+
+    The merged ledger is only written if every shard 1..N is present exactly
+    once, all fragments come from the same generator and configuration, and
+    no explore file was produced by two shards.
+    """
+    merge = ShardMerge(fragments=[str(path) for path in fragment_paths])
+    headers: Dict[int, Dict[str, Any]] = {}
+    records: Dict[int, List[Dict[str, Any]]] = {}
+    producers: Dict[str, set] = {}
+    for path in fragment_paths:
+        fragment = RunLedger(path)
+        header = fragment.header()
+        shard = header.get("shard")
+        if not shard:
+            merge.errors.append(f"{path} is not a shard fragment")
+            continue
+        index, count = shard["index"], shard["count"]
+        if merge.count and count != merge.count:
+            merge.errors.append(f"{path} is shard {index}/{count}, expected N={merge.count}")
+            continue
+        merge.count = count
+        if index in headers:
+            merge.errors.append(f"{path} repeats shard {index}/{count}")
+            continue
+        for key in _CONSISTENT_FIELDS:
+            if headers and header.get(key) != next(iter(headers.values())).get(key):
+                merge.errors.append(f"{path} was built with a different {key.replace('_', ' ')}")
+        headers[index] = header
+        for record in fragment.records():
+            producers.setdefault(explore_path(record.get("view_name")), set()).add(index)
+            records.setdefault(index, []).append({**record, "shard": index})
+
+    merge.views = sum(map(len, records.values()))
+    merge.missing = [index for index in range(1, merge.count + 1) if index not in headers]
+    merge.conflicts = {explore: sorted(shards) for explore, shards in sorted(producers.items()) if len(shards) > 1}
+    if not headers:
+        merge.errors.append("No shard fragments to merge")
+    if not merge.ok or not write:
+        return merge
+
+    first = headers[min(headers)]
+    header = {key: value for key, value in first.items() if key not in ("type", "run_id", "started", "shard")}
+    header["shards"] = {"count": merge.count, "fragments": [headers[i]["run_id"] for i in sorted(headers)]}
+    merge.ledger = RunLedger.create(Path(output_dir) / LEDGER_DIR_NAME, header)
+    merge.ledger.append_views(record for index in sorted(records) for record in records[index])
+    return merge
@@ -0,0 +1,197 @@
+"""
+Watch mode for incremental regeneration
+A debounced polling watcher over the views directory and config file, and a
+long-lived session that keeps the configuration (and parser) warm and rebuilds
+only the views affected by each change
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .config import ConfigSnapshot, LookerConfig
+from .bundle import build_view_file
+from .looker_explore_builder import LookerExploreBuilder, run_header
+from .manifest import hash_file
+from .parse_cache import ParseCache
+from .run_ledger import RunLedger, LEDGER_DIR_NAME
+
+VIEW_SUFFIX = ".view.lkml"
+DEFAULT_INTERVAL = 0.2
+DEFAULT_DEBOUNCE = 0.3
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class PollingWatcher:
+    """Polls the top level of the views directory and the config file for changes"""
+
+    def __init__(self, views_dir: str, config_path: Optional[str] = None,
+                 interval: float = DEFAULT_INTERVAL, debounce: float = DEFAULT_DEBOUNCE):
+        self.views_dir = Path(views_dir)
+        self.config_path = Path(config_path) if config_path else None
+        self.interval = interval
+        self.debounce = debounce
+        self._state = self.snapshot()
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """(mtime, size) of every watched file"""
+        state = {}
+        if self.views_dir.is_dir():
+            with os.scandir(self.views_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(VIEW_SUFFIX) and entry.is_file():
+                        st = entry.stat()
+                        state[entry.path] = (st.st_mtime_ns, st.st_size)
+        if self.config_path is not None:
+            key = _stat_key(str(self.config_path))
+            if key is not None:
+                state[str(self.config_path)] = key
+        return state
+
+    def poll(self) -> Set[str]:
+        """Paths added, modified or removed since the previous poll"""
+        current = self.snapshot()
+        previous, self._state = self._state, current
+        return {path for path in previous.keys() | current.keys() if previous.get(path) != current.get(path)}
+
+    def changes(self, should_stop: Callable[[], bool] = lambda: False) -> Iterator[Set[str]]:
+        """Yield batches of changed paths once they have been quiet for the debounce period"""
+        pending: Set[str] = set()
+        last_change = 0.0
+        while not should_stop():
+            changed = self.poll()
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last_change = now
+            elif pending and now - last_change >= self.debounce:
+                yield pending
+                pending = set()
+            time.sleep(self.interval)
+
+
+class WatchSession:
+    """Regenerates views in one warm process as their inputs change
+
+    Builds run against a snapshot of the config, so its ontology index and
+    matchers are computed once per load. Each config that takes effect gets
+    its own run ledger, whose header records that config.
+    """
+
+    def __init__(self, views_dir: str, output_dir: str, config_path: Optional[str] = None,
+                 parse_cache: Optional[ParseCache] = None):
+        self.views_dir = Path(views_dir)
+        self.output_dir = output_dir
+        self.config_path = Path(config_path) if config_path else None
+        self.parse_cache = parse_cache
+        self.config = self.load_config()
+        self.ledger = RunLedger.create(Path(output_dir) / LEDGER_DIR_NAME, run_header(self.config))
+        self._hashes: Dict[str, str] = {}
+        self._view_names: Dict[str, List[str]] = {}
+
+    def load_config(self) -> ConfigSnapshot:
+        """Snapshot of the config at config_path if it exists, otherwise of the defaults"""
+        if self.config_path is not None and self.config_path.exists():
+            return LookerConfig.from_yaml_file(str(self.config_path)).snapshot()
+        return LookerConfig.get_default_config().snapshot()
+
+    def view_files(self) -> List[Path]:
+        """Base view files currently in the views directory"""
+        return sorted(self.views_dir.glob(f"*{VIEW_SUFFIX}"))
+
+    def build_view(self, view_file: str) -> List[Dict[str, Any]]:
+        """Regenerate every layer of each view in view_file, keeping the original file"""
+        view_name = LookerExploreBuilder.extract_view_name_from_path(view_file)
+        start = time.perf_counter()
+        try:
+            results = build_view_file(view_file, self.config, self.output_dir, parse_cache=self.parse_cache,
+                                      ledger=self.ledger, keep_original=True)
+        except Exception as e:
+            self._hashes.pop(view_file, None)
+            return [{"view_name": view_name, "action": "build", "success": False, "error": str(e)}]
+        seconds = (time.perf_counter() - start) / len(results)
+        self._view_names[view_file] = [result["view_name"] for result in results]
+        return [{"view_name": result["view_name"], "action": "build", "success": True, "result": result,
+                 "seconds": seconds} for result in results]
+
+    def build_explore(self, view_file: str) -> List[Dict[str, Any]]:
+        """Regenerate only the explores of view_file's views (their fields are unaffected by the change)"""
+        records = []
+        view_names = self._view_names.get(view_file) or [LookerExploreBuilder.extract_view_name_from_path(view_file)]
+        for view_name in view_names:
+            start = time.perf_counter()
+            try:
+                builder = LookerExploreBuilder(view_name, self.config, self.output_dir)
+                explore_file = builder.generate_explore_file()
+            except Exception as e:
+                records.append({"view_name": view_name, "action": "explore", "success": False, "error": str(e)})
+                continue
+            records.append({"view_name": view_name, "action": "explore", "success": True,
+                            "result": {"explore_file": explore_file}, "seconds": time.perf_counter() - start})
+        return records
+
+    def build_all(self) -> List[Dict[str, Any]]:
+        """Regenerate every view in the views directory"""
+        results = []
+        for view_file in self.view_files():
+            self._hashes[str(view_file)] = hash_file(str(view_file))
+            results.extend(self.build_view(str(view_file)))
+        return results
+
+    def handle_changes(self, paths: Set[str]) -> List[Dict[str, Any]]:
+        """Rebuild whatever the changed paths affect
+
+        A config change rebuilds every view, or only the explores when nothing
+        but the ontology changed. A view change rebuilds that view alone, unless
+        its content is byte-identical to the last build (e.g. a bare touch).
+        """
+        results = []
+        if self.config_path is not None and str(self.config_path) in paths:
+            config_results, rebuilt_all = self.handle_config_change()
+            results.extend(config_results)
+            if rebuilt_all:
+                return results
+            paths = paths - {str(self.config_path)}
+
+        for path in sorted(paths):
+            if not os.path.exists(path):
+                self._hashes.pop(path, None)
+                self._view_names.pop(path, None)
+                continue
+            digest = hash_file(path)
+            if self._hashes.get(path) == digest:
+                continue
+            self._hashes[path] = digest
+            results.extend(self.build_view(path))
+        return results
+
+    def handle_config_change(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Reload the config and rebuild what it affects
+
+        Returns the results and whether every view was rebuilt. A new config
+        starts a new run ledger; an invalid one is reported and the previous
+        config stays in effect.
+        """
+        try:
+            new_config = self.load_config()
+        except Exception as e:
+            return [{"view_name": None, "action": "config", "success": False, "error": str(e)}], False
+        if new_config.fingerprint() == self.config.fingerprint():
+            return [], False
+
+        old_sections, new_sections = self.config.to_dict(), new_config.to_dict()
+        ontology_only = ({k: v for k, v in old_sections.items() if k != "ontology"} ==
+                         {k: v for k, v in new_sections.items() if k != "ontology"})
+        self.config = new_config
+        self.ledger = RunLedger.create(Path(self.output_dir) / LEDGER_DIR_NAME, run_header(new_config))
+        if ontology_only:
+            return [record for view_file in self.view_files() for record in self.build_explore(str(view_file))], False
+        return self.build_all(), True
@@ -0,0 +1,52 @@
+"""
+Shared fixtures for the test modules: the sample view and helpers that build
+views and builders from it
+"""
+
+from pathlib import Path
+
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+
+SAMPLE_VIEW = Path(__file__).resolve().parents[2] / "model_project" / "views" / "sample_transactions.view.lkml"
+
+# A second view for multi-view files; braces inside strings, labels and SQL must not end it
+EXTRA_VIEW = '''
+# Customers {exported}
+view: customers {
+  sql_table_name: `project.dataset.customers` ;;
+
+  dimension: customer_id {
+    type: string
+    label: "Customer } ID"
+    sql: CASE WHEN ${TABLE}.id = '{' THEN NULL ELSE ${TABLE}.id END ;;
+  }
+
+  dimension: lifetime_revenue {
+    type: number
+    sql: ${TABLE}.lifetime_revenue ;;
+  }
+}
+'''
+
+
+def make_views(views_dir, names):
+    """Copy the sample view into views_dir once per name, renaming the view"""
+    views_dir = Path(views_dir)
+    views_dir.mkdir(parents=True, exist_ok=True)
+    content = SAMPLE_VIEW.read_text()
+    paths = []
+    for name in names:
+        path = views_dir / f"{name}.view.lkml"
+        path.write_text(content.replace("view: sample_transactions {", f"view: {name} {{"))
+        paths.append(path)
+    return paths
+
+
+def make_builder(output_dir, view_name="orders", config=None):
+    """Builder for view_name with a fixed set of categorized fields, writing below output_dir"""
+    builder = LookerExploreBuilder(view_name, config, str(output_dir))
+    builder.strings = ["order_id", "customer_id", "name", "status", "region"]
+    builder.numbers = ["amount", "quantity", "status_code"]
+    builder.times = ["created"]
+    builder.booleans = ["is_gift"]
+    return builder
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for batch processing - parallel workers and CLI summary
+"""
+
+import os
+import pstats
+import tempfile
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from lookml_builder.code.batch_runner import run_batch
+from lookml_builder.code.cli import lookml
+from lookml_builder.code.config import LookerConfig
+from lookml_builder.code.looker_explore_builder import BUILD_STAGES
+from lookml_builder.code.manifest import BatchManifest
+from lookml_builder.code.run_ledger import RunLedger
+from lookml_builder.test.helpers import make_views
+
+def test_parallel_batch_matches_sequential():
+    """Parallel and sequential batches produce identical files"""
+    names = ["alpha_orders", "beta_orders", "gamma_orders", "delta_orders"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outputs = {}
+        for jobs in (1, 3):
+            output_dir = Path(temp_dir) / f"out_{jobs}"
+            view_files = make_views(output_dir / "views", names)
+            results = list(run_batch(view_files, LookerConfig(), str(output_dir), jobs))
+
+            assert len(results) == len(names)
+            assert all(r['success'] for r in results)
+            assert sorted(r['view_name'] for r in results) == sorted(names)
+
+            outputs[jobs] = {
+                str(p.relative_to(output_dir)): p.read_text()
+                for p in output_dir.rglob("*.lkml")
+            }
+
+        assert outputs[1] == outputs[3]
+
+
+def test_batch_cli_jobs():
+    """`lookml batch --jobs` reports every view in the summary"""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            make_views("model_project/views", ["alpha_orders", "beta_orders"])
+            Path("model_project/views/broken.view.lkml").write_text("view: broken {")
+
+            result = runner.invoke(lookml, ['batch', '--jobs', '2'])
+
+            assert result.exit_code == 0, result.output
+            assert "Successful: 2" in result.output
+            assert "Failed: 1" in result.output
+            assert Path("model_project/explores/alpha_orders.explore.lkml").exists()
+            assert Path("model_project/explores/beta_orders.explore.lkml").exists()
+
+            # Both successful views land in a single run ledger
+            ledger = RunLedger.latest("model_project/runs")
+            assert sorted(ledger.view_names()) == ["alpha_orders", "beta_orders"]
+            assert ledger.lookup("alpha_orders")["counts"]["measures"] == 2
+            assert len(list(Path("model_project/runs").iterdir())) == 1
+
+            result = runner.invoke(lookml, ['summary', 'alpha_orders'])
+            assert result.exit_code == 0, result.output
+            assert "## View: alpha_orders" in result.output
+        finally:
+            os.chdir(cwd)
+
+
+def test_batch_skips_unchanged_views():
+    """A second batch over identical inputs regenerates nothing until config changes"""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            make_views("model_project/views", ["alpha_orders", "beta_orders"])
+            result = runner.invoke(lookml, ['batch', '--jobs', '1'])
+            assert "Successful: 2" in result.output, result.output
+            assert Path("model_project/.lookml_manifest.json").exists()
+
+            explore = Path("model_project/explores/alpha_orders.explore.lkml")
+            explore_mtime = explore.stat().st_mtime_ns
+
+            # Re-export identical views: nothing is rebuilt
+            make_views("model_project/views", ["alpha_orders", "beta_orders"])
+            result = runner.invoke(lookml, ['batch', '--jobs', '1'])
+            assert "Successful: 0" in result.output, result.output
+            assert "Unchanged: 2" in result.output
+            assert explore.stat().st_mtime_ns == explore_mtime
+            assert not Path("model_project/views/alpha_orders.view.lkml").exists()
+
+            # One edited view is rebuilt on its own
+            paths = make_views("model_project/views", ["alpha_orders", "beta_orders"])
+            paths[0].write_text(paths[0].read_text().replace("region", "territory"))
+            result = runner.invoke(lookml, ['batch', '--jobs', '1'])
+            assert "Successful: 1" in result.output, result.output
+            assert "Unchanged: 1" in result.output
+
+            # A configuration change invalidates every view
+            make_views("model_project/views", ["alpha_orders", "beta_orders"])
+            Path("config.yaml").write_text("classification:\n  primary_key: id\n")
+            result = runner.invoke(lookml, ['batch', '--jobs', '1'])
+            assert "Successful: 2" in result.output, result.output
+        finally:
+            os.chdir(cwd)
+
+
+def test_manifest_outputs_are_relative_to_output_dir():
+    """A manifest written from one working directory stays valid from another"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            output_dir = Path("project")
+            explore = output_dir / "explores" / "alpha.explore.lkml"
+            explore.parent.mkdir(parents=True)
+            explore.write_text("explore: alpha {}")
+            manifest = BatchManifest(str(output_dir), LookerConfig())
+            manifest.record(str(output_dir / "views" / "alpha.view.lkml"), "hash", [{"explore_file": str(explore)}])
+            manifest.save()
+            assert manifest.views["views/alpha.view.lkml"]["outputs"] == ["explores/alpha.explore.lkml"]
+
+            project = output_dir.resolve()
+            os.chdir(project / "explores")
+            reloaded = BatchManifest.load(str(project), LookerConfig())
+            view_file = str(project / "views" / "alpha.view.lkml")
+            assert reloaded.is_current(view_file, "hash")
+            assert reloaded.outputs(view_file) == [project / "explores" / "alpha.explore.lkml"]
+            (project / "explores" / "alpha.explore.lkml").unlink()
+            assert not reloaded.is_current(view_file, "hash")
+        finally:
+            os.chdir(cwd)
+
+
+def test_batch_cli_profile_and_timings():
+    """`lookml batch --profile` records stage timings and merges worker profiles"""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            make_views("model_project/views", ["alpha_orders", "beta_orders", "gamma_orders"])
+            result = runner.invoke(lookml, ['batch', '--jobs', '2', '--profile'])
+            assert result.exit_code == 0, result.output
+            assert "views/s, ETA" in result.output
+            assert "Stage timings (all views)" in result.output
+
+            # Every stage but the metadata write itself is in the ledger record
+            ledger = RunLedger.latest("model_project/runs")
+            timings = ledger.lookup("beta_orders")["timings_ms"]
+            assert list(timings) == list(BUILD_STAGES[:-1])
+            assert all(ms >= 0 for ms in timings.values())
+
+            # Per-view worker profiles are merged into one file beside the ledger
+            runs = sorted(p.name for p in Path("model_project/runs").iterdir())
+            assert runs == [f"{ledger.run_id}.jsonl", f"{ledger.run_id}.pstats"]
+        finally:
+            os.chdir(cwd)
+
+
+def test_generate_cli_profiles_the_read():
+    """`lookml generate --profile` times and profiles reading the view, like a batch run"""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            make_views("model_project/views", ["alpha_orders"])
+            result = runner.invoke(lookml, ['generate', 'model_project/views/alpha_orders.view.lkml', '--profile'])
+            assert result.exit_code == 0, result.output
+
+            ledger = RunLedger.latest("model_project/runs")
+            assert list(ledger.lookup("alpha_orders")["timings_ms"]) == list(BUILD_STAGES[:-1])
+            profiled_functions = {name for _, _, name in pstats.Stats(str(ledger.path.with_suffix(".pstats"))).stats}
+            assert "read_text" in profiled_functions
+            assert "build_view_file" in profiled_functions
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_parallel_batch_matches_sequential()
+    test_batch_cli_jobs()
+    test_batch_skips_unchanged_views()
+    test_manifest_outputs_are_relative_to_output_dir()
+    test_batch_cli_profile_and_timings()
+    test_generate_cli_profiles_the_read()
+    print("✓ All batch tests passed!")
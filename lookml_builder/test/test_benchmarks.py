@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic benchmark generator and result comparison
+"""
+
+import tempfile
+from pathlib import Path
+
+from lookml_builder.benchmarks.bench_ontology import explore_seconds_per_view
+from lookml_builder.benchmarks.bench_classification import synthetic_fields
+from lookml_builder.benchmarks.bench_render import as_lists, classification_memory, classified_builder
+from lookml_builder.benchmarks.compare import compare
+from lookml_builder.benchmarks.suite import result_record
+from lookml_builder.benchmarks.synthetic import SyntheticSpec, generate_project, render_view, synthetic_ontology
+from lookml_builder.code.config import LookerConfig
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+
+
+def test_synthetic_project_is_deterministic(tmp_path):
+    """The same spec always produces the same views and config"""
+    spec = SyntheticSpec(views=3, fields=40, mix="time_heavy", joins_per_view=2)
+    outputs = []
+    for _ in range(2):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = generate_project(temp_dir, spec)
+            config = (paths[0].parents[2] / "config.yaml").read_text()
+            outputs.append(([p.read_text() for p in paths], config))
+    assert outputs[0] == outputs[1]
+
+    builder = LookerExploreBuilder("synthetic_view_00000", None, str(tmp_path))
+    builder.categorize_lookml(render_view("synthetic_view_00000", spec, 0))
+    assert len(builder.strings) + len(builder.numbers) + len(builder.times) + len(builder.booleans) == 40
+
+
+def test_explore_cost_does_not_grow_with_ontology(tmp_path):
+    """A view's explore costs about the same with 20k relationships as with 50"""
+    costs = []
+    for views in (10, 4000):
+        spec = SyntheticSpec(views=views, joins_per_view=5)
+        config = LookerConfig(ontology=synthetic_ontology(spec))
+        names = spec.view_names()[:10] * 20
+        explore_seconds_per_view(config, names[:1], str(tmp_path))
+        costs.append(min(explore_seconds_per_view(config, names, str(tmp_path)) for _ in range(3)))
+    assert costs[1] < costs[0] * 3, costs
+
+
+def test_field_index_retains_less_than_plain_lists(tmp_path):
+    """The compact index holds the same classification in less memory than the lists it replaced"""
+    fields = synthetic_fields(5000)
+    builder = classified_builder(fields, str(tmp_path))
+    assert as_lists(builder)["measures"][0] == {"name": "amount_4_total", "type": "sum", "sql": "${amount_4}"}
+    index_bytes, lists_bytes = classification_memory(fields, str(tmp_path))
+    assert index_bytes < lists_bytes * 0.8, (index_bytes, lists_bytes)
+
+
+def test_compare_flags_regressions():
+    """Only benchmarks slower than the threshold are reported"""
+    base = {r["name"]: r for r in [result_record("parse", {"fields": 10}, 1.0, 3),
+                                   result_record("style", {"fields": 10}, 1.0, 3)]}
+    new = {r["name"]: r for r in [result_record("parse", {"fields": 10}, 1.1, 3),
+                                  result_record("style", {"fields": 10}, 2.0, 3)]}
+    rows, regressions = compare(base, new, threshold=1.25)
+    assert [row[0] for row in rows] == ["parse/fields=10", "style/fields=10"]
+    assert regressions == ["style/fields=10"]
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_synthetic_project_is_deterministic(Path(temp_dir))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_explore_cost_does_not_grow_with_ontology(Path(temp_dir))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_field_index_retains_less_than_plain_lists(Path(temp_dir))
+    test_compare_flags_regressions()
+    print("✓ All benchmark tests passed!")
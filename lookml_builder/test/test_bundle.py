@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-view files - one parse, one set of layers per view
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from lookml_builder.code.bundle import build_view_file, split_bundle, split_view_blocks, view_blocks
+from lookml_builder.code.cli import lookml
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+from lookml_builder.code.run_ledger import RunLedger
+from lookml_builder.test.helpers import EXTRA_VIEW, SAMPLE_VIEW
+
+
+def make_bundle(path):
+    """A file holding the sample view followed by a customers view"""
+    Path(path).write_text(SAMPLE_VIEW.read_text() + EXTRA_VIEW)
+    return Path(path)
+
+
+def test_split_matches_single_view_parse():
+    """Each split view categorizes exactly like the same view parsed on its own"""
+    content = SAMPLE_VIEW.read_text() + EXTRA_VIEW
+    blocks = split_view_blocks(content)
+    assert [name for name, _ in blocks] == ["sample_transactions", "customers"]
+    assert blocks[1][1].startswith("view: customers {") and blocks[1][1].endswith("}\n")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, text, field_table in split_bundle(content):
+            from_table = LookerExploreBuilder(name, None, temp_dir)
+            from_table.categorize_tables([field_table])
+            from_text = LookerExploreBuilder(name, None, temp_dir)
+            from_text.categorize_lookml(text)
+            assert (from_table.strings, from_table.numbers, from_table.times, from_table.booleans) == \
+                   (from_text.strings, from_text.numbers, from_text.times, from_text.booleans)
+
+
+def test_bundle_builds_each_view():
+    """A multi-view file yields separate layers per view and one ledger"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bundle = make_bundle(Path(temp_dir) / "warehouse.view.lkml")
+        output_dir = Path(temp_dir) / "out"
+        results = build_view_file(str(bundle), output_base_dir=str(output_dir))
+
+        assert [r["view_name"] for r in results] == ["sample_transactions", "customers"]
+        assert not bundle.exists()
+        customers_source = (output_dir / "views" / "customers" / "customers.source.view.lkml").read_text()
+        assert "view: customers {" in customers_source and "sample_transactions" not in customers_source
+        customers_semantic = (output_dir / "views" / "customers" / "customers.semantic.view.lkml").read_text()
+        assert "dimension: customer_id {\n    primary_key: yes" in customers_semantic
+        assert "payment_id" not in customers_semantic
+        assert (output_dir / "explores" / "sample_transactions.explore.lkml").exists()
+
+        ledger = RunLedger.latest(str(output_dir / "runs"))
+        assert ledger.view_names() == ["sample_transactions", "customers"]
+
+
+def test_single_view_uses_content_in_hand():
+    """Content already read is built as is, and the file is still removed afterwards"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        view_file = Path(temp_dir) / "sample_transactions.view.lkml"
+        view_file.write_text(SAMPLE_VIEW.read_text())
+        content = SAMPLE_VIEW.read_text().replace("region", "territory")
+        results = build_view_file(str(view_file), output_base_dir=str(Path(temp_dir) / "out"), content=content)
+
+        assert "territory" in Path(results[0]["source_file"]).read_text()
+        assert results[0]["deleted_original"] == str(view_file) and not view_file.exists()
+
+
+def test_refinements_are_part_of_their_view():
+    """`view: +name` blocks are built with the view they refine, never as views of their own"""
+    refinement = "view: +customers {\n  dimension: segment {\n    type: string\n    sql: ${TABLE}.segment ;;\n  }\n}\n"
+    content = SAMPLE_VIEW.read_text() + "\n" + refinement + EXTRA_VIEW
+    assert [name for name, _ in view_blocks(content)] == ["sample_transactions", "customers"]
+    assert "view: +customers {" in view_blocks(content)[1][1]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = Path(temp_dir) / "out"
+        view_file = Path(temp_dir) / "warehouse.view.lkml"
+        view_file.write_text(content)
+        results = build_view_file(str(view_file), output_base_dir=str(output_dir))
+        assert [result["view_name"] for result in results] == ["sample_transactions", "customers"]
+        assert sorted(path.name for path in (output_dir / "views").iterdir()) == ["customers", "sample_transactions"]
+        source = (output_dir / "views" / "customers" / "customers.source.view.lkml").read_text()
+        assert "view: +customers {" in source and "view: customers {" in source
+        assert "segment" in (output_dir / "views" / "customers" / "customers.style.view.lkml").read_text()
+
+        # A view and its refinement alone are one view, renamed together
+        single = EXTRA_VIEW.lstrip() + refinement
+        assert [name for name, _ in view_blocks(single)] == ["customers"]
+        view_file = Path(temp_dir) / "customers.view.lkml"
+        view_file.write_text(single)
+        results = build_view_file(str(view_file), output_base_dir=str(output_dir), new_view_name="clients")
+        assert [result["view_name"] for result in results] == ["clients"]
+        source = (output_dir / "views" / "clients" / "clients.source.view.lkml").read_text()
+        assert "view: +clients {" in source and "customers {" not in source
+
+
+def test_unsplittable_content_is_left_to_lkml():
+    """Braces that can't be matched make the file one block; lkml reports the actual error"""
+    single = "view: orders {\n  dimension: id { type: string\n}\n"
+    assert view_blocks(single) == [("orders", single)]
+    bundle = single + "view: customers {\n}\n"
+    with pytest.raises(ValueError):
+        split_view_blocks(bundle)
+    assert view_blocks(bundle) == [("orders", bundle)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        view_file = Path(temp_dir) / "orders.view.lkml"
+        view_file.write_text(bundle)
+        with pytest.raises(Exception) as error:
+            build_view_file(str(view_file), output_base_dir=str(Path(temp_dir) / "out"))
+        assert "Unbalanced braces" not in str(error.value)
+
+
+def test_bundle_cli():
+    """`generate` refuses to rename a bundle; `batch` reports every view it contains"""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            Path("model_project/views").mkdir(parents=True)
+            bundle = make_bundle("model_project/views/warehouse.view.lkml")
+
+            result = runner.invoke(lookml, ['generate', str(bundle), 'renamed'])
+            assert result.exit_code == 1
+            assert bundle.exists()
+
+            result = runner.invoke(lookml, ['batch', '--jobs', '1'])
+            assert result.exit_code == 0, result.output
+            assert "Successful: 1" in result.output
+            assert "'sample_transactions', 'customers'" in result.output
+            assert Path("model_project/explores/customers.explore.lkml").exists()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_split_matches_single_view_parse()
+    test_bundle_builds_each_view()
+    test_single_view_uses_content_in_hand()
+    test_refinements_are_part_of_their_view()
+    test_unsplittable_content_is_left_to_lkml()
+    test_bundle_cli()
+    print("✓ All multi-view file tests passed!")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for semantic field classification and the field index
+"""
+
+import random
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from lookml_builder.code.config import LookerConfig
+from lookml_builder.code.field_index import FieldKind, FieldRole, Measure
+from lookml_builder.code.patterns import FieldPatternMatcher
+from lookml_builder.test.helpers import make_builder
+
+
+def test_field_classification(tmp_path):
+    """Automatic detection keeps the documented order of each category"""
+    builder = make_builder(tmp_path)
+    builder.classify_semantic_fields()
+
+    assert builder.primary_key == ["order_id"]
+    assert builder.ids == ["customer_id"]
+    assert builder.dimensions == ["name", "status", "region"]
+    assert builder.filters == ["name", "status", "region", "created"]
+    assert builder.flags == ["is_gift"]
+    assert [m["name"] for m in builder.measures] == ["amount_total", "quantity_total", "status_code_total"]
+
+
+def test_config_overrides_and_index_roles(tmp_path):
+    """Config overrides are applied and recorded as roles on the field index"""
+    config = LookerConfig()
+    config.classification.force_as_ids = ["region", "region", "missing"]
+    config.classification.force_as_flags = ["status_code"]
+    config.classification.force_as_measures = ["amount", "extra"]
+    config.classification.exclude_from_filters = ["status"]
+
+    builder = make_builder(tmp_path, config=config)
+    builder.classify_semantic_fields()
+
+    assert builder.ids == ["customer_id", "region"]
+    assert builder.flags == ["is_gift", "status_code"]
+    assert builder.filters == ["name", "created"]
+    assert [m["name"] for m in builder.measures] == ["amount_total", "quantity_total", "extra_total"]
+
+    index = builder.field_index
+    assert index.is_kind("region", FieldKind.STRING)
+    assert index.has_role("region", FieldRole.ID)
+    assert index.has_role("status_code", FieldRole.FLAG)
+    assert index.has_role("amount", FieldRole.MEASURE)
+    assert not index.has_role("status", FieldRole.FILTER)
+    assert "extra" not in index
+
+
+def test_list_attributes_are_read_only_views(tmp_path):
+    """Category and role lists read like lists but are backed by one compact index"""
+    builder = make_builder(tmp_path)
+    builder.classify_semantic_fields()
+
+    dimensions = builder.dimensions
+    assert dimensions == ["name", "status", "region"] and dimensions == ("name", "status", "region")
+    assert len(dimensions) == 3 and dimensions[-1] == "region" and dimensions[:2] == ["name", "status"]
+    assert "status" in dimensions and "order_id" not in dimensions
+    assert repr(dimensions) == "['name', 'status', 'region']"
+    assert dimensions + builder.times == ["name", "status", "region", "created"]
+    assert ["x"] + dimensions == ["x", "name", "status", "region"]
+    copied = dimensions.copy()
+    copied.append("x")
+    assert isinstance(copied, list) and "x" not in builder.dimensions
+    with pytest.raises(AttributeError):
+        builder.dimensions.append("x")
+
+    # Each name is stored once however many categories and roles it has
+    index = builder.field_index
+    assert sorted(index.names) == sorted(set(index.names))
+    assert index.get("region").roles == FieldRole.DIMENSION | FieldRole.FILTER
+
+    # Reassigning a list replaces the column and its role flags
+    builder.dimensions = ["name"]
+    assert builder.dimensions == ["name"]
+    assert not index.has_role("status", FieldRole.DIMENSION)
+
+
+def test_measures_are_compact_records(tmp_path):
+    builder = make_builder(tmp_path)
+    builder.classify_semantic_fields()
+
+    measures = builder.measures
+    assert measures[0] == {"name": "amount_total", "type": "sum", "sql": "${amount}"}
+    assert dict(measures[0]) == measures[0].to_dict()
+    assert measures == [{"name": f"{field}_total", "type": "sum", "sql": f"${{{field}}}"}
+                        for field in ("amount", "quantity", "status_code")]
+    assert {"name": "quantity_total", "type": "sum", "sql": "${quantity}"} in measures
+    assert Measure("name") not in measures
+
+    builder.measures = [{"name": "name_total", "type": "sum", "sql": "${name}"}, Measure("amount")]
+    assert [m["name"] for m in builder.measures] == ["name_total", "amount_total"]
+
+    # Custom measures are kept as assigned (not compacted) and rendered like the defaults
+    custom = [{"name": "avg_amount", "type": "average", "sql": "${amount}"}, Measure("quantity")]
+    builder.measures = custom
+    assert builder.measures == custom
+    assert builder.classification()["measures"] == [custom[0], Measure("quantity").to_dict()]
+    semantic = builder.render_semantic()
+    assert "measure: avg_amount {\n    type: average\n    sql: ${amount};;" in semantic
+    assert "measure: quantity_total {" in semantic
+
+    # Classifying again goes back to the compact default measures
+    builder.classify_semantic_fields()
+    assert builder.field_index.custom_measures is None
+    assert [m["name"] for m in builder.measures] == ["amount_total", "quantity_total", "status_code_total"]
+
+
+def test_pattern_matcher_matches_substring_checks():
+    """The compiled matcher agrees with naive `pattern in name.lower()` checks"""
+    rng = random.Random(7)
+    alphabet = "abc_"
+    rules = {
+        f"class_{i}": ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(5)]
+        for i in range(6)
+    }
+    rules["upper"] = ["ABC"]  # never matches a lower-cased name
+    matcher = FieldPatternMatcher(rules)
+
+    for _ in range(500):
+        name = "".join(rng.choice(alphabet + "AB") for _ in range(rng.randint(0, 12)))
+        expected = {cls for cls, pats in rules.items() if any(p in name.lower() for p in pats)}
+        assert matcher.match(name) == expected, name
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_field_classification(Path(temp_dir))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_config_overrides_and_index_roles(Path(temp_dir))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_list_attributes_are_read_only_views(Path(temp_dir))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_measures_are_compact_records(Path(temp_dir))
+    test_pattern_matcher_matches_substring_checks()
+    print("✓ All classification tests passed!")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for glob/regex classification rules and the compiled decision table
+"""
+
+import pickle
+import random
+import re
+import tempfile
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+import pytest
+
+from lookml_builder.code import classification_rules as rules
+from lookml_builder.code.classification_rules import ClassificationRule, DecisionTable
+from lookml_builder.code.config import LookerConfig
+from lookml_builder.test.helpers import make_builder
+
+RULES = [
+    {"match": "status*", "role": "flag", "views": ["orders", "returns"]},
+    {"regex": "(customer|region)(_.*)?", "role": "id"},
+    {"match": "legacy_*", "role": "auto", "priority": 10},
+    {"match": "*", "role": "no_filter", "views": "audit_*"},
+]
+
+
+def test_rules_parse_validate_and_round_trip():
+    config = LookerConfig.from_dict({"classification": {"rules": RULES}})
+    assert config.classification.rules[0] == ClassificationRule("status*", "flag", views=("orders", "returns"))
+    assert config.classification.rules[1].regex
+    assert LookerConfig.from_dict(config.to_dict()).to_dict() == config.to_dict()
+    assert config.to_dict()["classification"]["rules"][3] == {"match": "*", "role": "no_filter", "views": ["audit_*"]}
+
+    snapshot = config.snapshot()
+    assert snapshot.to_dict() == config.to_dict()
+    assert pickle.loads(pickle.dumps(snapshot)).classification.rules == snapshot.classification.rules
+    # Configs without rules keep the fingerprint they had before rules existed
+    assert "rules" not in LookerConfig().to_dict()["classification"]
+
+    for bad in ({"role": "id"}, {"match": "a", "regex": "a", "role": "id"}, {"match": "a", "role": "dimension"},
+                {"match": "a", "role": "id", "priority": "high"}, {"regex": "a(", "role": "id"},
+                {"regex": "a)", "role": "id"}, {"match": "a", "role": "id", "view": "x"}, "a*"):
+        with pytest.raises(ValueError):
+            LookerConfig.from_dict({"classification": {"rules": [bad]}})
+
+
+def test_group_name_clashes_are_config_errors():
+    reserved = {"regex": "(?P<_rule1>a)", "role": "id"}
+    duplicate = {"regex": "(?P<key>b)y", "role": "measure"}
+    for entries, offending in (([reserved, {"match": "b", "role": "flag"}], reserved),
+                               ([{"regex": "x(?P<key>a)", "role": "id"}, duplicate], duplicate)):
+        # Reported when the config is loaded, naming the rule, rather than as re.error on the first build
+        with pytest.raises(ValueError, match=re.escape(repr(offending))):
+            LookerConfig.from_dict({"classification": {"rules": entries}})
+
+    # Each regex must compile alone, so it can't close the group it is wrapped in, and constructs
+    # whose meaning would change once combined with other rules are refused with the reason
+    for pattern, reason in (("a)|(?P<z>b", "unbalanced parenthesis"), (r"(a)\1", "numbered backreference"),
+                            ("(?i)abc", "global flags"), ("(a)?(?(1)b|c)", "numbered group condition")):
+        with pytest.raises(ValueError, match=re.escape(reason)):
+            LookerConfig.from_dict({"classification": {"rules": [{"regex": pattern, "role": "id"}]}})
+    for pattern in (r"(?P<x>a)(?P=x)", r"[\1]x", r"(?i:ab)c", r"a\\1", "[]1]+"):
+        LookerConfig.from_dict({"classification": {"rules": [{"regex": pattern, "role": "id"}]}})
+
+    # Rules making different decisions are compiled separately, so they may share a name
+    config = LookerConfig.from_dict({"classification": {"rules": [
+        {"regex": "x(?P<key>a)", "role": "id"}, {"regex": "(?P<key>b)y", "role": "no_filter"}]}})
+    assert config.classification_rules().for_view("v").decide("xa") == {rules.ID}
+
+    # Alternations stay inside their rule's group, so the matching rule is always known
+    config = LookerConfig.from_dict({"classification": {"rules": [
+        {"regex": "a|b", "role": "flag"}, {"regex": "(?P<z>c)|d", "role": "measure"}]}})
+    table = config.classification_rules().for_view("v")
+    assert [table.decide(name) for name in "abcde"] == [{rules.FLAG}] * 2 + [{rules.MEASURE}] * 2 + [frozenset()]
+
+
+def test_priority_first_match_and_exact_tier():
+    table = DecisionTable({rules.ID: ("status",), rules.NO_FILTER: ("legacy_flag",)},
+                          tuple(map(ClassificationRule.from_dict, RULES)))
+    orders, audit = table.for_view("orders"), table.for_view("audit_log")
+
+    assert orders.decide("status_code") == {rules.FLAG}
+    assert orders.decide("region") == {rules.ID}
+    # AUTO has the highest priority, so legacy fields keep automatic detection
+    assert orders.decide("legacy_status") == frozenset()
+    # Exact names win the decision they make; the other decision still goes to the rules
+    assert orders.decide("status") == {rules.ID}
+    assert audit.decide("legacy_flag") == {rules.NO_FILTER}
+    assert audit.decide("customer_id") == {rules.ID, rules.NO_FILTER}
+    assert audit.decide("status_code") == {rules.NO_FILTER}
+
+    # Views with the same applicable rules share one compiled table
+    assert table.for_view("returns") is orders
+    assert table.for_view("audit_users") is audit
+
+    assigned = orders.assign(["region", "status", "status_code", "legacy_status", "customer"])
+    assert assigned == {rules.ID: ["status", "region", "customer"], rules.FLAG: ["status_code"],
+                        rules.MEASURE: [], rules.NO_FILTER: ["legacy_flag"]}
+
+
+def test_decision_table_matches_rule_by_rule_evaluation():
+    rng = random.Random(25)
+    parts = ["a", "b", "ab", "_", "id", "x"]
+    for _ in range(200):
+        specs = []
+        for _ in range(rng.randint(1, 6)):
+            role = rng.choice(rules.ROLES)
+            if rng.random() < 0.5:
+                spec = {"match": rng.choice(["*", "a*", "*_id", "?b*", "[ab]*x", "ab"]), "role": role}
+            else:
+                spec = {"regex": rng.choice(["a.*", ".*(id|x)", "(a|b)+", "b?_.*"]), "role": role}
+            if rng.random() < 0.3:
+                spec["views"] = [rng.choice(["v1", "v*", "w"])]
+            spec["priority"] = rng.randint(0, 2)
+            specs.append(spec)
+        parsed = [ClassificationRule.from_dict(spec) for spec in specs]
+        exact = {rules.FLAG: ("ab",)} if rng.random() < 0.5 else {}
+        table = DecisionTable(exact, tuple(parsed))
+        ordered = sorted(parsed, key=lambda rule: -rule.priority)
+        for view in ("v1", "w"):
+            for _ in range(20):
+                name = "".join(rng.choice(parts) for _ in range(rng.randint(1, 4)))
+                expected = set()
+                for decision in rules.DECISIONS:
+                    if decision[0] == rules.ID and name in exact.get(rules.FLAG, ()):
+                        expected.add(rules.FLAG)
+                        continue
+                    for rule in ordered:
+                        if rule.role in decision and rule.applies_to(view) and (
+                                re.fullmatch(rule.pattern, name) if rule.regex else fnmatchcase(name, rule.pattern)):
+                            expected.add(rule.role)
+                            break
+                expected -= {rules.AUTO, rules.FILTER}
+                assert table.for_view(view).decide(name) == expected, (specs, view, name)
+
+
+def test_rules_drive_builder_classification(tmp_path):
+    config = LookerConfig.from_dict({"classification": {
+        "force_as_flags": ["quantity"],
+        "rules": [
+            {"match": "status*", "role": "flag", "views": ["orders"]},
+            {"match": "*", "role": "measure", "views": ["orders"], "priority": -1},
+            {"regex": "reg.*", "role": "id"},
+            {"match": "[nr]*", "role": "no_filter"},
+        ],
+    }})
+    builder = make_builder(tmp_path, config=config)
+    builder.classify_semantic_fields()
+
+    assert builder.ids == ["customer_id", "region"]
+    assert builder.flags == ["is_gift", "quantity", "status_code"]
+    assert builder.filters == ["status", "created"]
+    assert [m["name"] for m in builder.measures] == ["amount_total", "order_id_total", "customer_id_total",
+                                                     "name_total", "created_total", "is_gift_total"]
+
+    # Rules scoped to other views leave this one alone
+    builder = make_builder(tmp_path, "returns", config)
+    builder.classify_semantic_fields()
+    assert builder.flags == ["is_gift", "quantity"]
+    assert [m["name"] for m in builder.measures] == ["amount_total", "status_code_total"]
+
+    # Snapshots classify exactly like the config they were taken from
+    snapshot_builder = make_builder(tmp_path, "orders", config.snapshot())
+    snapshot_builder.classify_semantic_fields()
+    assert snapshot_builder.flags == ["is_gift", "quantity", "status_code"]
+
+
+if __name__ == "__main__":
+    test_rules_parse_validate_and_round_trip()
+    test_group_name_clashes_are_config_errors()
+    test_priority_first_match_and_exact_tier()
+    test_decision_table_matches_rule_by_rule_evaluation()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_rules_drive_builder_classification(Path(temp_dir))
+    print("✓ All classification rule tests passed!")
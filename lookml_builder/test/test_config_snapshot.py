@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for frozen config snapshots and concurrent builds sharing one configuration
+"""
+
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
+import pytest
+
+from lookml_builder.code.bundle import generate_views
+from lookml_builder.code.config import ConfigSnapshot, LookerConfig
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+from lookml_builder.test.helpers import SAMPLE_VIEW
+
+ONTOLOGY = {"relationships": [
+    {"from": "any", "to": "Calendar", "type": "left_outer", "relationship": "many_to_one", "via": "a"},
+    {"from": "view_3", "to": "customers", "type": "left_outer", "relationship": "many_to_one", "via": "b"},
+]}
+
+
+def make_config():
+    config = LookerConfig(ontology=ONTOLOGY)
+    config.classification.force_as_ids = ["customer_name"]
+    config.classification.exclude_from_filters = ["status"]
+    return config
+
+
+def test_snapshot_is_frozen_and_hashable():
+    config = make_config()
+    snapshot = config.snapshot()
+
+    assert snapshot.fingerprint() == config.fingerprint()
+    assert snapshot.to_dict() == config.to_dict()
+    assert snapshot == config.snapshot() and hash(snapshot) == hash(config.snapshot())
+    assert {snapshot: "cached"}[config.snapshot()] == "cached"
+    assert snapshot.snapshot() is snapshot
+
+    with pytest.raises(FrozenInstanceError):
+        snapshot.ontology = {}
+    with pytest.raises(FrozenInstanceError):
+        snapshot.classification.primary_key = "id"
+    with pytest.raises(TypeError):
+        snapshot.ontology["relationships"][0]["to"] = "other"
+
+    # Later changes to the source config don't reach the snapshot
+    config.classification.force_as_ids.append("region")
+    config.ontology["relationships"].append({"from": "x", "to": "y"})
+    assert snapshot.classification.force_as_ids == ("customer_name",)
+    assert len(snapshot.ontology_index()) == 2
+    assert snapshot != config.snapshot()
+
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert restored == snapshot and restored.to_dict() == snapshot.to_dict()
+
+
+def test_ontology_override_leaves_shared_config_untouched():
+    config = LookerConfig()
+    fingerprint = config.fingerprint()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        view_path = Path(temp_dir) / "orders.view.lkml"
+        shutil.copy(SAMPLE_VIEW, view_path)
+        builder = LookerExploreBuilder("orders", config, str(Path(temp_dir) / "out"))
+        result = builder.build_complete_explore(str(view_path), ontology_config=ONTOLOGY)
+        assert "join: calendar" in Path(result["explore_file"]).read_text()
+    assert config.ontology == {} and config.fingerprint() == fingerprint
+    assert builder.config.ontology == ONTOLOGY
+
+
+def test_thread_pool_shares_one_snapshot():
+    """Hundreds of concurrent builds against one snapshot match the same builds run one at a time"""
+    snapshot = make_config().snapshot()
+    content = SAMPLE_VIEW.read_text()
+    names = [f"view_{i % 25}" for i in range(200)]
+
+    def build(view_name):
+        view = generate_views(content, snapshot, new_view_name=view_name)[0]
+        return view.documents(), view.classification
+
+    expected = {name: build(name) for name in set(names)}
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(build, names))
+    for name, result in zip(names, results):
+        assert result == expected[name]
+    assert "join: customers" in expected["view_3"][0]["explores/view_3.explore.lkml"]
+    assert snapshot.fingerprint() == make_config().fingerprint()
+
+
+def test_builder_state_is_per_build():
+    builder = LookerExploreBuilder("orders", ConfigSnapshot.from_dict({}))
+    first = builder.generate(SAMPLE_VIEW.read_text(), "sample_transactions")
+    state = builder.state
+    second = builder.generate(SAMPLE_VIEW.read_text(), "sample_transactions")
+    assert builder.state is not state
+    assert first.classification == second.classification == builder.classification()
+
+
+if __name__ == "__main__":
+    test_snapshot_is_frozen_and_hashable()
+    test_ontology_override_leaves_shared_config_untouched()
+    test_thread_pool_shares_one_snapshot()
+    test_builder_state_is_per_build()
+    print("✓ All config snapshot tests passed!")
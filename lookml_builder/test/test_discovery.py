@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for view discovery - recursive walking, exclusions and file lists
+"""
+
+import io
+import os
+import tempfile
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from lookml_builder.code.cli import lookml
+from lookml_builder.code.discovery import compile_excludes, discover_view_files, read_file_list
+from lookml_builder.test.helpers import make_views
+
+
+def make_tree(root):
+    """Views nested in subfolders, plus generated layers and hidden folders to skip"""
+    root = Path(root)
+    for relative in ["top.view.lkml", "sales/orders.view.lkml", "sales/archive/orders_old.view.lkml",
+                     "sales/refunds.view.lkml", "users/users.view.lkml", ".hidden/secret.view.lkml",
+                     "users/users/users.source.view.lkml", "users/notes.txt"]:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("view: x {}\n")
+
+
+def test_discovery_walks_and_excludes():
+    """Recursive discovery is ordered, skips generated/hidden files and applies both kinds of pattern"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        make_tree(temp_dir)
+        relative = lambda paths: [p.relative_to(temp_dir).as_posix() for p in paths]
+
+        assert relative(discover_view_files(temp_dir)) == ["top.view.lkml"]
+        assert relative(discover_view_files(temp_dir, recursive=True)) == [
+            "top.view.lkml", "sales/orders.view.lkml", "sales/refunds.view.lkml",
+            "sales/archive/orders_old.view.lkml", "users/users.view.lkml",
+        ]
+        assert relative(discover_view_files(temp_dir, recursive=True, exclude=["sales/archive/*", "ref*"])) == [
+            "top.view.lkml", "sales/orders.view.lkml", "users/users.view.lkml",
+        ]
+
+        excluded = compile_excludes(["*_old*", "users/*"])
+        assert excluded("orders_old.view.lkml", "sales/archive/orders_old.view.lkml")
+        assert excluded("users.view.lkml", "users/users.view.lkml")
+        assert not excluded("users.view.lkml", "people/users.view.lkml")
+
+
+def test_read_file_list_delimiters():
+    """NUL-delimited lists are detected; newline lists tolerate CRLF and blank lines"""
+    assert read_file_list(io.BytesIO(b"a b.view.lkml\0c.view.lkml\0")) == ["a b.view.lkml", "c.view.lkml"]
+    assert read_file_list(io.BytesIO(b"a.view.lkml\r\n\nc.view.lkml\n")) == ["a.view.lkml", "c.view.lkml"]
+
+
+def test_batch_files_from_stdin():
+    """`lookml batch --files-from -` builds only listed base views and reports missing ones"""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            alpha, beta = make_views("warehouse/nested", ["alpha_orders", "beta_orders"])
+            listing = b"\0".join([str(alpha).encode(), b"README.md", b"gone.view.lkml"]) + b"\0"
+
+            result = runner.invoke(lookml, ['batch', '--jobs', '1', '--files-from', '-'], input=listing)
+            assert result.exit_code == 0, result.output
+            assert "Successful: 1" in result.output
+            assert "Listed file not found: gone.view.lkml" in result.output
+            assert Path("model_project/explores/alpha_orders.explore.lkml").exists()
+            assert beta.exists()
+
+            result = runner.invoke(lookml, ['batch', '--jobs', '1', '--views-dir', 'warehouse', '--recursive'])
+            assert "Successful: 1" in result.output, result.output
+            assert Path("model_project/explores/beta_orders.explore.lkml").exists()
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_discovery_walks_and_excludes()
+    test_read_file_list_delimiters()
+    test_batch_files_from_stdin()
+    print("✓ All discovery tests passed!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the field-signature scanner - equivalence with lkml.load and fallback
+"""
+
+import random
+
+import lkml
+
+from lookml_builder.benchmarks.synthetic import TYPE_MIXES, SyntheticSpec, render_view
+from lookml_builder.code.field_scanner import scan_field_tables
+from lookml_builder.code.looker_explore_builder import extract_field_tables, load_field_tables
+from lookml_builder.test.helpers import EXTRA_VIEW, SAMPLE_VIEW
+
+MODEL_PROJECT = SAMPLE_VIEW.parents[1]
+
+
+def reference(content):
+    return extract_field_tables(lkml.load(content))
+
+
+def test_sample_views_match_lkml():
+    """Every LookML file shipped in model_project scans to the same tables lkml produces"""
+    paths = sorted(MODEL_PROJECT.rglob("*.lkml"))
+    assert paths
+    for path in paths:
+        content = path.read_text()
+        assert scan_field_tables(content) == reference(content), path
+
+
+def test_synthetic_and_multi_view_content_match_lkml():
+    for mix in TYPE_MIXES:
+        content = render_view("synthetic", SyntheticSpec(fields=200, mix=mix), seed=1)
+        assert scan_field_tables(content) == reference(content)
+    bundle = SAMPLE_VIEW.read_text() + EXTRA_VIEW
+    tables = scan_field_tables(bundle)
+    assert [table["name"] for table in tables] == ["sample_transactions", "customers"]
+    assert tables == reference(bundle)
+
+
+def test_signatures():
+    content = '''
+# leading comment
+view: +orders {
+  sql_table_name: a.b ;;
+  dimension: id { primary_key: yes type: "number" sql: ${TABLE}.id ;; }
+  dimension: note {
+    html: {% if value %} } [ {{ value }} {% endif %} ;;
+    link: { label: "x" url: "https://example.com/{{ value }}" }
+    tags: ["a", "b",]
+  }
+  dimension_group: created { type: time timeframes: [raw, date] sql: ${TABLE}.created ;; }
+  measure: count { type: count filters: [status: "done", id: "-NULL"] }
+}
+explore: orders { join: users { sql_on: ${a} = ${b} ;; } }
+'''
+    assert scan_field_tables(content) == [{
+        "name": "+orders",
+        "dimensions": [["id", "number"], ["note", None]],
+        "dimension_groups": [["created", "time"]],
+    }]
+    assert scan_field_tables(content) == reference(content)
+    assert scan_field_tables("") == reference("") == []
+
+
+def test_unsupported_content_falls_back():
+    """Content the scanner can't vouch for returns None, and load_field_tables still parses it with lkml"""
+    unsupported = [
+        "view: a { dimension: b { type: string }",                  # unclosed block
+        "view: a { dimension: b { type: string type: number } }",   # repeated key lkml rejects
+        "view: a { dimension: b { sql: ${TABLE}.b } }",             # expression without ';;'
+        "view: a { dimension: b { type: [string] } }",              # type is not a value
+        "view: a { dimensions: [b] }",                              # clashes with lkml's plural key
+        "view: a { dimension: b { name: c } }",
+        'view: a { dimension: "b" { } }',
+        "view: a { dimension: b { value_format: - 5 } }",
+        "view: a { x: [a, b: c] }",
+        "view: a { x:: y }",
+        "view: a",
+    ]
+    for content in unsupported:
+        assert scan_field_tables(content) is None, content
+
+    content = "view: a { dimension: b { value_format: - 5 type: number } }"
+    assert load_field_tables(content) == reference(content) == [
+        {"name": "a", "dimensions": [["b", "number"]], "dimension_groups": []}]
+
+
+def test_mutated_views_never_disagree_with_lkml():
+    """Random edits either scan to lkml's exact result or make the scanner fall back"""
+    base = SAMPLE_VIEW.read_text() + EXTRA_VIEW
+    pieces = ["{", "}", "[", "]", ",", ":", '"', "#", "\n", "-", "sql:", "name: x", "type: number",
+              "dimension: q {", "view: v {", "x: [a, b: c]", "x: [,]", "type: {}"]
+    rng = random.Random(7)
+    scanned = 0
+    for _ in range(300):
+        content = base
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randrange(len(content))
+            if rng.random() < 0.4:
+                # Never delete a ';' - a lone one sends lkml's lexer into an endless loop
+                end = position + rng.randint(1, 5)
+                if ";" not in content[position:end]:
+                    content = content[:position] + content[end:]
+            else:
+                content = content[:position] + rng.choice(pieces) + content[position:]
+        tables = scan_field_tables(content)
+        if tables is not None:
+            scanned += 1
+            assert tables == reference(content), content
+    assert scanned > 50
+
+
+if __name__ == "__main__":
+    test_sample_views_match_lkml()
+    test_synthetic_and_multi_view_content_match_lkml()
+    test_signatures()
+    test_unsupported_content_falls_back()
+    test_mutated_views_never_disagree_with_lkml()
+    print("✓ All field scanner tests passed!")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory generation API - rendering without filesystem side effects
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from lookml_builder import DirectorySink, GeneratedView, MemorySink, generate_views
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+from lookml_builder.test.helpers import EXTRA_VIEW, SAMPLE_VIEW
+
+
+def test_generate_touches_no_files():
+    """Building and generating leave the working directory empty"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.chdir(temp_dir)
+        try:
+            views = generate_views(SAMPLE_VIEW.read_text(), new_view_name="orders")
+            LookerExploreBuilder("orders", output_base_dir="model_project")
+            assert os.listdir(temp_dir) == []
+        finally:
+            os.chdir(cwd)
+
+    view = views[0]
+    assert isinstance(view, GeneratedView)
+    assert view.view_name == "orders"
+    assert "view: orders" in view.source
+    assert "view: +orders" in view.semantic
+    assert "explore: orders" in view.explore
+    assert view.classification["primary_key"]
+
+
+def test_documents_match_build_complete_explore():
+    """generate_views renders exactly what the file-based build writes"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        view_path = Path(temp_dir) / "sample_transactions.view.lkml"
+        shutil.copy(SAMPLE_VIEW, view_path)
+        output_dir = Path(temp_dir) / "out"
+        LookerExploreBuilder("orders", output_base_dir=str(output_dir)).build_complete_explore(str(view_path))
+
+        documents = generate_views(SAMPLE_VIEW.read_text(), new_view_name="orders")[0].documents()
+        for relative_path, content in documents.items():
+            assert (output_dir / relative_path).read_text() == content
+
+
+def test_sinks():
+    """Generated views can be persisted to memory or a directory"""
+    view = generate_views(SAMPLE_VIEW.read_text())[0]
+
+    memory = MemorySink()
+    locations = view.write(memory)
+    assert memory.documents == view.documents()
+    assert locations["explore_file"] == "explores/sample_transactions.explore.lkml"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        locations = view.write(DirectorySink(temp_dir))
+        assert Path(locations["source_file"]).read_text() == view.source
+        assert sorted(os.listdir(temp_dir)) == ["explores", "views"]
+
+
+def test_generate_multi_view_content():
+    views = generate_views(SAMPLE_VIEW.read_text() + EXTRA_VIEW)
+    assert [view.view_name for view in views] == ["sample_transactions", "customers"]
+    assert "customer_id" in views[1].classification["strings"]
+    with pytest.raises(ValueError):
+        generate_views(SAMPLE_VIEW.read_text() + EXTRA_VIEW, new_view_name="orders")
+    with pytest.raises(ValueError):
+        generate_views("# no views here\n")
+
+
+if __name__ == "__main__":
+    test_generate_touches_no_files()
+    test_documents_match_build_complete_explore()
+    test_sinks()
+    test_generate_multi_view_content()
+    print("✓ All generation API tests passed!")
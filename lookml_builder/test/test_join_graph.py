@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the ontology join graph - reachability, cycles and fan-out reports
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from lookml_builder.code.cli import lookml
+from lookml_builder.code.join_graph import JoinGraph
+
+ONTOLOGY = {
+    "relationships": [
+        {"from": "orders", "to": "Customers", "relationship": "many_to_one", "via": "a"},
+        {"from": "orders", "to": "order_items", "relationship": "one_to_many", "via": "b"},
+        {"from": "order_items", "to": "shipments", "relationship": "one_to_many", "via": "c"},
+        {"from": "customers", "to": "orders", "relationship": "one_to_many", "via": "d"},
+        {"from": "shipments", "to": "shipments", "via": "e"},
+        {"from": "any", "to": "dates", "via": "f"},
+    ]
+}
+
+
+def test_reachability_and_cycles():
+    """Reachability follows joins transitively; cycles include self-joins"""
+    graph = JoinGraph.from_ontology(ONTOLOGY)
+    assert graph.reachable("orders") == {"customers": 1, "order_items": 1, "dates": 1, "shipments": 2}
+    assert graph.reachable("orders", max_depth=1) == {"customers": 1, "order_items": 1, "dates": 1}
+    # Wildcard joins only apply to the first hop
+    assert graph.reachable("order_items") == {"shipments": 1, "dates": 1}
+    assert graph.cycles() == [["customers", "orders"], ["shipments"]]
+
+
+def test_fanout_report_flags_chains():
+    """Paths chaining fan-out joins are flagged, worst first"""
+    graph = JoinGraph.from_ontology(ONTOLOGY)
+    orders = graph.fanout_report("orders")
+    assert orders.joins == 3
+    assert orders.fanout_joins == ["order_items"]
+    assert orders.chains == [(2, ["orders", "order_items", "shipments"])]
+    assert orders.flagged and orders.max_chain == 2
+
+    assert not graph.fanout_report("orders", max_depth=1).flagged
+    customers = graph.fanout_report("customers")
+    assert customers.max_chain == 3
+    assert customers.chains[0][1] == ["customers", "orders", "order_items", "shipments"]
+
+
+def test_mixed_case_and_wildcard_only_explores():
+    """Both ends of a join are normalised alike; views joined only by wildcards still get reports"""
+    graph = JoinGraph.from_ontology({"relationships": [
+        {"from": "Orders", "to": "Customers", "relationship": "one_to_many", "via": "a"},
+        {"from": "Customers", "to": "Orders", "relationship": "one_to_many", "via": "b"},
+        {"from": "Customers", "to": "Addresses", "relationship": "one_to_many", "via": "c"},
+        {"from": "any", "to": "Dates", "via": "d"},
+    ]})
+    assert graph.cycles() == [["customers", "orders"]]
+    assert graph.reachable("orders") == {"customers": 1, "dates": 1, "addresses": 2}
+    assert graph.fanout_report("orders").chains == [(2, ["orders", "customers", "addresses"])]
+
+    assert graph.explores() == ["orders", "customers", "addresses", "dates"]
+    dates = graph.fanout_reports()[-1]
+    assert dates.explore == "dates" and dates.joins == 1
+
+
+def test_graph_cli_check():
+    """`lookml graph --check` fails when an explore chains fan-out joins"""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            Path("config.yaml").write_text(
+                "ontology:\n  relationships:\n"
+                "    - {from: orders, to: customers, relationship: many_to_one, via: x}\n"
+            )
+            result = runner.invoke(lookml, ['graph', '--check'])
+            assert result.exit_code == 0, result.output
+
+            Path("config.yaml").write_text(
+                "ontology:\n  relationships:\n"
+                "    - {from: orders, to: items, relationship: one_to_many, via: x}\n"
+                "    - {from: items, to: parts, relationship: one_to_many, via: y}\n"
+            )
+            result = runner.invoke(lookml, ['graph', '--check'])
+            assert result.exit_code == 1
+            assert "orders → items → parts" in result.output
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_reachability_and_cycles()
+    test_fanout_report_flags_chains()
+    test_mixed_case_and_wildcard_only_explores()
+    test_graph_cli_check()
+    print("✓ All join graph tests passed!")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the ontology relationship index
+"""
+
+import random
+
+from lookml_builder.code.config import LookerConfig
+from lookml_builder.code.ontology import OntologyIndex
+
+
+def test_index_matches_linear_scan():
+    """Indexed joins equal the linear scan, including wildcard joins interleaved in ontology order"""
+    rng = random.Random(3)
+    views = ["orders", "customers", "payments", "unused"]
+    relationships = [{"from": rng.choice(views[:3] + ["any"]), "to": f"t{i}", "via": str(i)} for i in range(200)]
+    relationships.append({"to": "no_source", "via": "x"})
+    index = OntologyIndex.build({"relationships": relationships})
+
+    for view in views:
+        expected = [rel for rel in relationships if rel.get("from") in (view, "any")]
+        assert index.joins_for(view) == expected
+    assert len(index) == 200
+    assert OntologyIndex.build({}).joins_for("orders") == []
+
+
+def test_config_caches_index_per_ontology():
+    """The config reuses its index until the relationships change in any way"""
+    config = LookerConfig(ontology={"relationships": [{"from": "orders", "to": "customers", "via": "x"}]})
+    index = config.ontology_index()
+    assert config.ontology_index() is index
+
+    config.ontology["relationships"].append({"from": "orders", "to": "payments", "via": "y"})
+    assert [rel["to"] for rel in config.ontology_index().joins_for("orders")] == ["customers", "payments"]
+
+    # Re-pointing or replacing a relationship in place is picked up once the index is invalidated
+    config.ontology["relationships"][1]["from"] = "returns"
+    config.invalidate_ontology_index()
+    assert [rel["to"] for rel in config.ontology_index().joins_for("returns")] == ["payments"]
+    # Other keys show through without it, since the index holds the relationship dicts
+    config.ontology["relationships"][1]["to"] = "refunds"
+    assert [rel["to"] for rel in config.ontology_index().joins_for("returns")] == ["refunds"]
+    config.ontology["relationships"][0] = {"from": "refunds", "to": "customers", "via": "z"}
+    config.invalidate_ontology_index()
+    assert config.ontology_index().joins_for("orders") == []
+    config.ontology["relationships"] = []
+    assert config.ontology_index().joins_for("refunds") == []
+
+    config.ontology = {"relationships": []}
+    assert config.ontology_index().joins_for("refunds") == []
+
+
+if __name__ == "__main__":
+    test_index_matches_linear_scan()
+    test_config_caches_index_per_ontology()
+    print("✓ All ontology tests passed!")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for output sinks - diff-aware, atomic writes and write counts
+"""
+
+import os
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from lookml_builder.code.cli import lookml
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+from lookml_builder.code import output
+from lookml_builder.code.output import UNCHANGED, WRITTEN, DirectorySink, MemorySink
+from lookml_builder.test.helpers import SAMPLE_VIEW, make_views
+
+
+def test_directory_sink_skips_identical_content():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sink = DirectorySink(temp_dir)
+        assert sink.write("views/a.view.lkml", "view: a {}\n") == WRITTEN
+        path = Path(temp_dir) / "views/a.view.lkml"
+        os.utime(path, ns=(1, 1))
+
+        assert sink.write("views/a.view.lkml", "view: a {}\n") == UNCHANGED
+        assert path.stat().st_mtime_ns == 1
+
+        # Same size, different bytes is still a change
+        assert sink.write("views/a.view.lkml", "view: b {}\n") == WRITTEN
+        assert path.read_text() == "view: b {}\n"
+        assert sink.stats.to_dict() == {"written": 2, "unchanged": 1, "skipped": 0}
+        assert os.listdir(path.parent) == ["a.view.lkml"]
+
+
+def test_directory_sink_keeps_file_mode():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "a.view.lkml"
+        path.write_text("old\n")
+        path.chmod(0o640)
+        DirectorySink(temp_dir).write("a.view.lkml", "new content\n")
+        assert path.read_text() == "new content\n"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_directory_sink_streams_in_chunks():
+    """Streamed documents are compared chunk by chunk; only changed ones reach the disk"""
+    lines = [f"line {number}\n" for number in range(50)]
+
+    def render(parts):
+        return lambda stream: [stream.write(part) for part in parts]
+
+    chunk_chars, output.STREAM_CHUNK_CHARS = output.STREAM_CHUNK_CHARS, 4
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sink = DirectorySink(temp_dir)
+            path = Path(temp_dir) / "views/a.view.lkml"
+            assert sink.stream("views/a.view.lkml", render(lines)) == WRITTEN
+            assert path.read_text() == "".join(lines)
+            path.chmod(0o640)
+            os.utime(path, ns=(1, 1))
+
+            assert sink.stream("views/a.view.lkml", render(lines)) == UNCHANGED
+            assert path.stat().st_mtime_ns == 1
+
+            # A change late in the file, a shorter file and a longer one are all written in full
+            for changed in (lines[:40] + ["élan\n"] + lines[41:], lines[:-1], lines + ["extra\n"]):
+                assert sink.stream("views/a.view.lkml", render(changed)) == WRITTEN
+                assert path.read_text() == "".join(changed)
+            assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+            with sink.open("views/a.view.lkml") as stream:
+                stream.write("view: a {}\n")
+            assert path.read_text() == "view: a {}\n"
+
+            # A render that fails leaves the file as it was
+            with pytest.raises(RuntimeError):
+                with sink.open("views/a.view.lkml") as stream:
+                    stream.write("partial " * 10)
+                    raise RuntimeError("render failed")
+            assert path.read_text() == "view: a {}\n"
+            assert os.listdir(path.parent) == ["a.view.lkml"]
+            assert sink.stats.to_dict() == {"written": 5, "unchanged": 1, "skipped": 0}
+    finally:
+        output.STREAM_CHUNK_CHARS = chunk_chars
+
+
+def test_memory_sink_counts():
+    sink = MemorySink()
+    sink.write("a", "x")
+    sink.write("a", "x")
+    with sink.open("a") as file:
+        file.write("y")
+    assert sink.documents == {"a": "y"}
+    assert sink.stats.to_dict() == {"written": 2, "unchanged": 1, "skipped": 0}
+
+
+def test_rebuild_leaves_outputs_untouched():
+    """Rebuilding an unchanged view rewrites none of its four files"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = Path(temp_dir) / "out"
+        view_path = Path(temp_dir) / "orders.view.lkml"
+        shutil.copy(SAMPLE_VIEW, view_path)
+        result = LookerExploreBuilder("orders", output_base_dir=str(output_dir)).build_complete_explore(
+            str(view_path), keep_original=True)
+        assert result["metadata"]["writes"]["written"] == 4
+
+        mtimes = {path: path.stat().st_mtime_ns for path in output_dir.rglob("*.lkml")}
+        result = LookerExploreBuilder("orders", output_base_dir=str(output_dir)).build_complete_explore(
+            str(view_path), keep_original=True)
+        assert result["metadata"]["writes"] == {"written": 0, "unchanged": 4, "skipped": 0}
+        assert {path: path.stat().st_mtime_ns for path in output_dir.rglob("*.lkml")} == mtimes
+        assert not list(output_dir.rglob("*.tmp"))
+
+
+def test_batch_reports_file_counts():
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            make_views("model_project/views", ["alpha_orders", "beta_orders"])
+            result = runner.invoke(lookml, ['batch', '--jobs', '1'])
+            assert "Files: 8 written, 0 unchanged, 0 skipped" in result.output, result.output
+
+            make_views("model_project/views", ["alpha_orders", "beta_orders"])
+            result = runner.invoke(lookml, ['batch', '--jobs', '1'])
+            assert "Files: 0 written, 0 unchanged, 8 skipped" in result.output, result.output
+
+            make_views("model_project/views", ["alpha_orders", "beta_orders"])
+            result = runner.invoke(lookml, ['batch', '--jobs', '1', '--force'])
+            assert "Files: 0 written, 8 unchanged, 0 skipped" in result.output, result.output
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_directory_sink_skips_identical_content()
+    test_directory_sink_keeps_file_mode()
+    test_directory_sink_streams_in_chunks()
+    test_memory_sink_counts()
+    test_rebuild_leaves_outputs_untouched()
+    test_batch_reports_file_counts()
+    print("✓ All output tests passed!")
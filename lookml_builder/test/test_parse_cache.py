@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk parsed-LookML cache
+"""
+
+import tempfile
+from pathlib import Path
+
+from lookml_builder.code.looker_explore_builder import LookerExploreBuilder
+from lookml_builder.code.parse_cache import ParseCache
+
+SAMPLE_VIEW = Path(__file__).resolve().parents[2] / "model_project" / "views" / "sample_transactions.view.lkml"
+
+
+def test_cached_parse_matches_fresh_parse():
+    """A cache hit returns exactly what lkml.load produced"""
+    content = SAMPLE_VIEW.read_text()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ParseCache(str(Path(temp_dir) / "cache"))
+        builder = LookerExploreBuilder("sample_transactions", output_base_dir=str(Path(temp_dir) / "out"), parse_cache=cache)
+
+        fresh = builder.parse_lookml_with_lkml(content)
+        assert (cache.hits, cache.misses) == (0, 1)
+
+        cached = builder.parse_lookml_with_lkml(content)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cached == fresh
+
+        # A different cache instance over the same directory reuses the entry
+        other = ParseCache(str(Path(temp_dir) / "cache"))
+        assert other.get(content) is not None
+
+
+def test_cache_evicts_least_recently_used():
+    """Entries beyond the size budget are evicted oldest-first"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ParseCache(temp_dir, max_bytes=2000)
+        table = [{"name": "v", "dimensions": [["x" * 100, "string"]], "dimension_groups": []}]
+
+        cache.put("first", table)
+        cache.put("second", table)
+        assert cache.get("first") is not None  # refresh "first"
+
+        for i in range(20):
+            cache.put(f"filler {i}", table)
+
+        total = sum(p.stat().st_size for p in Path(temp_dir).rglob("*.json"))
+        assert total <= 2000
+        assert cache.get("second") is None
+
+
+if __name__ == "__main__":
+    test_cached_parse_matches_fresh_parse()
+    test_cache_evicts_least_recently_used()
+    print("✓ All parse cache tests passed!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for project-wide ontology bootstrapping - merging, caching and the CLI
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import yaml
+from click.testing import CliRunner
+
+from lookml_builder import init_ontology_from_lookml, init_ontology_from_project
+from lookml_builder.code.cli import lookml
+from lookml_builder.code.project_ontology import EntityCache, extract_entities, merge_entities, scan_entities
+from lookml_builder.code.parse_cache import ParseCache
+from lookml_builder.test.helpers import SAMPLE_VIEW, make_views
+
+KEYED_VIEW = """
+view: alpha_orders {
+  dimension: order_id { primary_key: yes type: string sql: ${TABLE}.order_id ;; }
+  dimension: region { type: string sql: ${TABLE}.region ;; }
+}
+"""
+
+SPLIT_VIEW = """
+view: alpha_orders {
+  dimension: channel { type: string sql: ${TABLE}.channel ;; }
+  dimension: region { type: string sql: ${TABLE}.region ;; }
+  dimension_group: shipped { type: time sql: ${TABLE}.shipped ;; }
+}
+"""
+
+
+def test_extract_entities_matches_single_file_init():
+    entities = extract_entities(SAMPLE_VIEW.read_text())
+    assert init_ontology_from_lookml(str(SAMPLE_VIEW))["entities"] == dict(entities)
+    assert entities[0][0] == "Sampletransactions"
+    assert extract_entities(KEYED_VIEW) == [
+        ("Alphaorders", {"keys": ["order_id"], "attributes": ["region"], "pii_tags": []})]
+
+
+def test_merge_is_union_in_file_order():
+    merged = merge_entities([extract_entities(KEYED_VIEW), extract_entities(SPLIT_VIEW)])
+    assert merged == {"Alphaorders": {"keys": ["order_id"], "attributes": ["region", "channel", "shipped"],
+                                      "pii_tags": []}}
+
+
+def test_project_ontology_is_deterministic_and_cached():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        views = Path(temp_dir) / "views"
+        make_views(views, ["alpha_orders", "beta_orders"])
+        make_views(views / "nested" / "deeper", ["gamma_orders"])
+        (views / "nested" / "alpha_orders_extra.view.lkml").write_text(SPLIT_VIEW)
+        # Generated layers are not inputs
+        (views / "beta_orders.semantic.view.lkml").write_text("view: +beta_orders { measure: x { type: sum } }")
+
+        sequential = init_ontology_from_project(str(views), jobs=1)
+        assert list(sequential["entities"]) == ["Alphaorders", "Betaorders", "Gammaorders"]
+        assert "channel" in sequential["entities"]["Alphaorders"]["attributes"]
+        assert init_ontology_from_project(str(views), jobs=3) == sequential
+
+        cache = EntityCache(str(Path(temp_dir) / "cache"))
+        paths = sorted(views.rglob("*.view.lkml"))
+        assert not any(cached for _, cached in scan_entities(paths, 1, cache))
+        assert all(cached for _, cached in scan_entities(paths, 1, cache))
+        assert init_ontology_from_project(str(views), jobs=2, cache=cache) == sequential
+        # Entities and field tables of the same content live under different keys
+        assert EntityCache.key("x") != ParseCache.key("x")
+
+
+def test_init_ontology_cli():
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            make_views("model_project/views/sub", ["alpha_orders", "beta_orders"])
+            result = runner.invoke(lookml, ['init-ontology', '--jobs', '1'])
+            assert result.exit_code == 0, result.output
+            assert "2 entities from 2 view file(s) (0 cached)" in result.output
+
+            ontology = yaml.safe_load(Path("ontology.yaml").read_text())["ontology"]
+            assert list(ontology["entities"]) == ["Alphaorders", "Betaorders"]
+            assert ontology["relationships"] == []
+
+            result = runner.invoke(lookml, ['init-ontology', '--jobs', '1', '-o', 'again.yaml'])
+            assert "(2 cached)" in result.output, result.output
+            assert Path("again.yaml").read_text() == Path("ontology.yaml").read_text()
+
+            result = runner.invoke(lookml, ['init-ontology', '--no-cache', '--exclude', 'alpha*'])
+            assert "1 entities from 1 view file(s) (0 cached)" in result.output, result.output
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_extract_entities_matches_single_file_init()
+    test_merge_is_union_in_file_order()
+    test_project_ontology_is_deterministic_and_cached()
+    test_init_ontology_cli()
+    print("✓ All project ontology tests passed!")
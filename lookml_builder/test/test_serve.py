@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for the local generation server (lookml serve)
+"""
+
+import http.client
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from lookml_builder.code.bundle import generate_views
+from lookml_builder.code.parse_cache import MemoryParseCache
+from lookml_builder.code.server import GenerationService, ServerClient, create_server, server_address
+from lookml_builder.test.helpers import SAMPLE_VIEW
+
+
+@contextmanager
+def running_server(temp_dir, **kwargs):
+    """A server on an ephemeral port (or Unix socket) running in a background thread"""
+    service = GenerationService(str(Path(temp_dir) / "config.yaml"), str(Path(temp_dir) / "model_project"),
+                                project_dir=kwargs.pop("project_dir", str(SAMPLE_VIEW.parents[2])))
+    server = create_server(service, port=0, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield service, server_address(server)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_actions_over_http():
+    content = SAMPLE_VIEW.read_text()
+    expected = generate_views(content, new_view_name="orders")[0]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with running_server(temp_dir) as (service, address):
+            client = ServerClient(address)
+            try:
+                response = client.request("generate", {"content": content, "view_name": "orders"})
+                assert response["ok"], response
+                assert response["views"][0]["documents"] == expected.documents()
+                assert not (Path(temp_dir) / "model_project").exists()
+
+                response = client.request("classify", {"path": str(SAMPLE_VIEW)})
+                assert response["views"][0]["classification"]["primary_key"] == ["id"]
+
+                response = client.request("dry-run", {"content": content, "view_name": "orders"})
+                assert response["views"][0]["files"][-1].endswith("explores/orders.explore.lkml")
+
+                response = client.request("generate", {"content": content, "view_name": "orders", "write": True})
+                assert Path(response["views"][0]["files"]["explore_file"]).read_text() == expected.explore
+                assert SAMPLE_VIEW.exists()
+
+                response = client.request("classify", {})
+                assert not response["ok"] and "content" in response["error"]
+
+                stats = client.request("stats")
+                assert stats["requests"] == 5
+                assert stats["actions"]["classify"]["errors"] == 1
+                assert stats["parse_cache"]["misses"] == 1
+            finally:
+                client.close()
+
+
+def test_concurrent_requests_over_unix_socket():
+    content = SAMPLE_VIEW.read_text()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = str(Path(temp_dir) / "lookml.sock")
+        with running_server(temp_dir, socket_path=socket_path) as (service, address):
+            assert address == socket_path
+
+            def classify(index):
+                client = ServerClient(address)
+                try:
+                    return client.request("classify", {"content": content, "view_name": f"view_{index}"})
+                finally:
+                    client.close()
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                responses = list(pool.map(classify, range(32)))
+            assert all(response["ok"] for response in responses)
+            assert {response["views"][0]["view_name"] for response in responses} == {f"view_{i}" for i in range(32)}
+            assert service.stats.snapshot()["actions"]["classify"]["requests"] == 32
+
+
+def test_requests_are_confined_to_project_and_output_roots():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        views = Path(temp_dir) / "views"
+        views.mkdir()
+        (views / "orders.view.lkml").write_text(SAMPLE_VIEW.read_text())
+        (views / "escape.view.lkml").symlink_to(SAMPLE_VIEW)
+        with running_server(temp_dir, project_dir=str(views)) as (service, address):
+            client = ServerClient(address)
+            try:
+                # A single view read from a file is named after it, like `lookml generate`
+                response = client.request("classify", {"path": str(views / "orders.view.lkml")})
+                assert response["views"][0]["view_name"] == "orders", response
+
+                for request in ({"path": str(SAMPLE_VIEW)}, {"path": str(views / "escape.view.lkml")},
+                                {"path": str(views / ".." / ".." / "etc" / "passwd")}):
+                    response = client.request("classify", request)
+                    assert not response["ok"] and "must be inside" in response["error"], response
+
+                response = client.request("generate", {"path": str(views / "orders.view.lkml"), "write": True,
+                                                       "output_dir": str(Path(temp_dir) / "elsewhere")})
+                assert not response["ok"] and "must be inside" in response["error"]
+                assert not (Path(temp_dir) / "elsewhere").exists()
+                response = client.request("generate", {"path": str(views / "orders.view.lkml"), "write": True,
+                                                       "output_dir": str(Path(temp_dir) / "model_project" / "sub")})
+                assert response["ok"], response
+
+                # View names become output folders, so they can't climb out of the output directory
+                for view_name in ("../../escaped", "a/b", ""):
+                    response = client.request("generate", {"path": str(views / "orders.view.lkml"), "write": True,
+                                                           "view_name": view_name})
+                    assert not response["ok"] and "plain identifier" in response["error"], response
+                assert not (Path(temp_dir) / "escaped").exists()
+                assert not list(Path(temp_dir).glob("**/escaped*"))
+            finally:
+                client.close()
+
+            host, port = address.rsplit(":", 1)
+            connection = http.client.HTTPConnection(host, int(port))
+            try:
+                connection.request("POST", "/classify", b"[]", {"Content-Type": "application/json"})
+                reply = connection.getresponse()
+                assert reply.status == 400
+                assert "JSON object" in json.loads(reply.read())["error"]
+            finally:
+                connection.close()
+
+        with pytest.raises(ValueError):
+            create_server(GenerationService(None), host="0.0.0.0", port=0)
+        create_server(GenerationService(None), host="0.0.0.0", port=0, allow_remote=True).server_close()
+
+
+def test_config_reloaded_when_changed():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = GenerationService(str(Path(temp_dir) / "config.yaml"))
+        assert service.config().ontology.get("relationships", []) == []
+        (Path(temp_dir) / "config.yaml").write_text(
+            "ontology:\n  relationships:\n    - from: orders\n      to: customers\n      sql_on: x\n")
+        assert service.config().ontology["relationships"][0]["to"] == "customers"
+
+
+def test_memory_parse_cache_lru():
+    cache = MemoryParseCache(max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", [{"name": "a"}])
+    cache.put("b", [{"name": "b"}])
+    assert cache.get("a") == [{"name": "a"}]
+    cache.put("c", [{"name": "c"}])
+    assert cache.get("b") is None
+    assert cache.size == 2 and cache.hits == 1 and cache.misses == 2
+
+
+if __name__ == "__main__":
+    test_actions_over_http()
+    test_concurrent_requests_over_unix_socket()
+    test_requests_are_confined_to_project_and_output_roots()
+    test_config_reloaded_when_changed()
+    test_memory_parse_cache_lru()
+    print("✓ All server tests passed!")
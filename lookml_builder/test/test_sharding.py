@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for sharded batches - deterministic assignment and fragment merging
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from lookml_builder.code.cli import lookml
+from lookml_builder.code.run_ledger import RunLedger
+from lookml_builder.code.sharding import assign_shards, parse_shard, select_shard
+from lookml_builder.test.helpers import make_views
+
+
+def test_parse_shard():
+    assert parse_shard("2/8") == (2, 8)
+    for spec in ("0/3", "4/3", "3", "a/b", "1/0"):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_assignment_is_stable_and_disjoint():
+    paths = [Path(f"views/team_{i % 7}/view_{i}.view.lkml") for i in range(200)]
+    shards = assign_shards(paths, 4)
+    assert shards == assign_shards(list(paths), 4)
+    assert set(shards) == {1, 2, 3, 4}
+    # A file's shard only depends on its own path
+    assert assign_shards(paths[50:], 4) == shards[50:]
+    selected = [select_shard(paths, index, 4) for index in range(1, 5)]
+    assert sorted(path for shard in selected for path in shard) == sorted(paths)
+
+
+def test_size_weighted_assignment_balances_bytes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sizes = [4000, 3000, 2000, 1000, 1000, 1000, 500, 500]
+        paths = []
+        for i, size in enumerate(sizes):
+            path = Path(temp_dir) / f"v{i}.view.lkml"
+            path.write_text("x" * size)
+            paths.append(path)
+        shards = assign_shards(paths, 2, weighted=True)
+        assert shards == assign_shards(paths, 2, weighted=True)
+        loads = [sum(size for size, shard in zip(sizes, shards) if shard == index) for index in (1, 2)]
+        assert loads == [6500, 6500]
+
+
+def run_shards(runner, count, extra=()):
+    results = [runner.invoke(lookml, ['batch', '--jobs', '1', '--recursive', '--shard', f'{i}/{count}', *extra])
+               for i in range(1, count + 1)]
+    for result in results:
+        assert result.exit_code == 0, result.output
+    return results
+
+
+def test_sharded_batch_and_merge():
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            names = [f"view_{i}" for i in range(8)]
+            make_views("model_project/views", names)
+            results = run_shards(runner, 3)
+            assert "🧩 Shard 1/3" in results[0].output
+            assert all(Path(f"model_project/explores/{name}.explore.lkml").exists() for name in names)
+
+            fragments = sorted(Path("model_project/runs/shards").glob("*.jsonl"))
+            assert len(fragments) == 3
+            # A fragment is not a whole run, so it never becomes the latest one
+            assert RunLedger.latest("model_project/runs") is None
+
+            result = runner.invoke(lookml, ['merge', 'model_project/runs/shards', '--check'])
+            assert result.exit_code == 0, result.output
+            assert RunLedger.latest("model_project/runs") is None
+
+            result = runner.invoke(lookml, ['merge', 'model_project/runs/shards'])
+            assert result.exit_code == 0, result.output
+            assert "8 view(s) across 3 shard(s)" in result.output
+            merged = RunLedger.latest("model_project/runs")
+            assert sorted(merged.view_names()) == names
+            assert merged.header()["shards"]["count"] == 3
+
+            result = runner.invoke(lookml, ['summary'])
+            assert "- Views: 8" in result.output, result.output
+
+            # An incomplete set of fragments is rejected
+            result = runner.invoke(lookml, ['merge', str(fragments[0])])
+            assert result.exit_code == 1
+            assert "Missing shard(s)" in result.output
+        finally:
+            os.chdir(cwd)
+
+
+def test_rerun_clears_stale_fragments():
+    """Reusing an output directory with another shard count, or rerunning a shard, still merges cleanly"""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            names = [f"view_{i}" for i in range(6)]
+            make_views("model_project/views", names)
+            run_shards(runner, 3)
+            make_views("model_project/views", names)
+            results = run_shards(runner, 2, ['--force'])
+            assert "Removed 3 stale shard fragment(s)" in results[0].output
+            assert "stale" not in results[1].output
+
+            make_views("model_project/views", names)
+            result = runner.invoke(lookml, ['batch', '--jobs', '1', '--recursive', '--shard', '2/2', '--force'])
+            assert "Removed 1 stale shard fragment(s)" in result.output
+            assert len(list(Path("model_project/runs/shards").glob("*.jsonl"))) == 2
+
+            result = runner.invoke(lookml, ['merge', 'model_project/runs/shards'])
+            assert result.exit_code == 0, result.output
+            assert "6 view(s) across 2 shard(s)" in result.output
+        finally:
+            os.chdir(cwd)
+
+
+def test_merge_rejects_explore_built_by_two_shards():
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            # Two folders holding a view of the same name, placed on different shards
+            folders = [f"team_{i}" for i in range(20)]
+            shards = assign_shards([Path(f"model_project/views/{f}/dup.view.lkml") for f in folders], 2)
+            first, second = folders[shards.index(1)], folders[shards.index(2)]
+            for folder in (first, second):
+                make_views(f"model_project/views/{folder}", ["dup"])
+            run_shards(runner, 2)
+
+            result = runner.invoke(lookml, ['merge', 'model_project/runs/shards'])
+            assert result.exit_code == 1
+            assert "explores/dup.explore.lkml produced by shards 1, 2" in result.output
+            assert RunLedger.latest("model_project/runs") is None
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_parse_shard()
+    test_assignment_is_stable_and_disjoint()
+    test_size_weighted_assignment_balances_bytes()
+    test_sharded_batch_and_merge()
+    test_rerun_clears_stale_fragments()
+    test_merge_rejects_explore_built_by_two_shards()
+    print("✓ All sharding tests passed!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for watch mode - change detection and targeted regeneration
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from lookml_builder.code.watcher import PollingWatcher, WatchSession
+from lookml_builder.test.helpers import make_views
+
+
+def bump_mtime(path):
+    """Move a file's mtime forward so the change is visible on coarse-grained filesystems"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+
+def test_watch_rebuilds_only_changed_view():
+    """A saved view is rebuilt on its own and its original file is kept"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        views_dir = Path(temp_dir) / "views"
+        output_dir = Path(temp_dir) / "out"
+        config_path = Path(temp_dir) / "config.yaml"
+        alpha, beta = make_views(views_dir, ["alpha_orders", "beta_orders"])
+
+        session = WatchSession(str(views_dir), str(output_dir), str(config_path))
+        watcher = PollingWatcher(str(views_dir), str(config_path))
+        assert [r["success"] for r in session.build_all()] == [True, True]
+        assert alpha.exists() and beta.exists()
+        beta_semantic = output_dir / "views" / "beta_orders" / "beta_orders.semantic.view.lkml"
+        beta_mtime = beta_semantic.stat().st_mtime_ns
+
+        # Editing one view rebuilds only that view
+        alpha.write_text(alpha.read_text().replace("region", "territory"))
+        bump_mtime(alpha)
+        changed = watcher.poll()
+        assert changed == {str(alpha)}
+        results = session.handle_changes(changed)
+        assert [(r["view_name"], r["action"]) for r in results] == [("alpha_orders", "build")]
+        assert "territory" in (output_dir / "views" / "alpha_orders" / "alpha_orders.source.view.lkml").read_text()
+        assert beta_semantic.stat().st_mtime_ns == beta_mtime
+
+        # Touching a view without changing it rebuilds nothing
+        bump_mtime(beta)
+        assert session.handle_changes(watcher.poll()) == []
+        assert len(list(session.ledger.records())) == 3
+
+
+def test_watch_config_changes():
+    """Ontology-only changes rewrite explores; other config changes rebuild every view"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        views_dir = Path(temp_dir) / "views"
+        output_dir = Path(temp_dir) / "out"
+        config_path = Path(temp_dir) / "config.yaml"
+        make_views(views_dir, ["alpha_orders", "beta_orders"])
+        session = WatchSession(str(views_dir), str(output_dir), str(config_path))
+        session.build_all()
+        first_ledger = session.ledger
+
+        config_path.write_text(
+            "ontology:\n  relationships:\n"
+            "    - {from: alpha_orders, to: customers, via: '${alpha_orders.customer_id} = ${customers.id}'}\n"
+        )
+        results = session.handle_changes({str(config_path)})
+        assert [r["action"] for r in results] == ["explore", "explore"]
+        assert "join: customers" in (output_dir / "explores" / "alpha_orders.explore.lkml").read_text()
+        # Records after a reload go to a ledger whose header has the new config
+        assert session.ledger.path != first_ledger.path
+        assert session.ledger.header()["config_fingerprint"] == session.config.fingerprint()
+        assert first_ledger.header()["config_fingerprint"] != session.config.fingerprint()
+
+        config_path.write_text("classification:\n  exclude_from_filters: [status]\n")
+        results = session.handle_changes({str(config_path)})
+        assert [(r["view_name"], r["action"]) for r in results] == [("alpha_orders", "build"), ("beta_orders", "build")]
+        assert "join: customers" not in (output_dir / "explores" / "alpha_orders.explore.lkml").read_text()
+        assert sorted(session.ledger.view_names()) == ["alpha_orders", "beta_orders"]
+        assert session.ledger.header()["config_fingerprint"] == session.config.fingerprint()
+
+        # An invalid config is reported and the previous one stays in effect
+        config_path.write_text("classification: [")
+        results = session.handle_changes({str(config_path)})
+        assert results[0]["action"] == "config" and not results[0]["success"]
+        assert session.config.classification.exclude_from_filters == ("status",)
+
+
+if __name__ == "__main__":
+    test_watch_rebuilds_only_changed_view()
+    test_watch_config_changes()
+    print("✓ All watch tests passed!")